@@ -0,0 +1,111 @@
+"""
+Offline fixtures for the benchmark suite.
+
+synthetic_raw() builds (fred, yf_map) shaped like load_raw_data() output, at the
+real publication frequencies: ~30 years of business-day series, weekly WALCL,
+80 years of monthly CPI / unemployment, quarterly and annual fiscal series.
+Everything is seeded, so two runs see identical inputs.
+
+recorded_raw() reads the same structure back from a local series store
+(.series_store, see SeriesStore), i.e. real histories recorded by the app.
+"""
+import numpy as np
+import pandas as pd
+
+from macro_dashboard.config import FRED_SERIES, YF_TICKERS
+from macro_dashboard.store import SeriesStore
+
+SYNTHETIC_END = "2025-12-31"
+
+# FRED series id -> (pandas freq, years of history, start level, step vol, drift)
+SYNTHETIC_FRED = {
+    "DFII10": ("B", 30, 1.5, 0.04, 0.0),
+    "DGS10": ("B", 30, 4.5, 0.05, 0.0),
+    "DGS2": ("B", 30, 3.5, 0.05, 0.0),
+    "T10YIE": ("B", 30, 2.2, 0.02, 0.0),
+    "CPIAUCSL": ("MS", 80, 20.0, 0.15, 0.25),
+    "UNRATE": ("MS", 80, 5.0, 0.15, 0.0),
+    "BAMLH0A0HYM2": ("B", 30, 4.5, 0.06, 0.0),
+    "DTWEXBGS": ("B", 30, 100.0, 0.35, 0.0),
+    "WALCL": ("W-WED", 23, 700000.0, 9000.0, 2500.0),
+    "RRPONTSYD": ("B", 23, 100.0, 40.0, 0.0),
+    "A091RC1Q027SBEA": ("QS", 80, 5.0, 3.0, 2.0),
+    "FGRECPT": ("QS", 80, 50.0, 20.0, 12.0),
+    "FYFSGDA188S": ("YS", 80, -2.0, 1.2, 0.0),
+    "ACMTP10": ("B", 30, 0.8, 0.03, 0.0),
+    "USAB6BLTT02STSAQ": ("QS", 60, -1.5, 0.3, 0.0),
+}
+
+# yfinance ticker -> (start price, daily log-vol)
+SYNTHETIC_YF = {
+    "DX-Y.NYB": (95.0, 0.004),
+    "^VIX": (18.0, 0.06),
+    "SPY": (60.0, 0.011),
+    "HYG": (80.0, 0.004),
+    "LQD": (105.0, 0.003),
+    "GLD": (40.0, 0.009),
+}
+
+
+def _walk(rng, idx, level, vol, drift):
+    return pd.Series(level + np.cumsum(rng.normal(drift, vol, len(idx))), index=idx)
+
+
+def synthetic_raw(seed: int = 0, end: str = SYNTHETIC_END):
+    """(fred, yf_map) keyed like FRED_SERIES / YF_TICKERS."""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end)
+    fred = {}
+    for key, series_id in FRED_SERIES.items():
+        freq, years, level, vol, drift = SYNTHETIC_FRED[series_id]
+        idx = pd.date_range(end - pd.DateOffset(years=years), end, freq=freq)
+        s = _walk(rng, idx, level, vol, drift)
+        if series_id in ("RRPONTSYD", "CPIAUCSL", "FGRECPT", "A091RC1Q027SBEA"):
+            s = s.clip(lower=1.0)
+        if series_id == "RRPONTSYD":
+            s.iloc[len(s) // 4: len(s) // 2] = 0.0  # long flat stretch, as in the real series
+        if freq == "B":
+            s.iloc[rng.choice(len(s), size=len(s) // 40, replace=False)] = np.nan  # holidays ('.')
+        fred[key] = s.round(3)
+
+    yf_map = {}
+    idx = pd.bdate_range(end - pd.DateOffset(years=30), end)
+    for ticker in YF_TICKERS:
+        p0, vol = SYNTHETIC_YF[ticker]
+        yf_map[ticker] = pd.Series(p0 * np.exp(np.cumsum(rng.normal(0.0, vol, len(idx)))), index=idx, name="Close")
+    return fred, yf_map
+
+
+def recorded_raw(store_dir: str):
+    """(fred, yf_map) from a series store; series it does not hold come back empty."""
+    store = SeriesStore(store_dir)
+    fred = {}
+    for key, series_id in FRED_SERIES.items():
+        s, _ = store.load(f"fred/{series_id}")
+        fred[key] = pd.Series(dtype=float) if s is None else s
+    yf_map = {}
+    for ticker in YF_TICKERS:
+        s, _ = store.load(f"yf/{ticker}")
+        yf_map[ticker] = pd.Series(dtype=float) if s is None else s
+    return fred, yf_map
+
+
+def fred_payload(series: pd.Series) -> list:
+    """FRED /series/observations 'observations' list for a series (NaN -> '.')."""
+    dates = series.index.strftime("%Y-%m-%d")
+    vals = ["." if np.isnan(v) else repr(float(v)) for v in series.to_numpy(dtype=float)]
+    return [{"realtime_start": d, "realtime_end": d, "date": d, "value": v} for d, v in zip(dates, vals)]
+
+
+def yf_bulk_frame(yf_map: dict) -> pd.DataFrame:
+    """Wide (ticker, field) frame as returned by a multi-ticker yf.download."""
+    cols = {}
+    for ticker, close in yf_map.items():
+        cols[(ticker, "Open")] = close * 0.999
+        cols[(ticker, "High")] = close * 1.004
+        cols[(ticker, "Low")] = close * 0.996
+        cols[(ticker, "Close")] = close
+        cols[(ticker, "Volume")] = pd.Series(1.0e6, index=close.index)
+    frame = pd.DataFrame(cols)
+    frame.columns = pd.MultiIndex.from_tuples(frame.columns, names=["Ticker", "Price"])
+    return frame
@@ -0,0 +1,327 @@
+"""
+Benchmark suite for the dashboard hot paths. Runs offline.
+
+    python benchmarks/run.py                      # synthetic fixtures vs baseline.json
+    python benchmarks/run.py --recorded .series_store
+    python benchmarks/run.py --only regime --repeat 10
+    python benchmarks/run.py --update-baseline    # after an intended change
+
+Each case is timed over --repeat runs (best run reported) and run once more
+under tracemalloc for its peak allocation. Results are compared with the
+stored baseline for the same fixture set; a case slower than baseline *
+--time-tolerance or heavier than baseline * --mem-tolerance is a regression
+and the exit code is 1. Peak memory is deterministic; timings are not, so the
+time tolerance is loose by default and baselines only compare on the machine
+that recorded them (see "environment" in baseline.json).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import macro_dashboard as md  # noqa: E402
+from macro_dashboard.fetch import _parse_fred_observations  # noqa: E402
+import fixtures  # noqa: E402
+
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+
+# Absolute slack under which a slowdown / growth is treated as noise.
+TIME_FLOOR_S = 0.005
+MEM_FLOOR_KIB = 256.0
+
+
+def window_inputs(fred: dict, yf_map: dict):
+    """(end, start_date, windowed fred, windowed yf_map, indicators) over the full history window."""
+    ends = [s.index.max() for s in list(fred.values()) + list(yf_map.values()) if not s.empty]
+    end = max(ends)
+    start_date = (end - pd.DateOffset(years=md.MAX_HISTORY_YEARS)).date().isoformat()
+    wfred, wyf = md.window_raw_data(fred, yf_map, start_date)
+    return end, start_date, wfred, wyf, md.build_indicators(wfred, wyf)
+
+
+def build_cases(fred: dict, yf_map: dict) -> dict:
+    """name -> zero-arg callable. Inputs are prepared here, outside the timings."""
+    end, start_date, wfred, wyf, indicators = window_inputs(fred, yf_map)
+    indicator_scores = md.score_indicators(indicators)
+    panel = md.Panel.from_series(indicators)
+    asof_dates = pd.date_range(end=end, periods=52, freq="W-FRI")
+    grid_scores = md.build_regime_history(indicators, start_date, "W-FRI")
+    grid = grid_scores.index
+
+    payloads = {k: fixtures.fred_payload(s) for k, s in fred.items()}
+    series_for_charts = [md.downsample(s, md.point_budget(CHART_WIDTH, "minmax"), "minmax")
+                         for s in chart_series(indicators, grid_scores)]
+    bulk = fixtures.yf_bulk_frame(yf_map)
+
+    def score_all():
+        for key, meta in md.INDICATOR_META.items():
+            md.compute_indicator_score(indicators.get(key, pd.Series(dtype=float)), meta["direction"],
+                                        meta.get("scoring_mode", "z5y"))
+
+    def score_asof_52w():
+        for key, meta in md.INDICATOR_META.items():
+            s = indicators.get(key, pd.Series(dtype=float))
+            for t in asof_dates:
+                md.compute_indicator_score_asof(s, meta["direction"], meta.get("scoring_mode", "z5y"), t)
+
+    def trends():
+        for key in md.INDICATOR_META:
+            md.recent_trend(indicators.get(key, pd.Series(dtype=float)))
+
+    def panel_trends():
+        for key in md.INDICATOR_META:
+            if key in panel:
+                md.trend_column(*panel.column(key))
+
+    def panel_lookups():
+        # what one rerun asks per indicator: trend (tiles, deep dive, report) + What changed deltas
+        for key in md.INDICATOR_META:
+            panel.trend(key)
+            for days in (7, 30, 90, 365):
+                panel.pct_change(key, days)
+
+    def downsample_all(mode):
+        budget = md.point_budget(CHART_WIDTH, mode)
+        for s in chart_series(indicators, grid_scores):
+            md.downsample(s, budget, mode)
+
+    def figures(build):
+        # what st.plotly_chart does per chart: build the figure, then serialize it
+        import plotly.io as pio
+
+        for s in series_for_charts:
+            pio.to_json(build(s), validate=False)
+
+    def parse_fred(parse=_parse_fred_observations):
+        for data in payloads.values():
+            parse(data)
+
+    chart_cases = {}
+    try:
+        import plotly.graph_objects as go
+    except ImportError:  # optional: the figure cases need plotly
+        go = None
+    if go is not None:
+        chart_cases = {
+            "figures[graph_objects, all charts]": lambda: figures(graph_object_figure),
+            "figures[template spec, all charts]":
+                lambda: figures(lambda s: go.Figure(md.indicator_figure_spec(s, "x", 1.0), _validate=False)),
+        }
+
+    # the snapshot service caches regime histories per data version; the builder
+    # is timed so caching never hides work.
+    return {
+        "build_indicators": lambda: md.build_indicators(wfred, wyf),
+        "compute_indicator_score[all]": score_all,
+        "compute_indicator_score_asof[all x 52w]": score_asof_52w,
+        "regime_history[W-FRI]": lambda: md.build_regime_history(indicators, start_date, "W-FRI"),
+        "regime_history[B]": lambda: md.build_regime_history(indicators, start_date, "B"),
+        "build_alerts": lambda: md.build_alerts(indicators, indicator_scores),
+        "recent_trend[all]": trends,
+        "panel.from_series": lambda: md.Panel.from_series(indicators),
+        "score_indicators[panel]": lambda: md.score_indicators(panel),
+        "build_alerts[panel]": lambda: md.build_alerts(panel, indicator_scores),
+        "alert_history[52w]": lambda: md.alert_history(panel, asof_dates),
+        "replay_alerts[W-FRI]": lambda: md.replay_alerts(panel, grid),
+        "trend_column[all]": panel_trends,
+        "panel.trend+pct_change[all]": panel_lookups,
+        "downsample[lttb, all charts]": lambda: downsample_all("lttb"),
+        "downsample[minmax, all charts]": lambda: downsample_all("minmax"),
+        **chart_cases,
+        "parse_fred_observations[all]": parse_fred,
+        "parse_fred_observations[all, per-observation loop]": lambda: parse_fred(parse_fred_observations_loop),
+        "yf_close_panel": lambda: md.yf_close_panel(bulk, list(yf_map)),
+    }
+
+
+# Deep dive chart width (px) the payload report downsamples to, as the app's half-width panels
+CHART_WIDTH = 700
+
+
+def chart_series(indicators: dict, regime: pd.DataFrame) -> list:
+    """The series the app charts: every indicator and every regime history column."""
+    return [s for s in list(indicators.values()) + [regime[c] for c in regime.columns] if len(s)]
+
+
+def parse_fred_observations_loop(data: list) -> pd.Series:
+    """The per-observation FRED parser the columnar one replaced (reference for the benchmark)."""
+    if not data:
+        return pd.Series(dtype=float)
+    idx = pd.to_datetime([o["date"] for o in data])
+    vals = []
+    for o in data:
+        try:
+            vals.append(float(o["value"]))
+        except Exception:
+            vals.append(np.nan)
+    return pd.Series(vals, index=idx).replace({".": np.nan}).astype(float).sort_index()
+
+
+def graph_object_figure(s: pd.Series):
+    """A chart built through plotly's graph objects, as the app did before the template specs."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=s.index, y=s.values, mode="lines",
+                             line=dict(color="rgba(244,63,94,0.85)", width=2), name="x"))
+    fig.add_hline(y=1.0, line_dash="dot", line_color="rgba(255,255,255,0.35)",
+                  annotation_text="1.0", annotation_position="left")
+    fig.update_layout(
+        title=dict(text="x", font=dict(color="rgba(255,255,255,0.88)", size=13)),
+        height=340,
+        margin=dict(l=10, r=10, t=36, b=10),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(255,255,255,0.02)",
+        yaxis=dict(gridcolor="rgba(255,255,255,0.06)", color="rgba(255,255,255,0.60)"),
+        xaxis=dict(gridcolor="rgba(255,255,255,0.04)", color="rgba(255,255,255,0.60)"),
+        showlegend=False,
+    )
+    return fig
+
+
+def chart_payload_bytes(indicators: dict, regime: pd.DataFrame) -> dict:
+    """
+    Bytes of the Plotly figure JSON sent to the browser for every chart, full
+    series vs downsampled to CHART_WIDTH in each mode (needs plotly).
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    def size(s):
+        fig = go.Figure(go.Scatter(x=s.index, y=s.values, mode="lines"))
+        return len(pio.to_json(fig, validate=False))
+
+    series = chart_series(indicators, regime)
+    out = {"full": sum(size(s) for s in series)}
+    for mode in md.DOWNSAMPLE_MODES:
+        out[mode] = sum(size(md.downsample(s, md.point_budget(CHART_WIDTH, mode), mode)) for s in series)
+    return out
+
+
+def measure(fn, repeat: int) -> dict:
+    fn()  # warm-up (imports, lazy pandas paths)
+    times = []
+    gc.collect()
+    gc.disable()  # as timeit: no collector pauses inside a run
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"time_s": min(times), "median_s": float(np.median(times)), "peak_kib": peak / 1024.0}
+
+
+def compare(name: str, res: dict, base: dict, time_tol: float, mem_tol: float) -> list:
+    issues = []
+    if base is None:
+        return issues
+    bt, bm = base.get("time_s"), base.get("peak_kib")
+    if bt is not None and res["time_s"] > bt * time_tol and res["time_s"] - bt > TIME_FLOOR_S:
+        issues.append(f"{name}: time {res['time_s'] * 1000:.1f}ms vs baseline {bt * 1000:.1f}ms")
+    if bm is not None and res["peak_kib"] > bm * mem_tol and res["peak_kib"] - bm > MEM_FLOOR_KIB:
+        issues.append(f"{name}: peak {res['peak_kib']:.0f}KiB vs baseline {bm:.0f}KiB")
+    return issues
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--recorded", metavar="STORE_DIR", help="use histories recorded in a series store")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", default="", help="run cases whose name contains this text")
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    ap.add_argument("--payload", action="store_true",
+                    help="also report chart payload bytes, full vs downsampled (needs plotly)")
+    ap.add_argument("--time-tolerance", type=float, default=2.0)
+    ap.add_argument("--mem-tolerance", type=float, default=1.25)
+    args = ap.parse_args(argv)
+
+    if args.recorded:
+        fixture_set = "recorded"
+        fred, yf_map = fixtures.recorded_raw(args.recorded)
+    else:
+        fixture_set = "synthetic"
+        fred, yf_map = fixtures.synthetic_raw()
+
+    cases = {k: v for k, v in build_cases(fred, yf_map).items() if args.only in k}
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+    base = baseline.get(fixture_set, {}).get("results", {})
+
+    results, issues = {}, []
+    print(f"{'case':<42} {'best':>10} {'median':>10} {'peak':>11} {'vs base':>8}")
+    for name, fn in cases.items():
+        res = measure(fn, max(args.repeat, 1))
+        results[name] = res
+        b = base.get(name)
+        ratio = f"{res['time_s'] / b['time_s']:.2f}x" if b and b.get("time_s") else "-"
+        print(f"{name:<42} {res['time_s'] * 1000:>8.1f}ms {res['median_s'] * 1000:>8.1f}ms "
+              f"{res['peak_kib']:>8.0f}KiB {ratio:>8}")
+        issues += compare(name, res, b, args.time_tolerance, args.mem_tolerance)
+
+    payload = None
+    if args.payload:
+        _, start_date, _, _, indicators = window_inputs(fred, yf_map)
+        payload = chart_payload_bytes(indicators, md.build_regime_history(indicators, start_date, "W-FRI"))
+        base_payload = baseline.get(fixture_set, {}).get("payload_bytes", {})
+        print(f"\nchart payload ({CHART_WIDTH}px charts)")
+        for mode, n in payload.items():
+            print(f"  {mode:<8} {n / 1024:>10.0f}KiB {payload['full'] / n:>7.1f}x smaller")
+            if n > base_payload.get(mode, n):
+                issues.append(f"payload[{mode}]: {n} bytes vs baseline {base_payload[mode]}")
+
+    if args.update_baseline:
+        entry = baseline.setdefault(fixture_set, {"results": {}})
+        entry["environment"] = environment()
+        if payload is not None:
+            entry["payload_bytes"] = payload
+        entry["results"].update({k: {"time_s": round(v["time_s"], 6), "peak_kib": round(v["peak_kib"], 1)}
+                                 for k, v in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    if issues:
+        print("\nREGRESSIONS")
+        for msg in issues:
+            print("  " + msg)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Headless core of the global macro dashboard: fetchers, scoring, regime history,
+alerts and operating lines, importable without Streamlit, plotly or yfinance.
+
+Submodules load on first attribute access, so `import macro_dashboard` is cheap
+and a job only pays for what it uses:
+
+    import macro_dashboard as md
+    fred, yf_map = md.load_raw_data()          # FRED key from FRED_API_KEY
+    indicators = md.build_indicators(fred, yf_map)
+    scores = md.score_indicators(indicators)
+"""
+import importlib
+
+_EXPORTS = {
+    "config": [
+        "ALERT_RULES", "BLOCKS", "FRED_SERIES", "INDICATOR_META", "YF_TICKERS",
+    ],
+    "store": [
+        "STORE_DIR", "SeriesStore", "get_series_store",
+    ],
+    "schedule": ["REFRESH_MAX_S", "REFRESH_MIN_S", "next_refresh", "refresh_due", "refresh_schedule"],
+    "fetch": [
+        "FETCH_FLIGHT", "FRED_FETCH_ERRORS", "FRED_PROBE_STATS", "MAX_HISTORY_YEARS", "fetch_fred_batch",
+        "fetch_yf_batch", "get_fred_api_key", "max_history_start", "record_yf_fixture", "recorded_yf_transport",
+        "window_slice", "yf_bulk_transport", "yf_close_panel", "yf_pool_transport",
+    ],
+    "scoring": [
+        "classify_status", "compute_indicator_score", "compute_indicator_score_asof", "infer_frequency_days",
+        "pct_change_over_days", "recent_trend", "rolling_percentile_last", "score_column", "status_label",
+        "trend_column",
+    ],
+    "regime": [
+        "build_regime_history", "compute_regime_history", "indicator_score_path", "regime_delta",
+        "regime_history_frame",
+    ],
+    "flight": ["SingleFlight"],
+    "panel": ["Panel"],
+    "charts": ["chart_template", "indicator_figure_spec", "line_figure_spec", "regime_figure_spec"],
+    "downsampling": ["DOWNSAMPLE_MODES", "downsample", "lttb_indices", "minmax_indices", "point_budget"],
+    "alerts": [
+        "ALERT_RULE_SEVERITY", "alert_history", "alert_table", "build_alerts", "evaluate_alerts", "replay_alerts",
+        "rule_masks",
+    ],
+    "events": ["AlertLog", "alert_scope", "get_alert_log", "sync_alert_log"],
+    "lines": ["operating_lines"],
+    "pipeline": [
+        "build_indicators", "load_raw_data", "load_stored_data", "score_blocks", "score_indicators",
+        "window_raw_data",
+    ],
+    "snapshot": ["SNAPSHOT_TTL", "Snapshot", "SnapshotService", "build_snapshot", "make_snapshot"],
+    "artifact": ["ARTIFACT_DIR", "Artifact", "ArtifactStore", "get_artifact_store", "write_artifact"],
+}
+
+_WHERE = {name: mod for mod, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_WHERE)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return importlib.import_module(f".{name}", __name__)
+    mod = _WHERE.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{mod}", __name__), name)
+    globals()[name] = value  # resolve once
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_WHERE) | set(_EXPORTS))
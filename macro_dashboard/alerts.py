@@ -0,0 +1,220 @@
+"""
+What Changed / Watchlist alerts from the latest scores and recent trends.
+
+The rules in ALERT_RULES are evaluated as array operations over an alert
+table: one row per indicator (INDICATOR_META order) and one column per
+evaluation date, holding what the rules look at (presence, score, trend
+window, trend delta). build_alerts evaluates it at each series' latest
+observation; alert_history at arbitrary dates, from as-of data only.
+"""
+import numpy as np
+import pandas as pd
+
+from .config import ALERT_RULES, INDICATOR_META
+from .panel import Panel
+from .regime import _asof_values, indicator_score_path
+from .scoring import classify_status, status_label
+
+# ============================================================
+# ALERTS
+# ============================================================
+
+_DAY_NS = 86_400_000_000_000
+_SEVERITY_ORDER = {"CRIT": 0, "WARN": 1, "INFO": 2}
+
+def _observations(indicators, key: str):
+    """(row dates, observation dates, observation values) as int64 ns / float arrays."""
+    if isinstance(indicators, Panel):
+        if key not in indicators:
+            return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0)
+        dates, values = indicators.column(key)
+        rows = indicators.row_dates(key)
+    else:
+        s = indicators.get(key, None)
+        if s is None or s.empty:
+            return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0)
+        rows = pd.DatetimeIndex(s.index).as_unit("ns").asi8
+        dates, values = rows, s.to_numpy(dtype=float)
+    ok = ~np.isnan(values)
+    return rows, dates[ok], values[ok]
+
+def _slow_mask(obs_dates: np.ndarray, n_obs: np.ndarray) -> np.ndarray:
+    """
+    infer_frequency_days(prefix) >= 20 for the first n_obs observations, for
+    every n_obs at once: the median of the m = n_obs - 1 day gaps is >= 20 iff
+    enough gaps are >= 20 (for even m with a tie, iff the two middle gaps, the
+    largest gap < 20 and the smallest >= 20, average >= 20).
+    """
+    gaps = np.diff(obs_dates).view("timedelta64[ns]").astype("timedelta64[D]").astype(int)
+    m = n_obs - 1
+    if len(gaps) == 0:
+        return np.zeros(len(n_obs), dtype=bool)
+    big = gaps >= 20
+    at = np.clip(m - 1, 0, len(gaps) - 1)
+    c = np.cumsum(big)[at]
+    max_small = np.maximum.accumulate(np.where(big, np.iinfo(np.int64).min // 2, gaps))[at]
+    min_big = np.minimum.accumulate(np.where(big, gaps, np.iinfo(np.int64).max // 2))[at]
+    odd = m % 2 == 1
+    slow = np.where(odd, 2 * c >= m + 1, (2 * c >= m + 2) | ((2 * c == m) & (max_small + min_big >= 40)))
+    return slow & (m > 0)
+
+def alert_table(indicators, indicator_scores: dict = None, dates=None) -> dict:
+    """
+    Latest/lookback table the rules run on, arrays of shape (indicators, dates):
+    present (series has rows), score, slow (quarterly trend window), delta_pct.
+
+    dates=None: one column, each series at its latest observation, scores from
+    indicator_scores. Otherwise one column per date, from the observations up
+    to that date only (as-of scores as in the regime history).
+    """
+    keys = list(INDICATOR_META)
+    grid = None if dates is None else pd.DatetimeIndex(dates).as_unit("ns")
+    n = 1 if grid is None else len(grid)
+    present = np.zeros((len(keys), n), dtype=bool)
+    score = np.full((len(keys), n), np.nan)
+    slow = np.zeros((len(keys), n), dtype=bool)
+    delta = np.full((len(keys), n), np.nan)
+
+    for i, key in enumerate(keys):
+        if grid is None and isinstance(indicators, Panel):
+            # latest column straight from the panel's lookback index
+            ix = indicators.lookback(key)
+            present[i] = indicators.rows(key) > 0
+            score[i] = (indicator_scores or {}).get(key, {}).get("score", np.nan)
+            if ix["n_obs"] >= 10:
+                slow[i] = ix["freq_days"] >= 20
+                delta[i] = ix["pct"][90 if slow[i, 0] else 30]
+            continue
+        rows, obs_dates, obs_vals = _observations(indicators, key)
+        if grid is None:
+            present[i] = len(rows) > 0
+            score[i] = (indicator_scores or {}).get(key, {}).get("score", np.nan)
+            k = np.array([len(obs_dates)])
+        else:
+            t = grid.asi8
+            present[i] = np.searchsorted(rows, t, side="right") > 0
+            if len(obs_dates) >= 20:
+                meta = INDICATOR_META[key]
+                path = indicator_score_path(pd.Series(obs_vals, index=pd.DatetimeIndex(obs_dates)),
+                                            meta["direction"], meta.get("scoring_mode", "z5y"))
+                score[i] = _asof_values(path, grid)
+            k = np.searchsorted(obs_dates, t, side="right")
+
+        # recent_trend: needs 10 observations; 30d window, 90d for slow series
+        has = k >= 10
+        if not has.any():
+            continue
+        slow[i] = _slow_mask(obs_dates, k) & has
+        last = np.maximum(k - 1, 0)
+        target = obs_dates[last] - np.where(slow[i], 90, 30) * _DAY_NS
+        past = np.searchsorted(obs_dates, target, side="right") - 1
+        curr_val, past_val = obs_vals[last], obs_vals[np.maximum(past, 0)]
+        ok = has & (past >= 0) & (past_val != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta[i] = np.where(ok, (curr_val / past_val - 1.0) * 100.0, np.nan)
+
+    return {"keys": keys, "dates": grid, "present": present, "score": score, "slow": slow, "delta": delta}
+
+# rule -> severity, in the order build_alerts reports them for one indicator
+ALERT_RULE_SEVERITY = {
+    "missing": "WARN",
+    "score_near_boundary": "WARN",
+    "score_extreme_low": "CRIT",
+    "score_extreme_high": "INFO",
+    "trend_crit": "CRIT",
+    "trend_warn": "WARN",
+}
+
+def rule_masks(table: dict) -> dict:
+    """ALERT_RULES over an alert table: rule -> bool array (indicators, dates) of where it fires."""
+    score, delta, slow = table["score"], table["delta"], table["slow"]
+    present = table["present"]
+    with np.errstate(invalid="ignore"):
+        # 1) score near boundary, 2) extreme regimes
+        near = present & (np.minimum(np.abs(score - 40), np.abs(score - 60))
+                          <= ALERT_RULES["score_near_boundary"]["dist"])
+        low = present & (score <= ALERT_RULES["score_extreme"]["low"])
+        high = present & (score >= ALERT_RULES["score_extreme"]["high"])
+        # 3) large trend moves
+        daily, slow_r = ALERT_RULES["trend_daily_pct"], ALERT_RULES["trend_slow_pct"]
+        move = np.abs(delta)
+        crit = present & (move >= np.where(slow, slow_r["crit"], daily["crit"]))
+        warn = present & ~crit & (move >= np.where(slow, slow_r["warn"], daily["warn"]))
+    return {"missing": ~present, "score_near_boundary": near, "score_extreme_low": low,
+            "score_extreme_high": high, "trend_crit": crit, "trend_warn": warn}
+
+def _alert_message(rule: str, score: float, delta: float, slow: bool) -> str:
+    wlab = "1Q" if slow else "30d"
+    if rule == "missing":
+        return "Missing data (series empty in selected window)."
+    if rule == "score_near_boundary":
+        return f"Score near regime boundary (score={score:.0f})."
+    if rule == "score_extreme_low":
+        return f"Extreme risk-off reading (score={score:.0f})."
+    if rule == "score_extreme_high":
+        return f"Strong risk-on reading (score={score:.0f})."
+    if rule == "trend_crit":
+        return f"Large move over {wlab}: {delta:+.1f}%"
+    return f"Notable move over {wlab}: {delta:+.1f}%"
+
+def evaluate_alerts(table: dict) -> list:
+    """One sorted [(severity, label, message), ...] per date column of an alert table."""
+    masks = rule_masks(table)
+    fired = np.logical_or.reduce(list(masks.values()))
+    out = []
+    for j in range(fired.shape[1]):
+        alerts = []
+        for i in np.flatnonzero(fired[:, j]):
+            label = INDICATOR_META[table["keys"][i]]["label"]
+            for rule, m in masks.items():
+                if m[i, j]:
+                    msg = _alert_message(rule, table["score"][i, j], table["delta"][i, j], table["slow"][i, j])
+                    alerts.append((ALERT_RULE_SEVERITY[rule], label, msg))
+        # de-dup similar lines (first occurrence wins), then sort by severity
+        alerts = list(dict.fromkeys(alerts))
+        alerts.sort(key=lambda x: (_SEVERITY_ORDER.get(x[0], 9), x[1]))
+        out.append(alerts)
+    return out
+
+def build_alerts(indicators: dict, indicator_scores: dict):
+    """Alerts at the latest observation of every indicator (dict of Series or Panel)."""
+    return evaluate_alerts(alert_table(indicators, indicator_scores))[0]
+
+def alert_history(indicators: dict, dates) -> dict:
+    """{date: alerts} as build_alerts would have reported them on each date, from as-of data."""
+    table = alert_table(indicators, dates=dates)
+    return dict(zip(table["dates"], evaluate_alerts(table)))
+
+def replay_alerts(indicators: dict, dates) -> list:
+    """
+    Transitions of every rule over dates (e.g. the regime grid), from as-of data:
+    [(date, indicator key, rule, state, severity, label, message)] where state is
+    "on" (starts firing; message as build_alerts words it that day) or "off".
+    Regime status changes (the 40/60 boundary) come as rule "status", state "change".
+    """
+    table = alert_table(indicators, dates=dates)
+    grid, keys = table["dates"], table["keys"]
+    if grid is None or len(grid) == 0:
+        return []
+    events = []
+    for rule, m in rule_masks(table).items():
+        before = np.concatenate([np.zeros((m.shape[0], 1), dtype=bool), m[:, :-1]], axis=1)
+        for i, j in zip(*np.nonzero(m != before)):
+            key = keys[i]
+            msg = _alert_message(rule, table["score"][i, j], table["delta"][i, j], table["slow"][i, j])
+            events.append((grid[j], key, rule, "on" if m[i, j] else "off", ALERT_RULE_SEVERITY[rule],
+                           INDICATOR_META[key]["label"], msg if m[i, j] else ""))
+
+    score = table["score"]
+    with np.errstate(invalid="ignore"):
+        code = np.where(np.isnan(score), 0, np.where(score > 60, 1, np.where(score < 40, -1, 2)))
+    before = np.concatenate([np.zeros((code.shape[0], 1), dtype=code.dtype), code[:, :-1]], axis=1)
+    for i, j in zip(*np.nonzero((code != before) & (code != 0))):
+        key = keys[i]
+        events.append((grid[j], key, "status", "change", "INFO", INDICATOR_META[key]["label"],
+                       f"{status_label(classify_status(score[i, j - 1]) if j else 'n/a')} → "
+                       f"{status_label(classify_status(score[i, j]))} (score={score[i, j]:.0f})."))
+
+    rule_order = {r: n for n, r in enumerate([*ALERT_RULE_SEVERITY, "status"])}
+    events.sort(key=lambda e: (e[0], keys.index(e[1]), rule_order[e[2]]))
+    return events
@@ -0,0 +1,203 @@
+"""
+Snapshot artifacts: the pipeline output written by the batch runner
+(python -m macro_dashboard snapshot) and memory-mapped by the app at startup.
+
+    <root>/CURRENT                      name of the live version
+    <root>/<version>/manifest.json      settings, scores, alerts, file index
+    <root>/<version>/raw.arrow          every raw history, long format, sorted by series
+    <root>/<version>/regime-<years>y-<freq>.arrow
+    <root>/<version>/indicators-<years>y-<freq>.arrow   indicator Panel of that setting
+
+Arrow IPC files are uncompressed, so reads are zero-copy views of the mapped
+pages. A version is written to a temp dir and renamed into place before
+CURRENT is swapped: readers never see a partial artifact.
+"""
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from .alerts import build_alerts
+from .panel import Panel, _column, _map_table, _write_table
+from .pipeline import window_raw_data
+from .snapshot import make_snapshot
+
+ARTIFACT_FORMAT = 2
+ARTIFACT_DIR = os.environ.get(
+    "MACRO_DASHBOARD_ARTIFACTS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".artifacts"),
+)
+ARTIFACT_MAX_AGE = 24 * 3600  # seconds; an older CURRENT artifact is ignored (live fetch instead)
+ARTIFACT_KEEP = 5  # versions kept on disk (readers may still map the previous ones)
+
+def _regime_file(years_back: int, freq: str) -> str:
+    return f"regime-{int(years_back)}y-{freq}.arrow"
+
+def _panel_file(years_back: int, freq: str) -> str:
+    return f"indicators-{int(years_back)}y-{freq}.arrow"
+
+def _raw_table(fred: dict, yf_map: dict):
+    """Long (date, value) table sorted by series + {name: [start, stop)} row ranges."""
+    import pyarrow as pa
+
+    dates, values, ranges, n = [], [], {}, 0
+    for prefix, group in (("fred", fred), ("yf", yf_map)):
+        for key, s in group.items():
+            s = pd.Series(dtype=float) if s is None else s  # NaN gaps kept: derived indicators see them
+            idx = pd.DatetimeIndex(s.index).as_unit("ns")
+            dates.append(idx.asi8)
+            values.append(s.to_numpy(dtype=float))
+            ranges[f"{prefix}/{key}"] = [n, n + len(s)]
+            n += len(s)
+    table = pa.table({
+        "date": pa.array(np.concatenate(dates) if dates else np.empty(0, np.int64), type=pa.int64()),
+        "value": pa.array(np.concatenate(values) if values else np.empty(0), type=pa.float64()),
+    })
+    return table, ranges
+
+def write_artifact(root: str, fred: dict, yf_map: dict, snapshots: list, fred_errors: dict = None,
+                   built_at: datetime = None, keep: int = ARTIFACT_KEEP) -> str:
+    """
+    Publish (fred, yf_map) full histories and the derived snapshots as a new
+    version under root, point CURRENT at it, prune old versions. Returns the version.
+    """
+    import pyarrow as pa
+
+    built_at = datetime.now(timezone.utc) if built_at is None else built_at
+    version = built_at.strftime("%Y%m%dT%H%M%S.%fZ")
+    os.makedirs(root, exist_ok=True)
+    tmp = os.path.join(root, f".{version}.{os.getpid()}.tmp")
+    os.makedirs(tmp)
+
+    raw, ranges = _raw_table(fred, yf_map)
+    _write_table(os.path.join(tmp, "raw.arrow"), raw)
+
+    entries = []
+    for snap in snapshots:
+        regime = snap.regime_ts
+        fname = _regime_file(snap.years_back, snap.freq)
+        cols = {"date": pa.array(pd.DatetimeIndex(regime.index).as_unit("ns").asi8, type=pa.int64())}
+        cols.update({str(c): pa.array(regime[c].to_numpy(dtype=float), type=pa.float64()) for c in regime.columns})
+        _write_table(os.path.join(tmp, fname), pa.table(cols))
+        snap.indicators.write(os.path.join(tmp, _panel_file(snap.years_back, snap.freq)))
+        entries.append({
+            "years_back": snap.years_back,
+            "freq": snap.freq,
+            "start_date": snap.start_date,
+            "built_at": snap.built_at.isoformat(),
+            "regime_file": fname,
+            "panel_file": _panel_file(snap.years_back, snap.freq),
+            "indicator_scores": {k: dict(v) for k, v in snap.indicator_scores.items()},
+            "block_scores": {k: dict(v) for k, v in snap.block_scores.items()},
+            "alerts": [list(a) for a in build_alerts(snap.indicators, snap.indicator_scores)],
+        })
+
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "version": version,
+        "built_at": built_at.isoformat(),
+        "raw": {"file": "raw.arrow", "series": ranges},
+        "fred_errors": dict(fred_errors or {}),
+        "snapshots": entries,
+    }
+    with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, default=float)
+    os.replace(tmp, os.path.join(root, version))
+
+    cur_tmp = os.path.join(root, f".CURRENT.{os.getpid()}.tmp")
+    with open(cur_tmp, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(cur_tmp, os.path.join(root, "CURRENT"))
+
+    versions = sorted(d for d in os.listdir(root) if not d.startswith(".") and d != "CURRENT")
+    for old in versions[:-max(int(keep), 1)]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return version
+
+class Artifact:
+    """One published version, memory-mapped: raw histories, indicator panels and regime frames are views of the files."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"unsupported artifact format: {self.manifest.get('format')}")
+        self.version = self.manifest["version"]
+        self.built_at = datetime.fromisoformat(self.manifest["built_at"])
+        self.fred_errors = self.manifest.get("fred_errors", {})
+        self._entries = {(e["years_back"], e["freq"]): e for e in self.manifest.get("snapshots", [])}
+        self._raw = None
+
+    def raw(self):
+        """(fred, yf_map) full histories; every Series is a read-only slice of the mapped file."""
+        if self._raw is None:
+            table = _map_table(os.path.join(self.path, self.manifest["raw"]["file"]))
+            dates = _column(table, "date").view("datetime64[ns]")
+            values = _column(table, "value")
+            fred, yf_map = {}, {}
+            for name, (a, b) in self.manifest["raw"]["series"].items():
+                prefix, key = name.split("/", 1)
+                s = pd.Series(values[a:b], index=pd.DatetimeIndex(dates[a:b], copy=False), copy=False)
+                (fred if prefix == "fred" else yf_map)[key] = s
+            self._raw = (fred, yf_map)
+        return self._raw
+
+    def settings(self) -> list:
+        return sorted(self._entries)
+
+    def alerts(self, years_back: int, freq: str = "W-FRI") -> list:
+        e = self._entries.get((int(years_back), freq))
+        return [] if e is None else [tuple(a) for a in e["alerts"]]
+
+    def regime(self, years_back: int, freq: str = "W-FRI") -> pd.DataFrame:
+        e = self._entries[(int(years_back), freq)]
+        table = _map_table(os.path.join(self.path, e["regime_file"]))
+        idx = pd.DatetimeIndex(_column(table, "date").view("datetime64[ns]"), copy=False)
+        return pd.DataFrame({c: _column(table, c) for c in table.column_names if c != "date"}, index=idx)
+
+    def snapshot(self, years_back: int, freq: str = "W-FRI"):
+        """Stored Snapshot for a precomputed setting (None otherwise)."""
+        e = self._entries.get((int(years_back), freq))
+        if e is None:
+            return None
+        fred, yf_map = window_raw_data(*self.raw(), e["start_date"])
+        indicators = Panel.open(os.path.join(self.path, e["panel_file"]))
+        return make_snapshot(self.version, datetime.fromisoformat(e["built_at"]), int(years_back), freq,
+                             e["start_date"], {**fred, **yf_map}, indicators, e["indicator_scores"],
+                             e["block_scores"], self.regime(years_back, freq))
+
+class ArtifactStore:
+    """CURRENT artifact under root, opened once per version; None when missing or older than max_age."""
+
+    def __init__(self, root: str, max_age: float = ARTIFACT_MAX_AGE):
+        self.root = root
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._open = None
+
+    def current(self):
+        try:
+            with open(os.path.join(self.root, "CURRENT"), encoding="utf-8") as f:
+                version = f.read().strip()
+        except OSError:
+            return None
+        with self._lock:
+            if self._open is None or self._open.version != version:
+                try:
+                    self._open = Artifact(os.path.join(self.root, version))
+                except Exception:
+                    return None
+            art = self._open
+        age = (datetime.now(timezone.utc) - art.built_at).total_seconds()
+        return art if age <= self.max_age else None
+
+def get_artifact_store():
+    """Store at ARTIFACT_DIR; None when disabled (MACRO_DASHBOARD_ARTIFACTS="")."""
+    if not ARTIFACT_DIR:
+        return None
+    return ArtifactStore(ARTIFACT_DIR)
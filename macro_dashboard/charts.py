@@ -0,0 +1,82 @@
+"""
+Figure specs for the dashboard's line charts as plain Plotly JSON dicts
+(plotly itself is not imported).
+
+Every chart shares one style. chart_template() builds the layout of a chart
+kind once (axes, colors, reference lines) and a figure is that template with
+its title, height and trace data swapped in, so the view can wrap it without
+graph-object validation: go.Figure(spec, _validate=False).
+"""
+import copy
+from functools import lru_cache
+
+import pandas as pd
+
+# ============================================================
+# STYLE
+# ============================================================
+
+LINE_TRACE = {"mode": "lines", "line": {"color": "rgba(244,63,94,0.85)", "width": 2}}
+
+_TITLE_FONT = {"color": "rgba(255,255,255,0.88)", "size": 13}
+
+_BASE_LAYOUT = {
+    "margin": {"l": 10, "r": 10, "t": 36, "b": 10},
+    "paper_bgcolor": "rgba(0,0,0,0)",
+    "plot_bgcolor": "rgba(255,255,255,0.02)",
+    "yaxis": {"gridcolor": "rgba(255,255,255,0.06)", "color": "rgba(255,255,255,0.60)"},
+    "xaxis": {"gridcolor": "rgba(255,255,255,0.04)", "color": "rgba(255,255,255,0.60)"},
+    "showlegend": False,
+}
+
+# regime score charts: 60 / 40 boundaries (labelled) and the 50 midline
+REGIME_HLINES = (
+    (60, "dot", "rgba(34,197,94,0.55)", "60"),
+    (40, "dot", "rgba(239,68,68,0.55)", "40"),
+    (50, "dash", "rgba(255,255,255,0.15)", None),
+)
+REF_LINE_COLOR = "rgba(255,255,255,0.35)"
+
+# ============================================================
+# TEMPLATES + SPECS
+# ============================================================
+
+@lru_cache(maxsize=None)
+def chart_template(hlines: tuple = (), y_range: tuple = None) -> dict:
+    """
+    Layout shared by a chart kind: the base style plus horizontal reference
+    lines (y, dash, color, label or None), as fig.add_hline(y, annotation_position="left")
+    would add them. Cached; never mutate the result.
+    """
+    layout = copy.deepcopy(_BASE_LAYOUT)
+    if y_range is not None:
+        layout["yaxis"]["range"] = list(y_range)
+    shapes, annotations = [], []
+    for y, dash, color, label in hlines:
+        shapes.append({"type": "line", "xref": "x domain", "x0": 0, "x1": 1, "yref": "y", "y0": y, "y1": y,
+                       "line": {"dash": dash, "color": color}})
+        if label is not None:
+            annotations.append({"text": label, "showarrow": False, "xref": "x domain", "x": 0,
+                                "xanchor": "right", "yref": "y", "y": y, "yanchor": "middle"})
+    if shapes:
+        layout["shapes"] = shapes
+    if annotations:
+        layout["annotations"] = annotations
+    return layout
+
+def line_figure_spec(series: pd.Series, title: str, height: int, template: dict) -> dict:
+    """{"data", "layout"} of a one-line chart: the template with title, height and series swapped in."""
+    layout = copy.deepcopy(template)
+    layout["title"] = {"text": title, "font": dict(_TITLE_FONT)}
+    layout["height"] = height
+    trace = {"type": "scatter", "x": series.index, "y": series.values, "name": title, **copy.deepcopy(LINE_TRACE)}
+    return {"data": [trace], "layout": layout}
+
+def regime_figure_spec(ts: pd.Series, title: str, height: int = 320) -> dict:
+    """0-100 regime score history with the 40 / 50 / 60 reference lines."""
+    return line_figure_spec(ts, title, height, chart_template(REGIME_HLINES, (0, 100)))
+
+def indicator_figure_spec(series: pd.Series, label: str, ref_line=None, height: int = 340) -> dict:
+    """Indicator history, with its reference level (if any) as a dotted labelled line."""
+    hlines = () if ref_line is None else ((ref_line, "dot", REF_LINE_COLOR, str(ref_line)),)
+    return line_figure_spec(series, label, height, chart_template(hlines))
@@ -0,0 +1,99 @@
+"""
+Batch runner: python -m macro_dashboard snapshot [options]
+              python -m macro_dashboard schedule
+
+Runs the dashboard pipeline (FRED + yfinance load, derived indicators, indicator
+and block scores, regime history, alerts) for each requested setting and
+publishes the result as a versioned artifact (see artifact.py). Schedule it
+(cron) ahead of the app's refresh horizon so page loads never touch the network:
+
+    */30 * * * *  cd /srv/dashboard && python -m macro_dashboard snapshot --years 15 --years 30
+
+A run only requests the series that are due for an update (schedule.py);
+--all-series polls every series. "schedule" prints when each stored series is
+next due.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def _snapshot(args) -> int:
+    from .artifact import write_artifact
+    from .fetch import FRED_FETCH_ERRORS, FRED_PROBE_STATS
+    from .pipeline import load_raw_data, load_stored_data
+    from .snapshot import build_snapshot
+
+    if not args.out:
+        print("no artifact directory (set --out or MACRO_DASHBOARD_ARTIFACTS)", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    built_at = datetime.now(timezone.utc)
+    if args.offline:
+        fred, yf_map = load_stored_data()
+        errors = {}
+    else:
+        fred, yf_map = load_raw_data(scheduled=not args.all_series)
+        errors = dict(FRED_FETCH_ERRORS)
+    loaded = sum(1 for s in list(fred.values()) + list(yf_map.values()) if s is not None and not s.empty)
+    if loaded == 0:
+        print("no data loaded; nothing published", file=sys.stderr)
+        return 1
+
+    version = built_at.strftime("%Y%m%dT%H%M%S.%fZ")
+    snapshots = [build_snapshot(fred, yf_map, version, built_at, years, freq)
+                 for years in (args.years or [15]) for freq in (args.freq or ["W-FRI"])]
+    version = write_artifact(args.out, fred, yf_map, snapshots, fred_errors=errors, built_at=built_at,
+                             keep=args.keep)
+
+    print(f"published {version} to {args.out}: {loaded} series, "
+          f"{len(snapshots)} snapshot(s), {time.perf_counter() - t0:.1f}s")
+    if FRED_PROBE_STATS["probed"]:
+        print("FRED probe: {probed} probed, {current} current (download skipped), "
+              "{changed} changed, {failed} failed".format(**FRED_PROBE_STATS))
+    for key, msg in sorted(errors.items()):
+        print(f"  FRED {key}: {msg}", file=sys.stderr)
+    return 0
+
+
+def _schedule(args) -> int:
+    from .config import FRED_SERIES, YF_TICKERS
+    from .schedule import refresh_schedule
+    from .store import get_series_store
+
+    store = get_series_store()
+    if store is None:
+        print("no series store (set MACRO_DASHBOARD_STORE)", file=sys.stderr)
+        return 2
+    keys = [f"fred/{sid}" for sid in FRED_SERIES.values()] + [f"yf/{t}" for t in YF_TICKERS]
+    table = refresh_schedule(store, keys)
+    print(table.to_string(index=False))
+    print(f"{int(table['due'].sum())} of {len(table)} series due")
+    return 0
+
+
+def main(argv=None) -> int:
+    from .artifact import ARTIFACT_DIR, ARTIFACT_KEEP
+
+    ap = argparse.ArgumentParser(prog="python -m macro_dashboard")
+    sub = ap.add_subparsers(dest="command", required=True)
+    snap = sub.add_parser("snapshot", help="run the pipeline and publish a snapshot artifact")
+    snap.add_argument("--out", default=ARTIFACT_DIR, help="artifact directory (default: %(default)s)")
+    snap.add_argument("--years", type=int, action="append", help="history window; repeatable (default: 15)")
+    snap.add_argument("--freq", action="append", help="regime grid frequency; repeatable (default: W-FRI)")
+    snap.add_argument("--keep", type=int, default=ARTIFACT_KEEP, help="versions kept on disk")
+    snap.add_argument("--offline", action="store_true", help="build from the local series store, no network")
+    snap.add_argument("--all-series", action="store_true",
+                      help="poll every series, including those not due for an update")
+    sub.add_parser("schedule", help="show when each stored series is next due for an update")
+    args = ap.parse_args(argv)
+    if args.command == "snapshot":
+        return _snapshot(args)
+    if args.command == "schedule":
+        return _schedule(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+"""
+Dashboard configuration: indicators, blocks, alert thresholds and the raw inputs.
+Plain data, no imports: safe to load anywhere.
+"""
+
+# ============================================================
+# ALERT RULES (thresholds for What Changed / Watchlist panel)
+# These are intentionally simple and stable; tune if needed.
+# ============================================================
+ALERT_RULES = {
+    # "near boundary" means the indicator score is close to 40/60 cutoffs
+    "score_near_boundary": {"dist": 5},
+
+    # "extreme" readings for attention (not a forecast)
+    "score_extreme": {"low": 20, "high": 80},
+
+    # Trend thresholds for daily-like series (30d window, % move)
+    "trend_daily_pct": {"warn": 2.0, "crit": 5.0},
+
+    # Trend thresholds for slow series (quarter-ish window, % move)
+    "trend_slow_pct": {"warn": 1.0, "crit": 2.5},
+
+    # Regime score trend thresholds (score points)
+    "regime_trend_points": {"flat": 1.5, "notable": 4.0},
+}
+
+# ============================================================
+# INDICATORS & BLOCKS (same as your current set)
+# ============================================================
+
+INDICATOR_META = {
+    "real_10y": {
+        "label": "US 10Y TIPS Real Yield",
+        "unit": "%",
+        "direction": -1,
+        "source": "FRED DFII10",
+        "scale": 1.0,
+        "ref_line": 0.0,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Real yield (10Y TIPS): the real price of money/time.",
+            "reference": "<0% very easy; 0–2% neutral; >2% restrictive (heuristics).",
+            "interpretation": "- Higher real yields tighten financial conditions; pressure long-duration assets.\n- Lower real yields typically support risk assets and duration.",
+            "bridge": "Higher real yields raise real funding constraints across the system.",
+        },
+    },
+    "nominal_10y": {
+        "label": "US 10Y Nominal Yield",
+        "unit": "%",
+        "direction": -1,
+        "source": "FRED DGS10",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Nominal 10Y Treasury yield: benchmark discount rate and broad tightening proxy.",
+            "reference": "Fast upside moves often behave like tightening (heuristics).",
+            "interpretation": "- Yield up fast = pressure on equities and existing bonds.\n- Yield down can support duration and (sometimes) equities depending on growth/inflation mix.",
+            "bridge": "Higher yields mean the market demands more compensation (inflation and/or term premium).",
+        },
+    },
+    "yield_curve_10_2": {
+        "label": "US Yield Curve (10Y–2Y)",
+        "unit": "pp",
+        "direction": +1,
+        "source": "FRED DGS10 - DGS2",
+        "scale": 1.0,
+        "ref_line": 0.0,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "10Y–2Y slope: cycle / recession-probability proxy.",
+            "reference": "<0 inverted (late-cycle); >0 normal (heuristics).",
+            "interpretation": "- Deep/persistent inversion = late-cycle risk.\n- Steepening back above 0 = normalization (often after easing).",
+            "bridge": "Inversion = policy tight vs cycle, raising deleveraging risk.",
+        },
+    },
+
+    "breakeven_10y": {
+        "label": "10Y Breakeven Inflation",
+        "unit": "%",
+        "direction": -1,
+        "source": "FRED T10YIE",
+        "scale": 1.0,
+        "ref_line": 2.5,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Market-implied inflation expectations (10Y).",
+            "reference": "~2–3% anchored; materially >3% = sticky risk (heuristics).",
+            "interpretation": "- Higher breakevens reduce easing room.\n- Lower/anchoring supports duration and risk budgeting.",
+            "bridge": "Higher expected inflation raises the odds of inflation-tolerant policy in stress.",
+        },
+    },
+    "cpi_yoy": {
+        "label": "US CPI YoY",
+        "unit": "%",
+        "direction": -1,
+        "source": "FRED CPIAUCSL (computed YoY)",
+        "scale": 1.0,
+        "ref_line": 3.0,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Headline inflation YoY (proxy).",
+            "reference": "2% is target; >3–4% persistent = sticky risk (heuristics).",
+            "interpretation": "- Disinflation supports duration and often equities.\n- Re-acceleration pushes 'higher-for-longer' risks.",
+            "bridge": "Persistent inflation becomes the binding policy constraint.",
+        },
+    },
+    "unemployment_rate": {
+        "label": "US Unemployment Rate",
+        "unit": "%",
+        "direction": -1,
+        "source": "FRED UNRATE",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Labor slack proxy.",
+            "reference": "Rapid rises often coincide with growth downshift (heuristics).",
+            "interpretation": "- Unemployment rising quickly tends to be risk-off.\n- Stable unemployment is typically benign.",
+            "bridge": "Slack + high debt raises pressure for policy support (fiscal/monetary).",
+        },
+    },
+
+    "usd_index": {
+        "label": "USD Index (DXY / Broad Proxy)",
+        "unit": "",
+        "direction": -1,
+        "source": "yfinance DX-Y.NYB (fallback FRED DTWEXBGS)",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "USD strength proxy. If DXY is unavailable, uses broad trade-weighted USD index.",
+            "reference": "USD up = tighter global conditions (heuristics).",
+            "interpretation": "- USD stronger tightens global funding.\n- USD weaker loosens conditions.",
+            "bridge": "Stronger USD increases global funding stress where liabilities are USD-linked.",
+        },
+    },
+    "hy_oas": {
+        "label": "US High Yield OAS",
+        "unit": "pp",
+        "direction": -1,
+        "source": "FRED BAMLH0A0HYM2",
+        "scale": 1.0,
+        "ref_line": 4.5,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "High-yield credit spread: credit stress / default premium proxy.",
+            "reference": "<4% often benign; >6–7% stress (heuristics).",
+            "interpretation": "- Spreads widening = risk-off.\n- Tight spreads = risk appetite.",
+            "bridge": "Credit stress can accelerate non-linear deleveraging dynamics.",
+        },
+    },
+    "vix": {
+        "label": "VIX",
+        "unit": "",
+        "direction": -1,
+        "source": "yfinance ^VIX",
+        "scale": 1.0,
+        "ref_line": 20.0,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Equity implied volatility (S&P 500).",
+            "reference": "<15 low; 15–25 normal; >25 stress (heuristics).",
+            "interpretation": "- Higher vol tightens conditions through risk premia.\n- Lower vol often supports risk-taking.",
+            "bridge": "Vol spikes tighten conditions even without rate hikes.",
+        },
+    },
+    "spy_trend": {
+        "label": "SPY Trend (SPY / 200D MA)",
+        "unit": "ratio",
+        "direction": +1,
+        "source": "yfinance SPY",
+        "scale": 1.0,
+        "ref_line": 1.0,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Simple trend proxy: SPY vs 200-day moving average.",
+            "reference": ">1 = uptrend; <1 = downtrend (heuristics).",
+            "interpretation": "- Above 1 supports risk-on behavior.\n- Below 1 signals risk-off trend regime.",
+            "bridge": "Trend down + credit stress up is a common deleveraging signature.",
+        },
+    },
+    "hyg_lqd_ratio": {
+        "label": "Credit Risk Appetite (HYG / LQD)",
+        "unit": "ratio",
+        "direction": +1,
+        "source": "yfinance HYG, LQD",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "High yield vs investment grade ratio: credit risk appetite proxy.",
+            "reference": "Ratio up = more HY appetite; down = flight to quality.",
+            "interpretation": "- Rising ratio is typically risk-on.\n- Falling ratio indicates quality bid / caution.",
+            "bridge": "Flight-to-quality signals tightening funding constraints.",
+        },
+    },
+
+    "fed_balance_sheet": {
+        "label": "Fed Balance Sheet (WALCL)",
+        "unit": "bn USD",
+        "direction": +1,
+        "source": "FRED WALCL (millions -> bn)",
+        "scale": 1.0 / 1000.0,
+        "ref_line": None,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Total Fed assets: system liquidity proxy.",
+            "reference": "Expansion (QE) often supports risk assets; contraction (QT) drains (heuristics).",
+            "interpretation": "- Balance sheet up = tailwind.\n- Balance sheet down = headwind.",
+            "bridge": "Liquidity plumbing determines whether flows support or drain risk assets.",
+        },
+    },
+    "rrp": {
+        "label": "Fed Overnight RRP",
+        "unit": "bn USD",
+        "direction": -1,
+        "source": "FRED RRPONTSYD",
+        "scale": 1.0,
+        "ref_line": 0.0,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Overnight reverse repo usage: cash parked in risk-free facility.",
+            "reference": "High RRP = liquidity 'stuck'; falling RRP can release marginal liquidity (heuristics).",
+            "interpretation": "- RRP up = less marginal liquidity for risk.\n- RRP down = potential tailwind.",
+            "bridge": "RRP declines can act as a tactical liquidity release valve.",
+        },
+    },
+
+    "interest_payments": {
+        "label": "US Federal Interest Payments (Quarterly)",
+        "unit": "bn USD",
+        "direction": -1,
+        "source": "FRED A091RC1Q027SBEA",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "pct20y",
+        "expander": {
+            "what": "Government interest expense: debt-service pressure proxy.",
+            "reference": "Rising/accelerating debt service reduces policy flexibility (heuristics).",
+            "interpretation": "- Persistent rise increases policy constraint.\n- Stabilization reduces constraint.",
+            "bridge": "Debt service pressure increases incentives for funding-friendly policy outcomes.",
+        },
+    },
+    "federal_receipts": {
+        "label": "US Federal Current Receipts (Quarterly)",
+        "unit": "bn USD",
+        "direction": +1,
+        "source": "FRED FGRECPT",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "pct20y",
+        "expander": {
+            "what": "Government receipts: supports debt-service capacity.",
+            "reference": "Used to compute interest/receipts sustainability proxy.",
+            "interpretation": "- Receipts up improves capacity (all else equal).\n- Receipts down tightens constraint.",
+            "bridge": "Higher receipts reduce the binding nature of debt service.",
+        },
+    },
+    "interest_to_receipts": {
+        "label": "Debt Service Stress (Interest / Receipts)",
+        "unit": "ratio",
+        "direction": -1,
+        "source": "Derived",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "pct20y",
+        "expander": {
+            "what": "Sustainability proxy: share of receipts consumed by interest expense.",
+            "reference": "High and rising = constraint becomes political (heuristics).",
+            "interpretation": "- Higher ratio signals tighter fiscal policy constraint.\n- Lower ratio signals more room.",
+            "bridge": "Higher debt service increases incentives for inflation-tolerant or funding-friendly policy.",
+        },
+    },
+    "deficit_gdp": {
+        "label": "Federal Surplus/Deficit (% of GDP)",
+        "unit": "%",
+        "direction": -1,
+        "source": "FRED FYFSGDA188S",
+        "scale": 1.0,
+        "ref_line": -3.0,
+        "scoring_mode": "pct20y",
+        "expander": {
+            "what": "Fiscal balance (% of GDP). Negative = deficit.",
+            "reference": "Persistent large deficits increase Treasury supply pressure (heuristics).",
+            "interpretation": "- More negative implies more supply/funding pressure.\n- Improvement reduces pressure.",
+            "bridge": "Supply pressure can show up as higher term premium and weaker duration hedge behavior.",
+        },
+    },
+    "term_premium_10y": {
+        "label": "US 10Y Term Premium (ACM)",
+        "unit": "%",
+        "direction": -1,
+        "source": "FRED ACMTP10",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "pct20y",
+        "expander": {
+            "what": "Term premium: compensation required to hold nominal duration.",
+            "reference": "Rising term premium makes long nominal bonds less reliable as a hedge (heuristics).",
+            "interpretation": "- Term premium up increases duration risk.\n- Term premium down restores hedge quality.",
+            "bridge": "If term premium rises from supply/funding, duration may stop hedging equity drawdowns.",
+        },
+    },
+
+    "current_account_gdp": {
+        "label": "US Current Account Balance (% of GDP)",
+        "unit": "%",
+        "direction": +1,
+        "source": "FRED USAB6BLTT02STSAQ",
+        "scale": 1.0,
+        "ref_line": 0.0,
+        "scoring_mode": "pct20y",
+        "expander": {
+            "what": "External funding constraint proxy. Negative = reliance on foreign capital.",
+            "reference": "More negative implies higher vulnerability during USD tightening (heuristics).",
+            "interpretation": "- More negative increases dependence on external funding.\n- Moving toward 0 reduces constraint.",
+            "bridge": "External deficits increase vulnerability when global USD funding tightens.",
+        },
+    },
+
+    "gold": {
+        "label": "Gold (GLD)",
+        "unit": "",
+        "direction": -1,
+        "source": "yfinance GLD",
+        "scale": 1.0,
+        "ref_line": None,
+        "scoring_mode": "z5y",
+        "expander": {
+            "what": "Gold: hedge demand proxy (policy/inflation/tail risk).",
+            "reference": "Breakouts often reflect hedge demand rather than growth optimism (heuristics).",
+            "interpretation": "- Gold up can signal hedge demand.\n- Gold down in equity bull may reflect clean risk-on.",
+            "bridge": "Gold can hedge environments where real returns are compressed or policy turns funding-friendly.",
+        },
+    },
+}
+
+BLOCKS = {
+    "price_of_time": {
+        "name": "1) Price of Time",
+        "weight": 0.20,
+        "indicators": ["real_10y", "nominal_10y", "yield_curve_10_2"],
+        "desc": "Rates / curve: the price of time and late-cycle signal.",
+        "group": "Market Thermometers",
+    },
+    "macro": {
+        "name": "2) Macro Cycle",
+        "weight": 0.15,
+        "indicators": ["breakeven_10y", "cpi_yoy", "unemployment_rate"],
+        "desc": "Inflation and growth constraint on policy reaction.",
+        "group": "Market Thermometers",
+    },
+    "conditions": {
+        "name": "3) Conditions & Stress",
+        "weight": 0.20,
+        "indicators": ["usd_index", "hy_oas", "vix", "spy_trend", "hyg_lqd_ratio"],
+        "desc": "Fast regime: USD, credit stress, vol, trend, risk appetite.",
+        "group": "Market Thermometers",
+    },
+    "plumbing": {
+        "name": "4) Liquidity / Plumbing",
+        "weight": 0.15,
+        "indicators": ["fed_balance_sheet", "rrp"],
+        "desc": "System liquidity tailwind vs drain for risk assets.",
+        "group": "Market Thermometers",
+    },
+    "policy_link": {
+        "name": "5) Fiscal / Policy Constraint",
+        "weight": 0.20,
+        "indicators": ["interest_to_receipts", "deficit_gdp", "term_premium_10y", "interest_payments", "federal_receipts"],
+        "desc": "Debt service, deficit dynamics, and the funding constraint signal.",
+        "group": "Structural Constraints",
+    },
+    "external": {
+        "name": "6) External Balance",
+        "weight": 0.10,
+        "indicators": ["current_account_gdp"],
+        "desc": "External funding reliance and vulnerability in USD tightening.",
+        "group": "Structural Constraints",
+    },
+    "gold_block": {
+        "name": "7) Gold",
+        "weight": 0.00,
+        "indicators": ["gold"],
+        "desc": "Policy / tail-risk hedge demand confirmation.",
+        "group": "Structural Constraints",
+    },
+}
+
+# ============================================================
+# RAW INPUTS
+# ============================================================
+
+# Raw FRED inputs (see pipeline.load_raw_data): key -> FRED series id
+FRED_SERIES = {
+    "real_10y": "DFII10",
+    "nominal_10y": "DGS10",
+    "dgs2": "DGS2",
+
+    "breakeven_10y": "T10YIE",
+    "cpi_index": "CPIAUCSL",
+    "unemployment_rate": "UNRATE",
+
+    "hy_oas": "BAMLH0A0HYM2",
+    "usd_fred": "DTWEXBGS",
+
+    "fed_balance_sheet": "WALCL",
+    "rrp": "RRPONTSYD",
+
+    "interest_payments": "A091RC1Q027SBEA",
+    "federal_receipts": "FGRECPT",
+    "deficit_gdp": "FYFSGDA188S",
+    "term_premium_10y": "ACMTP10",
+
+    "current_account_gdp": "USAB6BLTT02STSAQ",
+}
+
+# yfinance inputs (closes keyed by ticker)
+YF_TICKERS = ["DX-Y.NYB", "^VIX", "SPY", "HYG", "LQD", "GLD"]
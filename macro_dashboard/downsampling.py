@@ -0,0 +1,87 @@
+"""
+Chart downsampling: reduce a series to a point budget (about one point per
+pixel of chart width) before it is handed to the charting layer, keeping its
+visual extremes.
+
+lttb: Largest-Triangle-Three-Buckets, one point per bucket picked to preserve
+the line's shape. minmax: the lowest and highest point of every bucket, so no
+spike is ever dropped. Both keep the first and last observation.
+"""
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLE_MODES = ("lttb", "minmax")
+
+# ============================================================
+# DOWNSAMPLING
+# ============================================================
+
+def _bucket_edges(n: int, buckets: int) -> np.ndarray:
+    # equal-count buckets over the interior points 1 .. n-2
+    return 1 + np.arange(buckets + 1, dtype=np.int64) * (n - 2) // buckets
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the n_out points LTTB keeps (all of them when n_out >= len)."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = _bucket_edges(n, n_out - 2)
+    counts = np.diff(edges)
+    # "next bucket" point of each bucket: the following bucket's average, the last point for the final one
+    nx = np.append(np.add.reduceat(x[:n - 1], edges[:-1])[1:] / counts[1:], x[-1]).tolist()
+    ny = np.append(np.add.reduceat(y[:n - 1], edges[:-1])[1:] / counts[1:], y[-1]).tolist()
+
+    # sequential (each pick depends on the previous one); buckets hold a few points at
+    # chart budgets, where a scalar loop beats per-bucket numpy calls
+    xs, ys, bounds = x.tolist(), y.tolist(), edges.tolist()
+    out = [0]
+    a = 0
+    for i in range(n_out - 2):
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - nx[i], ny[i] - ay
+        best, a = -1.0, bounds[i]
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs(dx * (ys[j] - ay) - (ax - xs[j]) * dy)
+            if area > best:
+                best, a = area, j
+        out.append(a)
+    out.append(n - 1)
+    return np.array(out, dtype=np.int64)
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the min and max of (n_out - 2) // 2 buckets, in order, plus both ends."""
+    n = len(y)
+    buckets = (n_out - 2) // 2
+    if n_out >= n or buckets < 1:
+        return np.arange(n)
+    edges = _bucket_edges(n, buckets)
+    pos = np.arange(1, n - 1)
+    bucket = np.searchsorted(edges, pos, side="right") - 1
+    order = np.lexsort((y[1:n - 1], bucket)) + 1   # by bucket, then value
+    first = edges[:-1] - 1                          # bucket starts within order
+    last = edges[1:] - 2
+    keep = np.concatenate([[0], order[first], order[last], [n - 1]])
+    return np.unique(keep)
+
+def point_budget(width_px: int, mode: str = "lttb") -> int:
+    """Points a chart width_px wide needs: one per pixel column, two (low, high) for minmax."""
+    return int(width_px) * (2 if mode == "minmax" else 1)
+
+def downsample(series: pd.Series, max_points: int, mode: str = "lttb") -> pd.Series:
+    """
+    series reduced to at most max_points observations (unchanged when it already
+    fits). NaN rows are dropped first when reducing, so the line is drawn through
+    missing values instead of breaking at them.
+    """
+    if mode not in DOWNSAMPLE_MODES:
+        raise ValueError(f"unknown downsample mode: {mode!r} (expected one of {DOWNSAMPLE_MODES})")
+    if series is None or len(series) <= max_points:
+        return series
+    s = series.dropna()
+    y = s.to_numpy(dtype=float)
+    if mode == "minmax":
+        idx = minmax_indices(y, max_points)
+    else:
+        x = pd.DatetimeIndex(s.index).as_unit("ns").asi8 / 86_400e9  # days
+        idx = lttb_indices(x, y, max_points)
+    return s.iloc[idx]
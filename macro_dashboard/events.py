@@ -0,0 +1,145 @@
+"""
+Alert timeline: replayed alert transitions (see alerts.replay_alerts) kept in a
+small SQLite database, so "what fired in the last N weeks" is an indexed range
+query instead of a replay per render.
+"""
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .alerts import replay_alerts
+from .store import STORE_DIR
+
+ALERT_LOG_FILE = "alerts.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alert_events (
+    scope TEXT NOT NULL,        -- "<years>y-<freq>": one timeline per history setting
+    date TEXT NOT NULL,         -- regime grid date, YYYY-MM-DD
+    indicator TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    state TEXT NOT NULL,        -- on / off / change
+    severity TEXT NOT NULL,
+    label TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alert_events_scope_date ON alert_events (scope, date);
+CREATE INDEX IF NOT EXISTS alert_events_scope_rule ON alert_events (scope, rule, indicator);
+CREATE TABLE IF NOT EXISTS alert_replays (
+    scope TEXT PRIMARY KEY,
+    version TEXT NOT NULL,      -- snapshot data version the timeline was replayed from
+    replayed_at TEXT NOT NULL,
+    events INTEGER NOT NULL,
+    grid_end TEXT               -- last regime grid date of the replay, YYYY-MM-DD
+);
+"""
+
+_COLUMNS = ["date", "indicator", "rule", "state", "severity", "label", "message"]
+
+def alert_scope(years_back: int, freq: str) -> str:
+    return f"{int(years_back)}y-{freq}"
+
+class AlertLog:
+    """
+    SQLite alert timeline at path. One connection per call (safe across threads
+    and processes); a replay replaces its scope in a single transaction, so
+    readers see the old or the new timeline, never a mix.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+            if "grid_end" not in [r[1] for r in con.execute("PRAGMA table_info(alert_replays)")]:
+                con.execute("ALTER TABLE alert_replays ADD COLUMN grid_end TEXT")  # logs written before it
+
+    @contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            with con:  # commit / roll back
+                yield con
+        finally:
+            con.close()
+
+    def version(self, scope: str):
+        """Data version the scope was last replayed from (None if never)."""
+        with self._connect() as con:
+            row = con.execute("SELECT version FROM alert_replays WHERE scope = ?", (scope,)).fetchone()
+        return None if row is None else row[0]
+
+    def replace(self, scope: str, version: str, events: list, grid_end=None):
+        rows = [(scope, pd.Timestamp(d).date().isoformat(), *rest) for d, *rest in events]
+        end = None if grid_end is None else pd.Timestamp(grid_end).date().isoformat()
+        with self._connect() as con:
+            con.execute("DELETE FROM alert_events WHERE scope = ?", (scope,))
+            con.executemany("INSERT INTO alert_events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            con.execute("INSERT OR REPLACE INTO alert_replays (scope, version, replayed_at, events, grid_end) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (scope, version, datetime.now(timezone.utc).isoformat(), len(rows), end))
+
+    def events(self, scope: str, since=None, until=None, rules=None) -> pd.DataFrame:
+        """Events of a scope with since <= date <= until, newest first."""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM alert_events WHERE scope = ?"
+        args = [scope]
+        if since is not None:
+            sql += " AND date >= ?"
+            args.append(pd.Timestamp(since).date().isoformat())
+        if until is not None:
+            sql += " AND date <= ?"
+            args.append(pd.Timestamp(until).date().isoformat())
+        if rules:
+            sql += f" AND rule IN ({', '.join('?' * len(rules))})"
+            args += list(rules)
+        with self._connect() as con:
+            rows = con.execute(sql + " ORDER BY date DESC, rowid", args).fetchall()
+        return pd.DataFrame(rows, columns=_COLUMNS)
+
+    def recent(self, scope: str, weeks: int, asof=None) -> pd.DataFrame:
+        """
+        Events in the last `weeks` weeks up to asof (default: the end of the
+        scope's regime grid, so a quiet stretch reads as no events rather than
+        shifting the window back to the last one).
+        """
+        if asof is None:
+            with self._connect() as con:
+                asof = con.execute("SELECT COALESCE(r.grid_end, (SELECT MAX(date) FROM alert_events WHERE scope = ?)) "
+                                   "FROM alert_replays r WHERE r.scope = ?", (scope, scope)).fetchone()
+            asof = None if asof is None else asof[0]
+            if asof is None:
+                return pd.DataFrame(columns=_COLUMNS)
+        since = pd.Timestamp(asof) - pd.Timedelta(weeks=int(weeks))
+        return self.events(scope, since=since, until=asof)
+
+    def counts(self, scope: str, since=None) -> pd.DataFrame:
+        """How often each (indicator, rule) started firing since a date."""
+        sql = "SELECT indicator, label, rule, COUNT(*) FROM alert_events WHERE scope = ? AND state != 'off'"
+        args = [scope]
+        if since is not None:
+            sql += " AND date >= ?"
+            args.append(pd.Timestamp(since).date().isoformat())
+        with self._connect() as con:
+            rows = con.execute(sql + " GROUP BY indicator, label, rule ORDER BY COUNT(*) DESC", args).fetchall()
+        return pd.DataFrame(rows, columns=["indicator", "label", "rule", "count"])
+
+def sync_alert_log(log: AlertLog, snap) -> str:
+    """Replay a Snapshot's alerts over its regime grid unless its version is logged already; returns the scope."""
+    scope = alert_scope(snap.years_back, snap.freq)
+    if log.version(scope) != snap.version:
+        log.replace(scope, snap.version, replay_alerts(snap.indicators, snap.regime_ts.index),
+                    grid_end=snap.regime_ts.index.max() if len(snap.regime_ts) else None)
+    return scope
+
+def get_alert_log():
+    """Log at STORE_DIR/alerts.sqlite; None when the store is disabled or not writable."""
+    if not STORE_DIR:
+        return None
+    try:
+        os.makedirs(STORE_DIR, exist_ok=True)
+        return AlertLog(os.path.join(STORE_DIR, ALERT_LOG_FILE))
+    except (OSError, sqlite3.Error):
+        return None
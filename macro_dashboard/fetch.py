@@ -0,0 +1,389 @@
+"""
+Data fetchers: FRED observations and yfinance closes, batched, with optional
+delta sync against a SeriesStore. requests / yfinance are imported on first use.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import DateOffset
+
+from .flight import SingleFlight
+from .schedule import refresh_due
+from .store import SeriesStore
+
+if TYPE_CHECKING:
+    import requests
+
+# ============================================================
+# DATA FETCHERS
+# ============================================================
+
+# Fetchers always pull (and cache) this much history, once per series; the
+# "History (years)" window is a slice of it, so moving the slider never refetches.
+MAX_HISTORY_YEARS = 30
+
+def max_history_start(today=None) -> str:
+    today = datetime.now(timezone.utc).date() if today is None else today
+    return (today - DateOffset(years=MAX_HISTORY_YEARS)).date().isoformat()
+
+def window_slice(s: pd.Series, start_date) -> pd.Series:
+    """Observations from start_date on, as a positional slice of the sorted index (a view, no copy)."""
+    if s is None or s.empty or start_date is None:
+        return s
+    return s.iloc[s.index.searchsorted(pd.Timestamp(start_date), side="left"):]
+
+def get_fred_api_key():
+    """FRED key from the FRED_API_KEY environment variable (None if unset)."""
+    return os.environ.get("FRED_API_KEY") or None
+
+FRED_BASE_URL = "https://api.stlouisfed.org/fred"
+FRED_TIMEOUT = 12
+FRED_MAX_WORKERS = 8  # concurrent requests for the batch load (one pooled session)
+
+# Delta syncs re-request this far back from the last stored observation, so revised
+# values replace the stored ones: FRED revises recent releases (CPI, payrolls, GDP);
+# for yfinance the overlap is compared to detect re-adjusted history (YF_ADJUST_RTOL).
+FRED_REVISION_LOOKBACK = DateOffset(years=2)
+YF_OVERLAP = DateOffset(days=14)
+YF_ADJUST_RTOL = 1e-6
+# Stored histories are re-downloaded in full this often (revisions older than the lookback)
+FULL_RESYNC_DAYS = 30
+
+# Per-series errors from the last batch load (key -> message), shown in the sidebar
+FRED_FETCH_ERRORS = {}
+
+# Freshness probe counters since process start (see fetch_fred_batch(probe=True)):
+# probed, current (observations download skipped), changed (downloaded), failed (probe error)
+FRED_PROBE_STATS = {"probed": 0, "current": 0, "changed": 0, "failed": 0}
+_FRED_PROBE_LOCK = threading.Lock()
+
+# Process-wide coalescing of identical in-flight loads (one FRED series, one yfinance
+# group): sessions missing their caches at the same moment share one download.
+# FETCH_FLIGHT.stats["shared"] counts the duplicate loads avoided.
+FETCH_FLIGHT = SingleFlight()
+
+_FRED_SESSION = None
+_FRED_SESSION_LOCK = threading.Lock()
+
+def get_fred_session() -> "requests.Session":
+    """Process-wide keep-alive session; its connection pool is sized for the batch load."""
+    global _FRED_SESSION
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _FRED_SESSION_LOCK:
+        if _FRED_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=FRED_MAX_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _FRED_SESSION = session
+        return _FRED_SESSION
+
+# resolution pandas gives parsed date strings (us on pandas 3, ns before), kept for FRED indexes
+_PARSED_DATE_DTYPE = pd.to_datetime(["2000-01-01"]).dtype
+
+def _parse_fred_observations(data: list) -> pd.Series:
+    """
+    Observations payload -> float Series by date, parsed column-wise: YYYY-MM-DD dates
+    as one datetime64 array, values as one object array cast to float.
+    FRED's "." (no observation) and anything else non-numeric become NaN.
+    """
+    if not data:
+        return pd.Series(dtype=float)
+    idx = pd.DatetimeIndex(np.array([o["date"] for o in data], dtype="datetime64[D]").astype(_PARSED_DATE_DTYPE))
+    raw = np.array([o["value"] for o in data], dtype=object)
+    raw[raw == "."] = "nan"
+    try:
+        vals = raw.astype(float)
+    except (TypeError, ValueError):
+        vals = pd.to_numeric(raw, errors="coerce").astype(float)
+    s = pd.Series(vals, index=idx)
+    return s if idx.is_monotonic_increasing else s.sort_index()
+
+def _fred_observations(session: "requests.Session", series_id: str, start_date: str, api_key: str,
+                       base_url: str = FRED_BASE_URL) -> pd.Series:
+    """One observations request; raises on HTTP / payload errors (callers decide how to degrade)."""
+    params = {
+        "series_id": series_id,
+        "api_key": api_key,
+        "file_type": "json",
+        "observation_start": start_date,
+    }
+    r = session.get(f"{base_url}/series/observations", params=params, timeout=FRED_TIMEOUT)
+    r.raise_for_status()
+    return _parse_fred_observations(r.json().get("observations", []))
+
+def _fred_last_updated(session: "requests.Session", series_id: str, api_key: str,
+                       base_url: str = FRED_BASE_URL) -> str:
+    """The series' metadata last_updated stamp (changes with every release or revision); raises on errors."""
+    params = {"series_id": series_id, "api_key": api_key, "file_type": "json"}
+    r = session.get(f"{base_url}/series", params=params, timeout=FRED_TIMEOUT)
+    r.raise_for_status()
+    return r.json()["seriess"][0]["last_updated"]
+
+def _count_probe(outcome: str):
+    with _FRED_PROBE_LOCK:
+        FRED_PROBE_STATS["probed"] += 1
+        FRED_PROBE_STATS[outcome] += 1
+
+def _not_due(store: SeriesStore, key: str, stored) -> bool:
+    """A stored delta-synced series whose next update is not expected yet (schedule.next_refresh)."""
+    return stored is not None and not refresh_due(store.meta(key), stored)
+
+def _fred_error_message(e: Exception) -> str:
+    # Never echo the request URL: it carries the API key.
+    response = getattr(e, "response", None)
+    if type(e).__name__ == "HTTPError" and response is not None:
+        return f"HTTP {response.status_code}"
+    return type(e).__name__
+
+def fetch_fred_batch(series_map: dict, start_date: str, api_key: str, max_workers: int = FRED_MAX_WORKERS,
+                     session: "requests.Session" = None, base_url: str = FRED_BASE_URL, store: SeriesStore = None,
+                     scheduled: bool = False, probe: bool = False):
+    """
+    Fetch every series of series_map ({key: series_id}) concurrently over one pooled session,
+    so a cold load costs about as much as the slowest series. Concurrent batches loading
+    the same series share one request (FETCH_FLIGHT). With a store, only the
+    observations after the last stored date and FRED_REVISION_LOOKBACK before it are
+    requested (observation_start), with a full download every FULL_RESYNC_DAYS, and
+    the stored copy is served if that request fails. scheduled=True also skips the
+    request for stored series that are not due yet (schedule.refresh_due).
+
+    probe=True reads a series' metadata (last_updated, a small /series request)
+    before its observations; when it matches the stamp recorded with the stored
+    copy, the observations download is skipped (unless a full resync is due). A
+    changed stamp (a release or a revision) downloads the revision window as
+    above, and the new stamp is recorded only once that download succeeded. Outcomes
+    are counted in FRED_PROBE_STATS; a failed probe falls back to the download.
+
+    Returns (series, errors): series has every key (empty Series on failure),
+    errors maps the failed keys to a message.
+    """
+    out, errors = {}, {}
+    if not series_map:
+        return out, errors
+    session = get_fred_session() if session is None else session
+
+    def _load(series_id):
+        if store is None:
+            return _fred_observations(session, series_id, start_date, api_key, base_url)
+        key = f"fred/{series_id}"
+        stored, since = store.plan(key, start_date, FRED_REVISION_LOOKBACK, FULL_RESYNC_DAYS)
+        if scheduled and _not_due(store, key, stored):
+            return window_slice(stored, start_date)
+        updated = None
+        if probe:
+            try:
+                updated = _fred_last_updated(session, series_id, api_key, base_url)
+            except Exception:
+                _count_probe("failed")
+            else:
+                # an unchanged stamp answers a delta sync, not a due full resync (since == start_date)
+                if stored is not None and since > start_date and updated == store.meta(key).get("last_updated"):
+                    _count_probe("current")
+                    store.mark_checked(key, stored)
+                    return window_slice(stored, start_date)
+                _count_probe("changed")
+        try:
+            fetched = _fred_observations(session, series_id, since, api_key, base_url)
+        except Exception:
+            if stored is None:
+                raise
+            fetched = None
+        merged = store.merge(key, start_date, stored, since, fetched)
+        if updated is not None and fetched is not None:
+            # stamp read before the download: a release in between only costs one more download
+            store.update_meta(key, last_updated=updated)
+        return merged
+
+    def _flight(series_id):
+        flight_key = ("fred", store and store.root, series_id, start_date, api_key, base_url, scheduled, probe)
+        return FETCH_FLIGHT.do(flight_key, lambda: _load(series_id))
+
+    n_workers = max(1, min(int(max_workers), len(series_map)))
+    with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="fred") as pool:
+        futures = {key: pool.submit(_flight, sid) for key, sid in series_map.items()}
+        for key, fut in futures.items():
+            try:
+                out[key] = fut.result()
+            except Exception as e:
+                out[key] = pd.Series(dtype=float)
+                errors[key] = f"{series_map[key]}: {_fred_error_message(e)}"
+    return out, errors
+
+YF_MAX_WORKERS = 6
+
+# ------------------------------------------------------------
+# yfinance transports: callables (tickers, start_date) -> wide OHLC frame with
+# (ticker, field) columns. Swap them to benchmark against recorded fixtures.
+# ------------------------------------------------------------
+
+def yf_bulk_transport(tickers: list, start_date: str) -> pd.DataFrame:
+    """All tickers in one multi-ticker download."""
+    import yfinance as yf
+
+    return yf.download(
+        list(tickers), start=start_date, auto_adjust=True, group_by="ticker",
+        threads=True, progress=False, multi_level_index=True,
+    )
+
+def yf_pool_transport(tickers: list, start_date: str, max_workers: int = YF_MAX_WORKERS) -> pd.DataFrame:
+    """Ticker.history per ticker on a bounded thread pool; failed tickers are left out."""
+    import yfinance as yf
+
+    def _one(t):
+        df = yf.Ticker(t).history(start=start_date, auto_adjust=True)
+        if df is None or df.empty:
+            return None
+        # per-ticker exchange timezones would not align in one frame: drop them here
+        if getattr(df.index, "tz", None) is not None:
+            df = df.tz_localize(None)
+        return df
+
+    frames = {}
+    if not tickers:
+        return pd.DataFrame()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers))), thread_name_prefix="yf") as pool:
+        futures = {t: pool.submit(_one, t) for t in tickers}
+        for t, fut in futures.items():
+            try:
+                df = fut.result()
+            except Exception:
+                continue
+            if df is not None:
+                frames[t] = df
+    return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+def recorded_yf_transport(path: str):
+    """Transport replaying a frame saved by record_yf_fixture (offline benchmarks)."""
+    def _transport(tickers: list, start_date: str) -> pd.DataFrame:
+        raw = pd.read_parquet(path)
+        idx = raw.index.tz_localize(None) if raw.index.tz is not None else raw.index
+        raw = raw.loc[idx >= pd.to_datetime(start_date)]
+        return raw.loc[:, raw.columns.get_level_values(0).isin(list(tickers))]
+    return _transport
+
+def record_yf_fixture(path: str, tickers: list, start_date: str, transport=None) -> pd.DataFrame:
+    raw = (yf_bulk_transport if transport is None else transport)(list(tickers), start_date)
+    raw.to_parquet(path)
+    return raw
+
+def yf_close_panel(raw: pd.DataFrame, tickers: list) -> dict:
+    """
+    Wide (ticker, field) frame -> {ticker: close series}, normalized in one step:
+    timezone stripped once for the whole panel, 'Adj Close' preferred over 'Close'
+    for tickers that have it. Tickers without data map to an empty Series.
+    """
+    out = {t: pd.Series(dtype=float) for t in tickers}
+    if raw is None or raw.empty or not isinstance(raw.columns, pd.MultiIndex):
+        return out
+
+    fields = set(raw.columns.get_level_values(1))
+    if "Close" not in fields and "Adj Close" not in fields:
+        return out
+    close = raw.xs("Close", axis=1, level=1) if "Close" in fields else pd.DataFrame(index=raw.index)
+    if "Adj Close" in fields:
+        adj = raw.xs("Adj Close", axis=1, level=1)
+        use_adj = adj.columns[adj.notna().any().to_numpy()]
+        close = pd.concat([close.drop(columns=use_adj, errors="ignore"), adj[use_adj]], axis=1)
+
+    idx = pd.to_datetime(close.index)
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    close = close.set_axis(idx, axis=0).sort_index().astype(float)
+
+    for t in tickers:
+        if t in close.columns:
+            out[t] = close[t].dropna().rename("Close")
+    return out
+
+def _adjustment_changed(stored: pd.Series, fetched: pd.Series, rtol: float = YF_ADJUST_RTOL) -> bool:
+    """
+    Whether re-fetched closes before the last stored bar (which may have been a
+    live bar) differ from the stored ones: a dividend or split re-adjusted the
+    whole history backwards, so the stored levels no longer join the new ones.
+    """
+    if stored is None or stored.empty or fetched is None or fetched.empty:
+        return False
+    common = fetched.index.intersection(stored.index[stored.index < stored.index.max()])
+    if common.empty:
+        return False
+    return not np.allclose(stored.loc[common].to_numpy(dtype=float), fetched.loc[common].to_numpy(dtype=float),
+                           rtol=rtol, atol=0.0, equal_nan=True)
+
+def _fetch_yf_close(tickers: list, start_date: str, transport, fallback):
+    """
+    ({ticker: close}, failed): failed holds the tickers no transport call answered
+    (the call raised), as opposed to tickers it answered with no data.
+    """
+    failed = set()
+    try:
+        raw = transport(tickers, start_date)
+    except Exception:
+        raw = None
+        failed.update(tickers)
+    out = yf_close_panel(raw, tickers)
+
+    missing = [t for t in tickers if out[t].empty]
+    if missing and fallback is not None:
+        try:
+            retry = yf_close_panel(fallback(missing, start_date), missing)
+        except Exception:
+            retry = {}
+        else:
+            failed.difference_update(missing)
+        out.update({t: s for t, s in retry.items() if not s.empty})
+    return out, failed
+
+def fetch_yf_batch(tickers: list, start_date: str, transport=yf_bulk_transport, fallback=yf_pool_transport,
+                   store: SeriesStore = None, scheduled: bool = False) -> dict:
+    """
+    Close series for every ticker via one transport call. A failed bulk call or a
+    ticker it returned no data for is retried through fallback (per-ticker isolation).
+
+    With a store, tickers are grouped by the date they need data from: stored
+    histories only request from YF_OVERLAP before their last stored date on
+    (yfinance start), or everything every FULL_RESYNC_DAYS. A ticker whose overlap
+    no longer matches the stored closes (re-adjusted for a dividend or split) is
+    downloaded in full again. scheduled=True serves the ones that are not due
+    yet without a request.
+    Concurrent batches requesting the same group share one download (FETCH_FLIGHT).
+    """
+    tickers = list(tickers)
+    if store is None:
+        return FETCH_FLIGHT.do(("yf", None, tuple(tickers), start_date, transport, fallback),
+                               lambda: _fetch_yf_close(tickers, start_date, transport, fallback)[0])
+
+    plans = {t: store.plan(f"yf/{t}", start_date, YF_OVERLAP, FULL_RESYNC_DAYS) for t in tickers}
+    out, groups = {}, {}
+    for t, (stored, since) in plans.items():
+        if scheduled and _not_due(store, f"yf/{t}", stored):
+            out[t] = window_slice(stored, start_date)
+        else:
+            groups.setdefault(since, []).append(t)
+
+    def _sync(group, since):
+        # an empty delta is normal (no new bar yet): only full downloads get the fallback
+        full = since <= start_date
+        fetched, failed = _fetch_yf_close(group, since, transport, fallback if full else None)
+        since_of = dict.fromkeys(group, since)
+        readjusted = [] if full else [t for t in group if _adjustment_changed(plans[t][0], fetched[t])]
+        if readjusted:
+            refetched, refailed = _fetch_yf_close(readjusted, start_date, transport, fallback)
+            fetched.update(refetched)
+            failed.update(refailed)
+            since_of.update(dict.fromkeys(readjusted, start_date))
+        # a failed request is not a poll: merge(fetched=None) serves the stored copy without marking it checked
+        return {t: store.merge(f"yf/{t}", start_date, plans[t][0], since_of[t], None if t in failed else fetched[t])
+                for t in group}
+
+    for since, group in groups.items():
+        flight_key = ("yf", store.root, tuple(group), since, start_date, transport, fallback)
+        out.update(FETCH_FLIGHT.do(flight_key, lambda: _sync(group, since)))
+    return out
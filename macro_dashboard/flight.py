@@ -0,0 +1,47 @@
+"""
+Single-flight call coalescing: concurrent callers asking for the same key wait
+on the one call in flight and share its result, so a cache expiry seen by many
+sessions at once costs one load instead of one per session.
+"""
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    do(key, fn): run fn() unless a call for key is already in flight, in which
+    case wait for it and return its result (or raise its exception). Nothing is
+    cached: a call after the in-flight one finished runs fn again.
+
+    stats counts calls, leaders (calls that ran fn) and shared (duplicate loads
+    avoided: calls that waited on a leader instead).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.stats = {"calls": 0, "leaders": 0, "shared": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            self.stats["calls"] += 1
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+                self.stats["leaders"] += 1
+            else:
+                self.stats["shared"] += 1
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
@@ -0,0 +1,66 @@
+"""
+Operating lines: portfolio stance per sleeve from block / indicator scores.
+"""
+import numpy as np
+
+# ============================================================
+# OPERATING LINES
+# ============================================================
+
+def operating_lines(block_scores: dict, indicator_scores: dict):
+    gs = block_scores.get("GLOBAL", {}).get("score", np.nan)
+
+    def _sg(x):
+        if np.isnan(x):
+            return 0.0
+        return float(x)
+
+    cond = _sg(block_scores.get("conditions", {}).get("score", np.nan))
+    macro = _sg(block_scores.get("macro", {}).get("score", np.nan))
+    pot = _sg(block_scores.get("price_of_time", {}).get("score", np.nan))
+    policy = _sg(block_scores.get("policy_link", {}).get("score", np.nan))
+
+    if not np.isnan(gs):
+        if gs >= 60 and cond >= 55:
+            equity = "Increase (measured) — risk budget OK, watch credit"
+        elif gs <= 40 or cond <= 40:
+            equity = "Reduce — defense/quality first"
+        else:
+            equity = "Neutral — moderate sizing"
+    else:
+        equity = "n/a"
+
+    termp = _sg(indicator_scores.get("term_premium_10y", {}).get("score", np.nan))
+    infl = _sg(indicator_scores.get("cpi_yoy", {}).get("score", np.nan))
+
+    if termp <= 40 and infl <= 45:
+        duration = "Short/neutral — avoid long nominals; prefer quality / TIPS tilt"
+    elif pot <= 40 and infl <= 45 and termp >= 55:
+        duration = "Long (hedge) — disinflation + duration hedge looks cleaner"
+    else:
+        duration = "Neutral — balance term-premium risk vs cycle"
+
+    hy = _sg(indicator_scores.get("hy_oas", {}).get("score", np.nan))
+    hyg = _sg(indicator_scores.get("hyg_lqd_ratio", {}).get("score", np.nan))
+    ds = _sg(indicator_scores.get("interest_to_receipts", {}).get("score", np.nan))
+
+    if hy <= 40 or hyg <= 40 or ds <= 40:
+        credit = "IG > HY — reduce default / funding risk"
+    elif hy >= 60 and hyg >= 60 and policy >= 50:
+        credit = "Opportunistic HY — only with sizing discipline"
+    else:
+        credit = "Neutral — quality + selectivity"
+
+    usd = _sg(indicator_scores.get("usd_index", {}).get("score", np.nan))
+    gold = _sg(indicator_scores.get("gold", {}).get("score", np.nan))
+
+    if policy <= 40 and (macro <= 55):
+        hedges = "Gold / real-asset tilt — policy constraint risk"
+    elif usd <= 40 and cond <= 45:
+        hedges = "USD / cash-like — funding stress hedge"
+    elif gold <= 40:
+        hedges = "Keep a small gold sleeve — hedge demand rising"
+    else:
+        hedges = "Light mix — cash-like + tactical gold"
+
+    return equity, duration, credit, hedges
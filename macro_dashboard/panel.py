@@ -0,0 +1,164 @@
+"""
+Columnar indicator panel: one shared int64 (ns) date axis, one value column per
+indicator and a uint8 validity mask per column (1 where the series has a row).
+Values are NaN where the series has no row, so "usable observation" is simply
+"not NaN" for the scoring kernels and the mask only matters for rebuilding the
+original Series (NaN rows included).
+
+Stored as an uncompressed Arrow IPC file: Panel.open() memory-maps it and every
+column is a read-only view of the shared pages, so worker processes serving the
+same artifact share one copy.
+"""
+import json
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from .scoring import LOOKBACK_DAYS, lookback_index, pct_change_column, trend_from_lookback
+
+PANEL_META_KEY = b"macro_dashboard.panel"
+
+def _write_table(path: str, table):
+    import pyarrow as pa
+
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+def _map_table(path: str):
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+def _column(table, name: str) -> np.ndarray:
+    # single-chunk, null-free primitive column -> read-only view of the mapped file
+    col = table.column(name)
+    if col.num_chunks == 0:
+        return np.empty(0, dtype=col.type.to_pandas_dtype())
+    return col.chunk(0).to_numpy(zero_copy_only=True)
+
+def _readonly(a: np.ndarray) -> np.ndarray:
+    a.flags.writeable = False
+    return a
+
+class Panel(Mapping):
+    """
+    Indicators on a shared date axis. column(key) gives zero-copy (dates, values)
+    views trimmed to the column's rows; panel[key] rebuilds the Series (cached,
+    read-only) for code that wants pandas, e.g. charts.
+
+    A lookback index (scoring.lookback_index) is built per column on load, so
+    trend(), pct_change() for LOOKBACK_DAYS and last_date() are O(1).
+    """
+
+    def __init__(self, dates: np.ndarray, values: dict, valid: dict, spans: dict, rows: dict):
+        self.dates = dates
+        self._values = values
+        self._valid = valid
+        self._spans = spans   # key -> (first row, last row + 1) on the axis
+        self._rows = rows     # key -> rows the series has (NaN rows included)
+        self._series = {}
+        self._lock = threading.Lock()
+        self._lookback = {k: lookback_index(*self.column(k)) for k in spans}
+
+    @classmethod
+    def from_series(cls, series: dict, dtype=np.float64) -> "Panel":
+        """Align a {key: Series} mapping onto the union of their dates."""
+        idx = {k: pd.DatetimeIndex(s.index).as_unit("ns").asi8
+               for k, s in series.items() if s is not None and len(s)}
+        dates = np.unique(np.concatenate(list(idx.values()))) if idx else np.empty(0, dtype=np.int64)
+        values, valid, spans, rows = {}, {}, {}, {}
+        for k, s in series.items():
+            v = np.full(len(dates), np.nan, dtype=dtype)
+            m = np.zeros(len(dates), dtype=np.uint8)
+            if k in idx:
+                pos = np.searchsorted(dates, idx[k])
+                v[pos] = s.to_numpy(dtype=dtype)
+                m[pos] = 1
+                spans[k] = (int(pos.min()), int(pos.max()) + 1)
+            else:
+                spans[k] = (0, 0)
+            rows[k] = int(m.sum())
+            values[k] = _readonly(v)
+            valid[k] = _readonly(m)
+        return cls(_readonly(dates), values, valid, spans, rows)
+
+    @classmethod
+    def open(cls, path: str) -> "Panel":
+        """Memory-map a panel written by write(); columns are views of the file."""
+        table = _map_table(path)
+        meta = json.loads(table.schema.metadata[PANEL_META_KEY])
+        spans = {k: tuple(v) for k, v in meta["spans"].items()}
+        values = {k: _column(table, k) for k in spans}
+        valid = {k: _column(table, f"{k}.valid") for k in spans}
+        return cls(_column(table, "date"), values, valid, spans, meta["rows"])
+
+    def write(self, path: str):
+        import pyarrow as pa
+
+        cols = {"date": pa.array(self.dates, type=pa.int64())}
+        for k in self._spans:
+            cols[k] = pa.array(self._values[k], type=pa.from_numpy_dtype(self._values[k].dtype))
+            cols[f"{k}.valid"] = pa.array(self._valid[k], type=pa.uint8())
+        meta = {"spans": self._spans, "rows": self._rows}
+        _write_table(path, pa.table(cols).replace_schema_metadata({PANEL_META_KEY: json.dumps(meta)}))
+
+    def column(self, key: str):
+        """(dates int64 ns, values) views over the rows the series spans."""
+        a, b = self._spans[key]
+        return self.dates[a:b], self._values[key][a:b]
+
+    def row_dates(self, key: str) -> np.ndarray:
+        """Dates (int64 ns) the series has a row on, NaN rows included."""
+        a, b = self._spans[key]
+        return self.dates[a:b][self._valid[key][a:b].view(bool)]
+
+    def rows(self, key: str) -> int:
+        return self._rows.get(key, 0)
+
+    def last_date(self, key: str):
+        """Date of the series' last row (NaN rows included), None when it has none."""
+        a, b = self._spans.get(key, (0, 0))
+        return None if b == a else pd.Timestamp(int(self.dates[b - 1]))
+
+    def lookback(self, key: str) -> dict:
+        ix = self._lookback.get(key)
+        if ix is None:
+            ix = lookback_index(np.empty(0, dtype=np.int64), np.empty(0))
+        return ix
+
+    def trend(self, key: str) -> dict:
+        """recent_trend of the series."""
+        return trend_from_lookback(self.lookback(key))
+
+    def pct_change(self, key: str, days: int) -> float:
+        """pct_change_over_days of the series (indexed for LOOKBACK_DAYS)."""
+        if days in LOOKBACK_DAYS:
+            return self.lookback(key)["pct"][days]
+        if key not in self._spans:
+            return np.nan
+        return pct_change_column(*self.column(key), days)
+
+    def __getitem__(self, key: str) -> pd.Series:
+        s = self._series.get(key)
+        if s is None:
+            if key not in self._spans:
+                raise KeyError(key)
+            a, b = self._spans[key]
+            keep = self._valid[key][a:b].view(bool)
+            idx = pd.DatetimeIndex(_readonly(self.row_dates(key)).view("datetime64[ns]"), copy=False)
+            s = pd.Series(_readonly(self._values[key][a:b][keep]), index=idx, copy=False)
+            with self._lock:
+                s = self._series.setdefault(key, s)
+        return s
+
+    def __iter__(self):
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, key) -> bool:
+        return key in self._spans
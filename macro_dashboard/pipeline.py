@@ -0,0 +1,172 @@
+"""
+Pipeline: raw series -> derived indicators -> indicator / block scores.
+"""
+import numpy as np
+import pandas as pd
+
+from .config import BLOCKS, FRED_SERIES, INDICATOR_META, YF_TICKERS
+from .fetch import (FRED_FETCH_ERRORS, fetch_fred_batch, fetch_yf_batch, get_fred_api_key,
+                    max_history_start, window_slice)
+from .panel import Panel
+from .scoring import classify_status, compute_indicator_score, score_column
+from .store import get_series_store
+
+# ============================================================
+# PIPELINE (raw series -> indicators -> scores)
+# ============================================================
+
+def load_raw_data(api_key: str = None, store=None, scheduled: bool = True, probe: bool = True):
+    """
+    (fred, yf_map): full-history raw FRED series keyed like FRED_SERIES and closes
+    keyed by ticker. Apply a history window with window_slice.
+
+    Headless loader: the FRED key defaults to FRED_API_KEY (no key -> empty FRED
+    series), the store to the default series store. Per-series FRED errors are
+    left in FRED_FETCH_ERRORS. Stored series that are not due for an update
+    (schedule.refresh_due) are served without a request unless scheduled=False,
+    and stored FRED series whose last_updated stamp has not moved without an
+    observations download unless probe=False (counted in FRED_PROBE_STATS).
+    """
+    api_key = get_fred_api_key() if api_key is None else api_key
+    store = get_series_store() if store is None else store
+    start = max_history_start()
+    if api_key is None:
+        fred = {k: pd.Series(dtype=float) for k in FRED_SERIES}
+    else:
+        fred, errors = fetch_fred_batch(FRED_SERIES, start, api_key, store=store, scheduled=scheduled,
+                                         probe=probe)
+        FRED_FETCH_ERRORS.clear()
+        FRED_FETCH_ERRORS.update(errors)
+    yf_map = fetch_yf_batch(YF_TICKERS, start, store=store, scheduled=scheduled)
+    return fred, yf_map
+
+def load_stored_data(store=None):
+    """(fred, yf_map) from the series store only (no network); missing series are empty."""
+    store = get_series_store() if store is None else store
+    fred, yf_map = {}, {}
+    for key, series_id in FRED_SERIES.items():
+        s = None if store is None else store.load(f"fred/{series_id}")[0]
+        fred[key] = pd.Series(dtype=float) if s is None else s
+    for t in YF_TICKERS:
+        s = None if store is None else store.load(f"yf/{t}")[0]
+        yf_map[t] = pd.Series(dtype=float) if s is None else s
+    return fred, yf_map
+
+def window_raw_data(fred: dict, yf_map: dict, start_date: str):
+    """Zero-copy window over the raw inputs (derived indicators are built from it)."""
+    return ({k: window_slice(s, start_date) for k, s in fred.items()},
+            {k: window_slice(s, start_date) for k, s in yf_map.items()})
+
+def build_indicators(fred: dict, yf_map: dict) -> dict:
+    indicators = {}
+
+    # Derived: yield curve
+    if not fred["nominal_10y"].empty and not fred["dgs2"].empty:
+        yc = fred["nominal_10y"].to_frame("10y").join(fred["dgs2"].to_frame("2y"), how="inner")
+        indicators["yield_curve_10_2"] = (yc["10y"] - yc["2y"]).dropna()
+    else:
+        indicators["yield_curve_10_2"] = pd.Series(dtype=float)
+
+    # CPI YoY
+    if not fred["cpi_index"].empty:
+        indicators["cpi_yoy"] = (fred["cpi_index"].pct_change(12) * 100.0).dropna()
+    else:
+        indicators["cpi_yoy"] = pd.Series(dtype=float)
+
+    # Direct FRED
+    indicators["real_10y"] = fred["real_10y"]
+    indicators["nominal_10y"] = fred["nominal_10y"]
+    indicators["breakeven_10y"] = fred["breakeven_10y"]
+    indicators["unemployment_rate"] = fred["unemployment_rate"]
+
+    indicators["hy_oas"] = fred["hy_oas"]
+    indicators["fed_balance_sheet"] = fred["fed_balance_sheet"]
+    indicators["rrp"] = fred["rrp"]
+
+    indicators["interest_payments"] = fred["interest_payments"]
+    indicators["federal_receipts"] = fred["federal_receipts"]
+    indicators["deficit_gdp"] = fred["deficit_gdp"]
+    indicators["term_premium_10y"] = fred["term_premium_10y"]
+    indicators["current_account_gdp"] = fred["current_account_gdp"]
+
+    # Derived: interest / receipts ratio
+    ip = indicators.get("interest_payments", pd.Series(dtype=float))
+    fr = indicators.get("federal_receipts", pd.Series(dtype=float))
+    if (ip is not None and fr is not None) and (not ip.empty) and (not fr.empty):
+        join = ip.to_frame("interest").join(fr.to_frame("receipts"), how="inner").dropna()
+        join = join[join["receipts"] != 0]
+        indicators["interest_to_receipts"] = (join["interest"] / join["receipts"]).dropna()
+    else:
+        indicators["interest_to_receipts"] = pd.Series(dtype=float)
+
+    # YFinance
+    dxy = yf_map.get("DX-Y.NYB", pd.Series(dtype=float))
+    if dxy is None or dxy.empty:
+        dxy = fred["usd_fred"]
+    indicators["usd_index"] = dxy
+
+    indicators["vix"] = yf_map.get("^VIX", pd.Series(dtype=float))
+
+    spy = yf_map.get("SPY", pd.Series(dtype=float))
+    if spy is not None and not spy.empty:
+        ma200 = spy.rolling(200).mean()
+        indicators["spy_trend"] = (spy / ma200).dropna()
+    else:
+        indicators["spy_trend"] = pd.Series(dtype=float)
+
+    hyg = yf_map.get("HYG", pd.Series(dtype=float))
+    lqd = yf_map.get("LQD", pd.Series(dtype=float))
+    if hyg is not None and lqd is not None and (not hyg.empty) and (not lqd.empty):
+        joined = hyg.to_frame("HYG").join(lqd.to_frame("LQD"), how="inner").dropna()
+        indicators["hyg_lqd_ratio"] = (joined["HYG"] / joined["LQD"]).dropna()
+    else:
+        indicators["hyg_lqd_ratio"] = pd.Series(dtype=float)
+
+    indicators["gold"] = yf_map.get("GLD", pd.Series(dtype=float))
+    return indicators
+
+def score_indicators(indicators: dict) -> dict:
+    """Per-indicator score / signal / latest / status; a Panel is scored from its columns."""
+    indicator_scores = {}
+    for key, meta in INDICATOR_META.items():
+        mode = meta.get("scoring_mode", "z5y")
+        if isinstance(indicators, Panel):
+            if key in indicators:
+                score, sig, latest = score_column(*indicators.column(key), meta["direction"], scoring_mode=mode)
+            else:
+                score, sig, latest = np.nan, np.nan, np.nan
+        else:
+            series = indicators.get(key, pd.Series(dtype=float))
+            score, sig, latest = compute_indicator_score(series, meta["direction"], scoring_mode=mode)
+        indicator_scores[key] = {
+            "score": score,
+            "signal": sig,
+            "latest": latest,
+            "status": classify_status(score),
+            "mode": mode
+        }
+    return indicator_scores
+
+def score_blocks(indicator_scores: dict) -> dict:
+    """Block scores + weighted GLOBAL (under the "GLOBAL" key)."""
+    block_scores = {}
+    global_score = 0.0
+    w_used = 0.0
+
+    for bkey, binfo in BLOCKS.items():
+        vals = []
+        for ikey in binfo["indicators"]:
+            sc = indicator_scores.get(ikey, {}).get("score", np.nan)
+            if not np.isnan(sc):
+                vals.append(sc)
+
+        bscore = float(np.mean(vals)) if vals else np.nan
+        block_scores[bkey] = {"score": bscore, "status": classify_status(bscore)}
+
+        if binfo["weight"] > 0 and not np.isnan(bscore):
+            global_score += bscore * binfo["weight"]
+            w_used += binfo["weight"]
+
+    global_score = (global_score / w_used) if w_used > 0 else np.nan
+    block_scores["GLOBAL"] = {"score": global_score, "status": classify_status(global_score)}
+    return block_scores
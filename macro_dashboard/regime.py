@@ -0,0 +1,246 @@
+"""
+Regime history: block + GLOBAL scores re-derived at every grid date from the
+observations available at that date (vectorized as-of engine).
+"""
+from bisect import bisect_left, bisect_right, insort
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import DateOffset
+
+from .config import BLOCKS, INDICATOR_META
+from .scoring import compute_indicator_score
+
+# ============================================================
+# REGIME HISTORY (GLOBAL + BLOCKS) — weekly by default
+# ============================================================
+
+def _safe_last(series: pd.Series):
+    if series is None or series.empty:
+        return None
+    s = series.dropna()
+    if s.empty:
+        return None
+    return s.iloc[-1]
+
+# ------------------------------------------------------------
+# Vectorized as-of engine
+# The score at grid date t only depends on the last observation <= t, so we
+# score every observation once (one pass per indicator), then as-of join the
+# per-observation path onto the grid. Blocks / GLOBAL are matrix reductions.
+# ------------------------------------------------------------
+
+def _asof_window_starts(idx: pd.DatetimeIndex, years: int, min_len: int, p0: int = 0) -> np.ndarray:
+    """
+    Position of the first observation inside [idx[i] - years, idx[i]] for every
+    i >= p0 (same DateOffset rule as compute_indicator_score_asof). Windows holding
+    fewer than min_len points fall back to the full history, i.e. start 0.
+    """
+    tail = idx[p0:]
+    lo = np.asarray(idx.searchsorted(tail - DateOffset(years=years), side="left"), dtype=np.int64)
+    n = np.arange(p0, len(idx), dtype=np.int64) - lo + 1
+    lo[n < min_len] = 0
+    return lo
+
+def _z5y_signal_path(idx: pd.DatetimeIndex, vals: np.ndarray, p0: int = 0) -> np.ndarray:
+    """Signal for observations p0.. (NaN before p0)."""
+    n = len(vals)
+    lo = _asof_window_starts(idx, 5, 10, p0)
+    hi = np.arange(p0 + 1, n + 1, dtype=np.int64)
+    cnt = (hi - lo).astype(float)
+
+    # Prefix sums (extended precision) on values shifted by the first observation,
+    # so windowed mean/std agree with pandas' per-slice mean()/std() to a few ulps.
+    x = vals - vals[0]
+    xl = x.astype(np.longdouble)
+    c1 = np.concatenate(([0.0], np.cumsum(xl)))
+    c2 = np.concatenate(([0.0], np.cumsum(xl * xl)))
+    s1 = c1[hi] - c1[lo]
+    s2 = c2[hi] - c2[lo]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_l = s1 / cnt
+        var = (np.maximum(s2 - s1 * mean_l, 0.0) / (cnt - 1.0)).astype(float)
+        mean = mean_l.astype(float)
+        std = np.sqrt(var)
+
+        # A window is flat iff the last value change happened at or before its start:
+        # treat it as std == 0 (neutral signal) instead of dividing by rounding noise.
+        chg = np.zeros(n, dtype=np.int64)
+        chg[1:] = np.where(vals[1:] != vals[:-1], np.arange(1, n, dtype=np.int64), 0)
+        flat = np.maximum.accumulate(chg)[p0:] <= lo
+        std[flat] = 0.0
+
+        ok = (std != 0) & ~np.isnan(std)
+        sig = np.full(n, np.nan)
+        sig[p0:] = np.where(ok, (x[p0:] - mean) / np.where(ok, std, 1.0), 0.0)
+    return sig
+
+def _pct20y_signal_path(idx: pd.DatetimeIndex, vals: np.ndarray, p0: int = 0) -> np.ndarray:
+    """
+    Percentile of each observation p0.. inside its as-of 20Y window (NaN before
+    p0), from a sorted window that slides along the series: insert the new point,
+    evict points that fell out of the window, then one bisect answers
+    count(window <= latest). O(log n) per point instead of re-slicing and
+    comparing the whole window.
+    """
+    lo = _asof_window_starts(idx, 20, 20, p0).tolist()
+    v = vals.tolist()
+    cur_lo = lo[0] if lo else 0
+    window = sorted(v[cur_lo:p0])
+    p = np.full(len(v), np.nan)
+    for i in range(p0, len(v)):
+        x = v[i]
+        insort(window, x)
+        target = lo[i - p0]
+        while cur_lo < target:
+            del window[bisect_left(window, v[cur_lo])]
+            cur_lo += 1
+        while cur_lo > target:
+            # short-history fallback (window -> full history) can move the start back
+            cur_lo -= 1
+            insort(window, v[cur_lo])
+        p[i] = bisect_right(window, x) / len(window)
+    return (p - 0.5) * 4.0
+
+def indicator_score_path(series: pd.Series, direction: int, scoring_mode: str = "z5y",
+                         since=None) -> pd.Series:
+    """
+    As-of score at every observation of the series: value i equals
+    compute_indicator_score_asof(series, direction, scoring_mode, series.index[i]).
+    With since, observations no date >= since can see (all but the last one
+    before it) are left NaN instead of scored.
+
+    z5y windows come from extended-precision prefix sums and agree with the
+    per-window pandas mean / std to ~1e-12 score points (float64-only longdouble
+    included). The last observation is scored by compute_indicator_score itself,
+    so the newest history row always equals the live score.
+    """
+    if series is None or series.empty:
+        return pd.Series(dtype=float)
+    s = series.dropna()
+    out = np.full(len(s), np.nan)
+    if len(s) < 20:
+        return pd.Series(out, index=s.index)
+
+    idx = pd.DatetimeIndex(s.index)
+    vals = s.to_numpy(dtype=float)
+    p0 = 0
+    if since is not None:
+        p0 = max(int(idx.searchsorted(pd.Timestamp(since), side="right")) - 1, 0)
+    if scoring_mode == "pct20y":
+        sig = _pct20y_signal_path(idx, vals, p0)
+    else:
+        sig = _z5y_signal_path(idx, vals, p0)
+
+    raw = np.clip(float(direction) * sig, -2.0, 2.0)
+    out[19:] = ((raw + 2.0) / 4.0 * 100.0)[19:]
+    out[-1] = compute_indicator_score(s, direction, scoring_mode)[0]
+    return pd.Series(out, index=idx)
+
+def _asof_values(path: pd.Series, grid: pd.DatetimeIndex) -> np.ndarray:
+    """As-of (backward) join of a per-observation path onto the grid."""
+    out = np.full(len(grid), np.nan)
+    if path is None or path.empty:
+        return out
+    pos = path.index.searchsorted(grid, side="right") - 1
+    ok = pos >= 0
+    out[ok] = path.to_numpy()[pos[ok]]
+    return out
+
+def regime_history_frame(indicators: dict, grid: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Block + GLOBAL scores on the grid (no row filtering). Builds a
+    (dates x indicators) score matrix, then reduces it per block and
+    weights blocks into GLOBAL, with the same NaN rules as the live scores.
+    """
+    keys = list(INDICATOR_META.keys())
+    col = {k: j for j, k in enumerate(keys)}
+    S = np.empty((len(grid), len(keys)))
+    for j, k in enumerate(keys):
+        meta = INDICATOR_META[k]
+        path = indicator_score_path(indicators.get(k, None), meta["direction"],
+                                    meta.get("scoring_mode", "z5y"), since=grid[0] if len(grid) else None)
+        S[:, j] = _asof_values(path, grid)
+
+    block_keys = list(BLOCKS.keys())
+    B = np.full((len(grid), len(block_keys)), np.nan)
+    for b, bkey in enumerate(block_keys):
+        cols = [col[k] for k in BLOCKS[bkey]["indicators"] if k in col]
+        if not cols:
+            continue
+        sub = S[:, cols]
+        valid = ~np.isnan(sub)
+        cnt = valid.sum(axis=1)
+        tot = np.where(valid, sub, 0.0).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            B[:, b] = np.where(cnt > 0, tot / cnt, np.nan)
+
+    wpos = [b for b, bkey in enumerate(block_keys) if float(BLOCKS[bkey].get("weight", 0.0)) > 0]
+    w = np.array([float(BLOCKS[block_keys[b]]["weight"]) for b in wpos])
+    Bw = B[:, wpos]
+    bvalid = ~np.isnan(Bw)
+    gs = np.where(bvalid, Bw * w, 0.0).sum(axis=1)
+    w_used = np.where(bvalid, w, 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        glob = np.where(w_used > 0, gs / w_used, np.nan)
+
+    out = pd.DataFrame(B, index=grid, columns=block_keys)
+    out["GLOBAL"] = glob
+    return out
+
+def build_regime_history(indicators: dict, start_date: str, freq: str = "W-FRI") -> pd.DataFrame:
+    """
+    Builds a historical time series of block scores + global score by re-applying
+    the SAME scoring logic at each date t using only observations available up to t.
+
+    - freq defaults to weekly ("W-FRI") for speed + stability.
+    - returns DataFrame indexed by date with columns: GLOBAL + block keys.
+    """
+    # Determine common date range (use data availability, then trim to start_date)
+    dates = []
+    for k in INDICATOR_META.keys():
+        s = indicators.get(k, None)
+        if s is None or s.empty:
+            continue
+        ss = s.dropna()
+        if ss.empty:
+            continue
+        dates.append(ss.index.min())
+        dates.append(ss.index.max())
+    if not dates:
+        return pd.DataFrame()
+
+    start = max(pd.to_datetime(start_date), min(dates))
+    end = max(dates)
+    if pd.isna(start) or pd.isna(end) or start >= end:
+        return pd.DataFrame()
+
+    grid = pd.date_range(start=start, end=end, freq=freq)
+    if len(grid) < 8:
+        # fallback to business days if window is too short
+        grid = pd.date_range(start=start, end=end, freq="B")
+    if len(grid) < 8:
+        return pd.DataFrame()
+
+    # One vectorized pass per indicator (see regime_history_frame), instead of
+    # re-scoring every indicator at every grid date.
+    out = regime_history_frame(indicators, grid)
+
+    # Light cleanup: drop leading NaN runs
+    out = out.sort_index()
+    # keep rows where at least GLOBAL exists
+    out = out[~out["GLOBAL"].isna()]
+    return out
+
+def compute_regime_history(indicators: dict, start_date: str, freq: str = "W-FRI") -> pd.DataFrame:
+    """The app's name for build_regime_history."""
+    return build_regime_history(indicators, start_date, freq)
+
+def regime_delta(ts: pd.Series, periods: int) -> float:
+    if ts is None or ts.dropna().shape[0] < (periods + 2):
+        return np.nan
+    s = ts.dropna()
+    if len(s) <= periods:
+        return np.nan
+    return float(s.iloc[-1] - s.iloc[-1 - periods])
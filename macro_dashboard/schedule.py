@@ -0,0 +1,90 @@
+"""
+Refresh schedule for stored series: when a series can next have new data, from
+its observed frequency (infer_frequency_days) and the publication lag of its
+last observation, so a load only requests the series that are due.
+
+The store sidecar (SeriesStore) records for each series the last observation
+date, when that observation was published (estimated as the last poll that did
+not have it yet, so a late detection does not inflate the lag) and when the
+series was last polled; a series without those is always due.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import BDay
+
+from .scoring import infer_frequency_days
+
+# ============================================================
+# REFRESH SCHEDULE
+# ============================================================
+
+REFRESH_MIN_S = 15 * 60          # never poll a series more often than this
+REFRESH_MAX_S = 7 * 86400        # ...nor less often (each poll re-reads the revision window, see fetch)
+OVERDUE_MAX_S = 86400            # re-poll interval once a release is late, at most daily
+
+def _utc(ts) -> pd.Timestamp:
+    t = pd.Timestamp(ts)
+    return t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+
+def next_refresh(meta: dict, freq_days: float):
+    """
+    When to poll a stored series next (UTC Timestamp), None when unknown (due now).
+
+    The next observation is expected one period after the last one and
+    published with the same lag; for daily series both are counted in business
+    days, so a Friday observation published on Monday does not put the next
+    release on a weekend. Until then the series is not polled; past it, it is
+    re-polled every 1/30 period (15 min .. 1 day) until the release lands. A
+    daily series whose last bar is less than a day old (a market close still
+    forming) is polled every REFRESH_MIN_S. The result is kept within
+    REFRESH_MIN_S .. REFRESH_MAX_S of the last poll.
+    """
+    try:
+        checked = _utc(meta["checked_at"])
+        last_obs = _utc(meta["last_obs"])
+        published = _utc(meta["last_obs_published_at"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    lo = checked + pd.Timedelta(seconds=REFRESH_MIN_S)
+    hi = checked + pd.Timedelta(seconds=REFRESH_MAX_S)
+    period = pd.Timedelta(days=max(float(freq_days), 1.0))
+    if freq_days <= 1 and checked - last_obs < pd.Timedelta(days=1):
+        return lo
+
+    if freq_days <= 3:
+        lag_days = max(int(np.busday_count(last_obs.date(), published.date())), 0)
+        expected = last_obs + BDay(1) + BDay(lag_days) + (published - published.normalize())
+    else:
+        expected = last_obs + period + max(published - last_obs, pd.Timedelta(0))
+    if expected <= checked:
+        expected = checked + min(max(period / 30, pd.Timedelta(seconds=REFRESH_MIN_S)),
+                                 pd.Timedelta(seconds=OVERDUE_MAX_S))
+    return min(max(expected, lo), hi)
+
+def refresh_due(meta: dict, stored: pd.Series, now=None) -> bool:
+    """Whether a stored series should be polled now."""
+    at = next_refresh(meta, infer_frequency_days(stored))
+    now = datetime.now(timezone.utc) if now is None else now
+    return at is None or _utc(now) >= at
+
+def refresh_schedule(store, keys, now=None) -> pd.DataFrame:
+    """Schedule of stored series (store keys such as "fred/CPIAUCSL"), one row per key."""
+    now = _utc(datetime.now(timezone.utc) if now is None else now)
+    rows = []
+    for key in keys:
+        stored, meta = store.load(key)
+        freq = infer_frequency_days(stored)
+        at = None if stored is None else next_refresh(meta, freq)
+        rows.append({
+            "key": key,
+            "freq_days": freq,
+            "last_obs": meta.get("last_obs"),
+            "lag_days": (round((_utc(meta["last_obs_published_at"]) - _utc(meta["last_obs"])) / pd.Timedelta(days=1), 1)
+                         if meta.get("last_obs_published_at") and meta.get("last_obs") else None),
+            "checked_at": meta.get("checked_at"),
+            "next_refresh": at,
+            "due": at is None or now >= at,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,254 @@
+"""
+Indicator scoring: latest / as-of scores, regime status and recent trends.
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import DateOffset
+
+# ============================================================
+# SCORING
+# ============================================================
+
+def rolling_percentile_last(hist: pd.Series, latest: float) -> float:
+    h = hist.dropna()
+    if len(h) < 10 or pd.isna(latest):
+        return np.nan
+    return float((h <= latest).mean())
+
+def compute_indicator_score(series: pd.Series, direction: int, scoring_mode: str = "z5y"):
+    if series is None or series.empty:
+        return np.nan, np.nan, np.nan
+    s = series.dropna()
+    if len(s) < 20:
+        return np.nan, np.nan, (np.nan if s.empty else float(s.iloc[-1]))
+
+    latest = float(s.iloc[-1])
+    end = s.index.max()
+
+    if scoring_mode == "pct20y":
+        start = end - DateOffset(years=20)
+        hist = s[s.index >= start]
+        if len(hist) < 20:
+            hist = s
+        p = rolling_percentile_last(hist, latest)
+        sig = (p - 0.5) * 4.0
+    else:
+        start = end - DateOffset(years=5)
+        hist = s[s.index >= start]
+        if len(hist) < 10:
+            hist = s
+        mean = float(hist.mean())
+        std = float(hist.std())
+        sig = 0.0 if (std == 0 or np.isnan(std)) else (latest - mean) / std
+
+    raw = float(direction) * float(sig)
+    raw = float(np.clip(raw, -2.0, 2.0))
+    score = (raw + 2.0) / 4.0 * 100.0
+    return score, sig, latest
+
+def compute_indicator_score_asof(series: pd.Series, direction: int, scoring_mode: str, asof_ts: pd.Timestamp):
+    """
+    Same scoring philosophy, but computed at time t using only data available up to t.
+    We use the last observation <= t as the 'latest' value, and measure vs window ending at t.
+    """
+    if series is None or series.empty:
+        return np.nan
+    s = series.dropna()
+    if s.empty:
+        return np.nan
+
+    s = s[s.index <= asof_ts]
+    if s.empty or len(s) < 20:
+        return np.nan
+
+    latest = float(s.iloc[-1])
+    end = s.index.max()
+
+    if scoring_mode == "pct20y":
+        start = end - DateOffset(years=20)
+        hist = s[s.index >= start]
+        if len(hist) < 20:
+            hist = s
+        p = rolling_percentile_last(hist, latest)
+        sig = (p - 0.5) * 4.0
+    else:
+        start = end - DateOffset(years=5)
+        hist = s[s.index >= start]
+        if len(hist) < 10:
+            hist = s
+        mean = float(hist.mean())
+        std = float(hist.std())
+        sig = 0.0 if (std == 0 or np.isnan(std)) else (latest - mean) / std
+
+    raw = float(direction) * float(sig)
+    raw = float(np.clip(raw, -2.0, 2.0))
+    score = (raw + 2.0) / 4.0 * 100.0
+    return float(score)
+
+def classify_status(score: float) -> str:
+    if np.isnan(score):
+        return "n/a"
+    if score > 60:
+        return "risk_on"
+    if score < 40:
+        return "risk_off"
+    return "neutral"
+
+def status_label(status: str) -> str:
+    return {"risk_on":"Risk-on","risk_off":"Risk-off","neutral":"Neutral"}.get(status,"n/a")
+
+def infer_frequency_days(s: pd.Series) -> float:
+    if s is None or s.dropna().shape[0] < 10:
+        return 1.0
+    idx = pd.to_datetime(s.dropna().index)
+    diffs = np.diff(idx.values).astype("timedelta64[D]").astype(int)
+    if len(diffs) == 0:
+        return 1.0
+    return float(np.median(diffs))
+
+def pct_change_over_days(series: pd.Series, days: int) -> float:
+    if series is None or series.empty:
+        return np.nan
+    s = series.dropna()
+    if s.empty:
+        return np.nan
+    last_date = s.index.max()
+    target_date = last_date - timedelta(days=days)
+    past = s[s.index <= target_date]
+    if past.empty:
+        return np.nan
+    past_val = past.iloc[-1]
+    curr_val = s.iloc[-1]
+    if pd.isna(past_val) or pd.isna(curr_val) or past_val == 0:
+        return np.nan
+    return (curr_val / past_val - 1.0) * 100.0
+
+def recent_trend(series: pd.Series) -> dict:
+    if series is None or series.dropna().shape[0] < 10:
+        return {"window_label": "n/a", "delta_pct": np.nan, "arrow": "→", "days": None}
+    freq = infer_frequency_days(series)
+    if freq >= 20:
+        days = 90
+        label = "1Q"
+    else:
+        days = 30
+        label = "30d"
+    d = pct_change_over_days(series, days)
+    if np.isnan(d):
+        return {"window_label": label, "delta_pct": np.nan, "arrow": "→", "days": days}
+    arrow = "↑" if d > 0.25 else ("↓" if d < -0.25 else "→")
+    return {"window_label": label, "delta_pct": d, "arrow": arrow, "days": days}
+
+# ============================================================
+# PANEL COLUMNS (see panel.Panel)
+# Same results as the Series functions above, read from (dates int64 ns, values)
+# views with NaN where there is no observation: no dropna() copies.
+# ============================================================
+
+def _last_valid(values: np.ndarray, stop: int) -> int:
+    """Position of the last non-NaN value before stop, -1 if none (scans back in small blocks)."""
+    i = stop - 1
+    while i >= 0:
+        lo = max(i - 63, 0)
+        ok = np.flatnonzero(~np.isnan(values[lo:i + 1]))
+        if len(ok):
+            return lo + int(ok[-1])
+        i = lo - 1
+    return -1
+
+def _years_before_ns(ts_ns: int, years: int) -> int:
+    return (pd.Timestamp(int(ts_ns)) - DateOffset(years=years)).value
+
+def score_column(dates: np.ndarray, values: np.ndarray, direction: int, scoring_mode: str = "z5y"):
+    """compute_indicator_score over a panel column."""
+    ok = ~np.isnan(values)
+    n = int(np.count_nonzero(ok))
+    if n == 0:
+        return np.nan, np.nan, np.nan
+    last = _last_valid(values, len(values))
+    latest = float(values[last])
+    if n < 20:
+        return np.nan, np.nan, latest
+
+    if scoring_mode == "pct20y":
+        lo = int(np.searchsorted(dates, _years_before_ns(dates[last], 20), side="left"))
+        cnt = int(np.count_nonzero(ok[lo:last + 1]))
+        if cnt < 20:
+            lo, cnt = 0, n
+        # rolling_percentile_last (hist has >= 20 points here)
+        p = float(np.count_nonzero(values[lo:last + 1] <= latest) / cnt)
+        sig = (p - 0.5) * 4.0
+    else:
+        lo = int(np.searchsorted(dates, _years_before_ns(dates[last], 5), side="left"))
+        if np.count_nonzero(ok[lo:last + 1]) < 10:
+            lo = 0
+        # the window's observations, reduced exactly as Series.mean() / Series.std()
+        hist = np.asarray(values[lo:last + 1][ok[lo:last + 1]], dtype=np.float64)
+        mean = float(hist.sum() / len(hist))
+        std = float(np.sqrt(((mean - hist) ** 2).sum() / (len(hist) - 1))) if len(hist) > 1 else np.nan
+        sig = 0.0 if (std == 0 or np.isnan(std)) else (latest - mean) / std
+
+    raw = float(direction) * float(sig)
+    raw = float(np.clip(raw, -2.0, 2.0))
+    score = (raw + 2.0) / 4.0 * 100.0
+    return score, sig, latest
+
+LOOKBACK_DAYS = (7, 30, 90, 365)  # % changes kept in the lookback index (trend windows + What changed)
+_DAY_NS = 86_400_000_000_000
+
+def pct_change_column(dates: np.ndarray, values: np.ndarray, days: int, last: int = None) -> float:
+    """pct_change_over_days over a panel column (last: position of the last observation, if known)."""
+    last = _last_valid(values, len(values)) if last is None else last
+    if last < 0:
+        return np.nan
+    target = dates[last] - np.int64(days * _DAY_NS)
+    past = _last_valid(values, int(np.searchsorted(dates, target, side="right")))
+    if past < 0:
+        return np.nan
+    past_val, curr_val = float(values[past]), float(values[last])
+    if past_val == 0:
+        return np.nan
+    return (curr_val / past_val - 1.0) * 100.0
+
+def lookback_index(dates: np.ndarray, values: np.ndarray) -> dict:
+    """
+    Per-series metadata for O(1) trend lookups: observation count, inferred
+    frequency (infer_frequency_days), last observation date and value, and the
+    % change over each of LOOKBACK_DAYS (pct_change_over_days).
+    """
+    ok = ~np.isnan(values)
+    n = int(np.count_nonzero(ok))
+    last = _last_valid(values, len(values))
+    freq = 1.0
+    if n >= 10:
+        diffs = np.diff(dates[ok]).view("timedelta64[ns]").astype("timedelta64[D]").astype(int)
+        freq = float(np.median(diffs))
+    return {
+        "n_obs": n,
+        "freq_days": freq,
+        "last_date": None if last < 0 else pd.Timestamp(int(dates[last])),
+        "last_value": np.nan if last < 0 else float(values[last]),
+        "pct": {d: pct_change_column(dates, values, d, last) for d in LOOKBACK_DAYS},
+    }
+
+def trend_from_lookback(ix: dict) -> dict:
+    """recent_trend from a lookback_index entry."""
+    if ix["n_obs"] < 10:
+        return {"window_label": "n/a", "delta_pct": np.nan, "arrow": "→", "days": None}
+    if ix["freq_days"] >= 20:
+        days = 90
+        label = "1Q"
+    else:
+        days = 30
+        label = "30d"
+    d = ix["pct"][days]
+    if np.isnan(d):
+        return {"window_label": label, "delta_pct": np.nan, "arrow": "→", "days": days}
+    arrow = "↑" if d > 0.25 else ("↓" if d < -0.25 else "→")
+    return {"window_label": label, "delta_pct": d, "arrow": arrow, "days": days}
+
+def trend_column(dates: np.ndarray, values: np.ndarray) -> dict:
+    """recent_trend over a panel column."""
+    return trend_from_lookback(lookback_index(dates, values))
@@ -0,0 +1,244 @@
+"""
+Snapshot service: one immutable, read-only snapshot of the derived state per
+data version and settings, shared by every consumer in the process.
+"""
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import DateOffset
+
+from .panel import Panel
+from .pipeline import build_indicators, load_raw_data, score_blocks, score_indicators, window_raw_data
+from .regime import build_regime_history
+
+# ============================================================
+# SNAPSHOT SERVICE (shared across sessions)
+# One data version per refresh; per-settings snapshots derived from it once and
+# handed to every session as read-only views.
+# ============================================================
+
+SNAPSHOT_TTL = 3600  # seconds, same horizon as the fetch caches
+REFRESH_RETRY_S = 60  # after a failed background refresh, serve the stale version this long before retrying
+
+def _readonly_series(s: pd.Series) -> pd.Series:
+    # np.asarray(s.array) is the Series' own buffer: in-place writes now raise
+    if s is not None:
+        np.asarray(s.array).flags.writeable = False
+    return s
+
+def _readonly_frame(df: pd.DataFrame) -> pd.DataFrame:
+    arr = df.to_numpy(copy=True)
+    arr.flags.writeable = False
+    return pd.DataFrame(arr, index=df.index, columns=df.columns, copy=False)
+
+def _readonly_map(d: dict) -> MappingProxyType:
+    return MappingProxyType({k: (MappingProxyType(v) if isinstance(v, dict) else v) for k, v in d.items()})
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: str          # data refresh this snapshot was derived from
+    built_at: datetime
+    years_back: int
+    freq: str
+    start_date: str
+    raw: MappingProxyType  # FRED keys + tickers -> raw series (window views of the full histories)
+    indicators: Panel      # key -> indicator series, columnar (see panel.Panel)
+    indicator_scores: MappingProxyType
+    block_scores: MappingProxyType
+    regime_ts: pd.DataFrame
+
+def snapshot_start_date(version_at: datetime, years_back: int) -> str:
+    return (version_at.date() - DateOffset(years=years_back)).date().isoformat()
+
+def make_snapshot(version: str, built_at: datetime, years_back: int, freq: str, start_date: str,
+                  raw: dict, indicators: Panel, indicator_scores: dict, block_scores: dict,
+                  regime_ts: pd.DataFrame) -> Snapshot:
+    """Freeze derived state into a Snapshot (the panel is read-only already)."""
+    return Snapshot(
+        version=version,
+        built_at=built_at,
+        years_back=years_back,
+        freq=freq,
+        start_date=start_date,
+        raw=_readonly_map(raw),
+        indicators=indicators,
+        indicator_scores=_readonly_map(indicator_scores),
+        block_scores=_readonly_map(block_scores),
+        regime_ts=_readonly_frame(regime_ts),
+    )
+
+def build_snapshot(fred: dict, yf_map: dict, version: str, version_at: datetime, years_back: int,
+                   freq: str = "W-FRI") -> Snapshot:
+    """The dashboard pipeline for one setting, from full raw histories (see load_raw_data)."""
+    start_date = snapshot_start_date(version_at, years_back)
+    fred, yf_map = window_raw_data(fred, yf_map, start_date)
+    indicators = build_indicators(fred, yf_map)
+    panel = Panel.from_series(indicators)
+    indicator_scores = score_indicators(panel)
+    block_scores = score_blocks(indicator_scores)
+    regime_ts = build_regime_history(indicators, start_date=start_date, freq=freq)
+    return make_snapshot(version, datetime.now(timezone.utc), years_back, freq, start_date,
+                         {**fred, **yf_map}, panel, indicator_scores, block_scores, regime_ts)
+
+class SnapshotService:
+    """
+    Builds one immutable Snapshot per (data version, history years, regime frequency)
+    and hands the same object to every caller, so memory and CPU stay flat as the
+    number of sessions grows. The data version rolls over on invalidate() or after ttl.
+
+    Raw histories are loaded once per version; a different history window is a
+    zero-copy slice of them, so slider moves never touch the network.
+
+    With artifacts (an ArtifactStore), a current precomputed artifact is the data
+    version instead: its memory-mapped histories replace loader() and its stored
+    snapshots are served as they are. Without one, the loader path applies.
+
+    stale_while_revalidate=True: once the loader path has data, an expired version
+    keeps being served while a background thread loads the next one and rebuilds
+    the snapshots in use; the new version is swapped in at once when ready (or
+    dropped if invalidate() ran meanwhile). Only the first load blocks.
+    """
+
+    def __init__(self, loader=None, ttl: int = SNAPSHOT_TTL, artifacts=None, stale_while_revalidate: bool = False):
+        # loader() -> (fred, yf_map) full histories; defaults to pipeline.load_raw_data
+        self.loader = load_raw_data if loader is None else loader
+        self.ttl = ttl
+        self.artifacts = artifacts
+        self.stale_while_revalidate = stale_while_revalidate
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_at = None
+        self._raw = None
+        self._artifact = None
+        self._snapshots = {}
+        self._generation = 0  # bumped by invalidate(): refreshes started before it are dropped
+        self._refresh_thread = None
+        self._refresh_error = None
+        self._refresh_failed_at = None
+
+    @property
+    def artifact(self):
+        """Artifact the current version comes from (None on the live loader path)."""
+        return self._artifact
+
+    @property
+    def version(self):
+        """Data version currently served (None before the first load)."""
+        return self._version
+
+    @property
+    def data_at(self):
+        """When the served data was loaded (or its artifact built); None before the first load."""
+        return self._version_at
+
+    @property
+    def refreshing(self) -> bool:
+        t = self._refresh_thread
+        return t is not None and t.is_alive()
+
+    @property
+    def refresh_error(self):
+        """Message of the last failed background refresh (None once one succeeds)."""
+        return self._refresh_error
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+            self._raw = None
+            self._artifact = None
+            self._snapshots = {}
+            self._generation += 1
+            self._refresh_error = None
+            self._refresh_failed_at = None
+
+    def refresh(self):
+        """Load a new version: in the background if stale_while_revalidate has one to serve meanwhile."""
+        with self._lock:
+            if self.stale_while_revalidate and self._artifact is None and self._raw is not None:
+                self._refresh_failed_at = None
+                self._start_refresh()
+                return
+        self.invalidate()
+
+    def _start_refresh(self):
+        # lock held
+        if self.refreshing:
+            return
+        if self._refresh_failed_at is not None \
+                and (datetime.now(timezone.utc) - self._refresh_failed_at).total_seconds() < REFRESH_RETRY_S:
+            return
+        self._refresh_thread = threading.Thread(target=self._refresh, args=(self._generation, list(self._snapshots)),
+                                                name="snapshot-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def _refresh(self, generation: int, keys: list):
+        # background thread: network + builds outside the lock, then one swap under it
+        try:
+            now = datetime.now(timezone.utc)
+            version = now.strftime("%Y%m%dT%H%M%S.%fZ")
+            fred, yf_map = self.loader()
+            for s in list(fred.values()) + list(yf_map.values()):
+                _readonly_series(s)
+            snapshots = {(years, freq): build_snapshot(fred, yf_map, version, now, years, freq)
+                         for years, freq in keys}
+        except Exception as e:
+            with self._lock:
+                self._refresh_error = f"{type(e).__name__}: {e}"
+                self._refresh_failed_at = datetime.now(timezone.utc)
+            return
+        with self._lock:
+            if generation != self._generation or self._artifact is not None:
+                return
+            self._version, self._version_at, self._raw, self._snapshots = version, now, (fred, yf_map), snapshots
+            self._refresh_error = None
+            self._refresh_failed_at = None
+
+    def _current_version(self, now: datetime) -> str:
+        art = self.artifacts.current() if self.artifacts is not None else None
+        if art is not None:
+            if art.version != self._version:
+                self._version = art.version
+                self._version_at = art.built_at
+                self._raw = art.raw()
+                self._artifact = art
+                self._snapshots = {}
+            return self._version
+        if self._artifact is not None or self._version is None \
+                or (now - self._version_at).total_seconds() >= self.ttl:
+            if self.stale_while_revalidate and self._artifact is None and self._raw is not None:
+                self._start_refresh()  # keep serving the expired version meanwhile
+                return self._version
+            self._version = now.strftime("%Y%m%dT%H%M%S.%fZ")
+            self._version_at = now
+            # sessions still holding old snapshots keep them alive
+            self._raw = None
+            self._artifact = None
+            self._snapshots = {}
+        return self._version
+
+    def _raw_data(self):
+        if self._raw is None:
+            fred, yf_map = self.loader()
+            for s in list(fred.values()) + list(yf_map.values()):
+                _readonly_series(s)
+            self._raw = (fred, yf_map)
+        return self._raw
+
+    def get(self, years_back: int, freq: str = "W-FRI") -> Snapshot:
+        # Builds run under the lock: concurrent sessions wait for the one build
+        # (a background refresh builds outside it, see stale_while_revalidate).
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            version = self._current_version(now)
+            key = (int(years_back), freq)
+            snap = self._snapshots.get(key)
+            if snap is None and self._artifact is not None:
+                snap = self._artifact.snapshot(int(years_back), freq)
+            if snap is None:
+                snap = build_snapshot(*self._raw_data(), version, self._version_at, int(years_back), freq)
+            self._snapshots[key] = snap
+            return snap
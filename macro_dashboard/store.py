@@ -0,0 +1,177 @@
+"""
+Local series store: fetched histories persisted on disk.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+# ============================================================
+# LOCAL SERIES STORE (persistent history + delta sync)
+# One parquet file per series + a small JSON sidecar. A cache expiry (or the
+# Refresh button) then only downloads the recent end of a series: observations
+# after the last stored date plus a revision lookback (see plan()).
+# ============================================================
+
+STORE_DIR = os.environ.get(
+    "MACRO_DASHBOARD_STORE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".series_store"),
+)
+
+class SeriesStore:
+    """
+    History per series under root: <key>.parquet (date index, 'value' column) and
+    <key>.json ({"coverage_start": first requested date, "synced_at": UTC timestamp,
+    "full_synced_at": last full download}, plus the refresh schedule state: "checked_at" (last poll), "last_obs" and
+    "last_obs_published_at", see schedule.next_refresh).
+    Writes go through a temp file + os.replace, so readers never see partial files.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.root, quote(key, safe="") + ext)
+
+    def _replace(self, path: str, write):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(tmp)
+        os.replace(tmp, path)
+
+    def _write_meta(self, key: str, meta: dict):
+        def _write(p):
+            with open(p, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        self._replace(self._path(key, ".json"), _write)
+
+    def meta(self, key: str) -> dict:
+        try:
+            with open(self._path(key, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def load(self, key: str):
+        """(series or None, meta dict)."""
+        meta = self.meta(key)
+        if not meta:
+            return None, {}
+        try:
+            s = pd.read_parquet(self._path(key, ".parquet"))["value"]
+        except Exception:
+            return None, {}
+        s.index.name = None
+        return s.rename(None), meta
+
+    def save(self, key: str, s: pd.Series, coverage_start: str, full: bool = False):
+        # data first, sidecar last: a sidecar always describes a complete file
+        self._replace(self._path(key, ".parquet"), lambda p: s.rename("value").rename_axis("date").to_frame().to_parquet(p))
+        now = datetime.now(timezone.utc).isoformat()
+        prev = self.meta(key)
+        last_obs = s.index.max().date().isoformat()
+        if prev.get("last_obs") == last_obs:
+            published = prev.get("last_obs_published_at")
+        else:
+            # new observation: published after the previous poll, which did not have it
+            # yet, and not before its own date
+            published = prev.get("checked_at")
+            if published is not None and published[:10] < last_obs:
+                published = last_obs
+        meta = dict(prev, coverage_start=coverage_start, synced_at=now, checked_at=now,
+                    last_obs=last_obs, last_obs_published_at=published or now)
+        if full:
+            meta["full_synced_at"] = now
+        self._write_meta(key, meta)
+
+    def mark_checked(self, key: str, s: pd.Series):
+        """Record a poll that brought nothing new (s: the stored history)."""
+        meta = self.meta(key)
+        if not meta:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        meta["checked_at"] = now
+        if s is not None and not s.empty and "last_obs" not in meta:
+            meta["last_obs"] = s.index.max().date().isoformat()
+            meta["last_obs_published_at"] = now
+        self._write_meta(key, meta)
+
+    def update_meta(self, key: str, **fields):
+        """Add fields to an existing sidecar (e.g. the FRED last_updated stamp of the stored copy)."""
+        meta = self.meta(key)
+        if meta:
+            meta.update(fields)
+            self._write_meta(key, meta)
+
+    def expire_checks(self):
+        """Make every series due for its next poll (Refresh button, --all-series)."""
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            key = unquote(name[:-len(".json")])
+            meta = self.meta(key)
+            if meta.pop("checked_at", None) is not None:
+                self._write_meta(key, meta)
+
+    def plan(self, key: str, start_date: str, lookback=None, resync_days: float = None):
+        """
+        (stored, since): since is the date to request from. For a stored history
+        covering start_date it is the last stored date, moved back by lookback (a
+        DateOffset) so revised recent values are re-fetched and replace the stored
+        ones. since is start_date (full download) when nothing usable is stored
+        (stored None), or when the last full download is older than resync_days;
+        stored is then still returned, to be served if the download fails.
+        """
+        stored, meta = self.load(key)
+        if stored is None or stored.empty or meta.get("coverage_start", "9999") > start_date:
+            return None, start_date
+        if resync_days is not None and _age_days(meta.get("full_synced_at")) >= resync_days:
+            return stored, start_date
+        since = stored.index.max()
+        if lookback is not None:
+            since = max(since - lookback, stored.index.min())
+        return stored, since.date().isoformat()
+
+    def merge(self, key: str, start_date: str, stored, since: str, fetched) -> pd.Series:
+        """
+        Merge a fetch planned by plan(), persist it, return the history from start_date on.
+        Fetched observations replace everything stored from since on (revisions included).
+        """
+        if stored is None:
+            merged = pd.Series(dtype=float) if fetched is None else fetched
+            if not merged.empty:
+                self.save(key, merged, start_date, full=True)
+        elif fetched is None or fetched.empty:
+            merged = stored  # nothing new (or delta failed): serve the stored copy
+            if fetched is not None:
+                self.mark_checked(key, stored)
+        else:
+            merged = pd.concat([stored[stored.index < pd.to_datetime(since)], fetched]).sort_index()
+            merged = merged[~merged.index.duplicated(keep="last")]
+            full = since <= start_date
+            if full or not merged.equals(stored):
+                self.save(key, merged, self.meta(key).get("coverage_start", start_date), full=full)
+            else:
+                self.mark_checked(key, stored)
+        if merged.empty:
+            return merged
+        return merged[merged.index >= pd.to_datetime(start_date)]
+
+def _age_days(stamp) -> float:
+    """Days since an ISO UTC timestamp (inf when missing or unreadable)."""
+    try:
+        return (datetime.now(timezone.utc) - datetime.fromisoformat(stamp)).total_seconds() / 86400
+    except (TypeError, ValueError):
+        return float("inf")
+
+def get_series_store():
+    """Store at STORE_DIR; None when disabled (MACRO_DASHBOARD_STORE="") or not writable."""
+    if not STORE_DIR:
+        return None
+    try:
+        return SeriesStore(STORE_DIR)
+    except OSError:
+        return None
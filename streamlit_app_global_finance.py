@@ -3,33 +3,24 @@ import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
 import textwrap
-import yfinance as yf
-import requests
 import plotly.graph_objects as go
 import html as _html
-from datetime import datetime, timedelta, timezone
-from pandas.tseries.offsets import DateOffset
-
-# ============================================================
-# ALERT RULES (thresholds for What Changed / Watchlist panel)
-# These are intentionally simple and stable; tune if needed.
-# ============================================================
-ALERT_RULES = {
-    # "near boundary" means the indicator score is close to 40/60 cutoffs
-    "score_near_boundary": {"dist": 5},
-
-    # "extreme" readings for attention (not a forecast)
-    "score_extreme": {"low": 20, "high": 80},
-
-    # Trend thresholds for daily-like series (30d window, % move)
-    "trend_daily_pct": {"warn": 2.0, "crit": 5.0},
-
-    # Trend thresholds for slow series (quarter-ish window, % move)
-    "trend_slow_pct": {"warn": 1.0, "crit": 2.5},
-
-    # Regime score trend thresholds (score points)
-    "regime_trend_points": {"flat": 1.5, "notable": 4.0},
-}
+from datetime import datetime, timezone
+
+import macro_dashboard as md
+from macro_dashboard.config import ALERT_RULES, BLOCKS, INDICATOR_META
+from macro_dashboard.store import get_series_store
+from macro_dashboard.fetch import FRED_FETCH_ERRORS, MAX_HISTORY_YEARS
+from macro_dashboard.fetch import get_fred_api_key as env_fred_api_key
+from macro_dashboard.scoring import status_label
+from macro_dashboard.regime import regime_delta
+from macro_dashboard.downsampling import downsample, point_budget
+from macro_dashboard.charts import indicator_figure_spec, regime_figure_spec
+from macro_dashboard.alerts import build_alerts
+from macro_dashboard.events import get_alert_log, sync_alert_log
+from macro_dashboard.lines import operating_lines
+from macro_dashboard.snapshot import SnapshotService
+from macro_dashboard.artifact import get_artifact_store
 
 # ============================================================
 # PAGE CONFIG
@@ -244,524 +235,82 @@ st.markdown(
 )
 
 # ============================================================
-# INDICATORS & BLOCKS (same as your current set)
-# ============================================================
-
-INDICATOR_META = {
-    "real_10y": {
-        "label": "US 10Y TIPS Real Yield",
-        "unit": "%",
-        "direction": -1,
-        "source": "FRED DFII10",
-        "scale": 1.0,
-        "ref_line": 0.0,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Real yield (10Y TIPS): the real price of money/time.",
-            "reference": "<0% very easy; 0–2% neutral; >2% restrictive (heuristics).",
-            "interpretation": "- Higher real yields tighten financial conditions; pressure long-duration assets.\n- Lower real yields typically support risk assets and duration.",
-            "bridge": "Higher real yields raise real funding constraints across the system.",
-        },
-    },
-    "nominal_10y": {
-        "label": "US 10Y Nominal Yield",
-        "unit": "%",
-        "direction": -1,
-        "source": "FRED DGS10",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Nominal 10Y Treasury yield: benchmark discount rate and broad tightening proxy.",
-            "reference": "Fast upside moves often behave like tightening (heuristics).",
-            "interpretation": "- Yield up fast = pressure on equities and existing bonds.\n- Yield down can support duration and (sometimes) equities depending on growth/inflation mix.",
-            "bridge": "Higher yields mean the market demands more compensation (inflation and/or term premium).",
-        },
-    },
-    "yield_curve_10_2": {
-        "label": "US Yield Curve (10Y–2Y)",
-        "unit": "pp",
-        "direction": +1,
-        "source": "FRED DGS10 - DGS2",
-        "scale": 1.0,
-        "ref_line": 0.0,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "10Y–2Y slope: cycle / recession-probability proxy.",
-            "reference": "<0 inverted (late-cycle); >0 normal (heuristics).",
-            "interpretation": "- Deep/persistent inversion = late-cycle risk.\n- Steepening back above 0 = normalization (often after easing).",
-            "bridge": "Inversion = policy tight vs cycle, raising deleveraging risk.",
-        },
-    },
-
-    "breakeven_10y": {
-        "label": "10Y Breakeven Inflation",
-        "unit": "%",
-        "direction": -1,
-        "source": "FRED T10YIE",
-        "scale": 1.0,
-        "ref_line": 2.5,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Market-implied inflation expectations (10Y).",
-            "reference": "~2–3% anchored; materially >3% = sticky risk (heuristics).",
-            "interpretation": "- Higher breakevens reduce easing room.\n- Lower/anchoring supports duration and risk budgeting.",
-            "bridge": "Higher expected inflation raises the odds of inflation-tolerant policy in stress.",
-        },
-    },
-    "cpi_yoy": {
-        "label": "US CPI YoY",
-        "unit": "%",
-        "direction": -1,
-        "source": "FRED CPIAUCSL (computed YoY)",
-        "scale": 1.0,
-        "ref_line": 3.0,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Headline inflation YoY (proxy).",
-            "reference": "2% is target; >3–4% persistent = sticky risk (heuristics).",
-            "interpretation": "- Disinflation supports duration and often equities.\n- Re-acceleration pushes 'higher-for-longer' risks.",
-            "bridge": "Persistent inflation becomes the binding policy constraint.",
-        },
-    },
-    "unemployment_rate": {
-        "label": "US Unemployment Rate",
-        "unit": "%",
-        "direction": -1,
-        "source": "FRED UNRATE",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Labor slack proxy.",
-            "reference": "Rapid rises often coincide with growth downshift (heuristics).",
-            "interpretation": "- Unemployment rising quickly tends to be risk-off.\n- Stable unemployment is typically benign.",
-            "bridge": "Slack + high debt raises pressure for policy support (fiscal/monetary).",
-        },
-    },
-
-    "usd_index": {
-        "label": "USD Index (DXY / Broad Proxy)",
-        "unit": "",
-        "direction": -1,
-        "source": "yfinance DX-Y.NYB (fallback FRED DTWEXBGS)",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "USD strength proxy. If DXY is unavailable, uses broad trade-weighted USD index.",
-            "reference": "USD up = tighter global conditions (heuristics).",
-            "interpretation": "- USD stronger tightens global funding.\n- USD weaker loosens conditions.",
-            "bridge": "Stronger USD increases global funding stress where liabilities are USD-linked.",
-        },
-    },
-    "hy_oas": {
-        "label": "US High Yield OAS",
-        "unit": "pp",
-        "direction": -1,
-        "source": "FRED BAMLH0A0HYM2",
-        "scale": 1.0,
-        "ref_line": 4.5,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "High-yield credit spread: credit stress / default premium proxy.",
-            "reference": "<4% often benign; >6–7% stress (heuristics).",
-            "interpretation": "- Spreads widening = risk-off.\n- Tight spreads = risk appetite.",
-            "bridge": "Credit stress can accelerate non-linear deleveraging dynamics.",
-        },
-    },
-    "vix": {
-        "label": "VIX",
-        "unit": "",
-        "direction": -1,
-        "source": "yfinance ^VIX",
-        "scale": 1.0,
-        "ref_line": 20.0,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Equity implied volatility (S&P 500).",
-            "reference": "<15 low; 15–25 normal; >25 stress (heuristics).",
-            "interpretation": "- Higher vol tightens conditions through risk premia.\n- Lower vol often supports risk-taking.",
-            "bridge": "Vol spikes tighten conditions even without rate hikes.",
-        },
-    },
-    "spy_trend": {
-        "label": "SPY Trend (SPY / 200D MA)",
-        "unit": "ratio",
-        "direction": +1,
-        "source": "yfinance SPY",
-        "scale": 1.0,
-        "ref_line": 1.0,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Simple trend proxy: SPY vs 200-day moving average.",
-            "reference": ">1 = uptrend; <1 = downtrend (heuristics).",
-            "interpretation": "- Above 1 supports risk-on behavior.\n- Below 1 signals risk-off trend regime.",
-            "bridge": "Trend down + credit stress up is a common deleveraging signature.",
-        },
-    },
-    "hyg_lqd_ratio": {
-        "label": "Credit Risk Appetite (HYG / LQD)",
-        "unit": "ratio",
-        "direction": +1,
-        "source": "yfinance HYG, LQD",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "High yield vs investment grade ratio: credit risk appetite proxy.",
-            "reference": "Ratio up = more HY appetite; down = flight to quality.",
-            "interpretation": "- Rising ratio is typically risk-on.\n- Falling ratio indicates quality bid / caution.",
-            "bridge": "Flight-to-quality signals tightening funding constraints.",
-        },
-    },
-
-    "fed_balance_sheet": {
-        "label": "Fed Balance Sheet (WALCL)",
-        "unit": "bn USD",
-        "direction": +1,
-        "source": "FRED WALCL (millions -> bn)",
-        "scale": 1.0 / 1000.0,
-        "ref_line": None,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Total Fed assets: system liquidity proxy.",
-            "reference": "Expansion (QE) often supports risk assets; contraction (QT) drains (heuristics).",
-            "interpretation": "- Balance sheet up = tailwind.\n- Balance sheet down = headwind.",
-            "bridge": "Liquidity plumbing determines whether flows support or drain risk assets.",
-        },
-    },
-    "rrp": {
-        "label": "Fed Overnight RRP",
-        "unit": "bn USD",
-        "direction": -1,
-        "source": "FRED RRPONTSYD",
-        "scale": 1.0,
-        "ref_line": 0.0,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Overnight reverse repo usage: cash parked in risk-free facility.",
-            "reference": "High RRP = liquidity 'stuck'; falling RRP can release marginal liquidity (heuristics).",
-            "interpretation": "- RRP up = less marginal liquidity for risk.\n- RRP down = potential tailwind.",
-            "bridge": "RRP declines can act as a tactical liquidity release valve.",
-        },
-    },
-
-    "interest_payments": {
-        "label": "US Federal Interest Payments (Quarterly)",
-        "unit": "bn USD",
-        "direction": -1,
-        "source": "FRED A091RC1Q027SBEA",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "pct20y",
-        "expander": {
-            "what": "Government interest expense: debt-service pressure proxy.",
-            "reference": "Rising/accelerating debt service reduces policy flexibility (heuristics).",
-            "interpretation": "- Persistent rise increases policy constraint.\n- Stabilization reduces constraint.",
-            "bridge": "Debt service pressure increases incentives for funding-friendly policy outcomes.",
-        },
-    },
-    "federal_receipts": {
-        "label": "US Federal Current Receipts (Quarterly)",
-        "unit": "bn USD",
-        "direction": +1,
-        "source": "FRED FGRECPT",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "pct20y",
-        "expander": {
-            "what": "Government receipts: supports debt-service capacity.",
-            "reference": "Used to compute interest/receipts sustainability proxy.",
-            "interpretation": "- Receipts up improves capacity (all else equal).\n- Receipts down tightens constraint.",
-            "bridge": "Higher receipts reduce the binding nature of debt service.",
-        },
-    },
-    "interest_to_receipts": {
-        "label": "Debt Service Stress (Interest / Receipts)",
-        "unit": "ratio",
-        "direction": -1,
-        "source": "Derived",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "pct20y",
-        "expander": {
-            "what": "Sustainability proxy: share of receipts consumed by interest expense.",
-            "reference": "High and rising = constraint becomes political (heuristics).",
-            "interpretation": "- Higher ratio signals tighter fiscal policy constraint.\n- Lower ratio signals more room.",
-            "bridge": "Higher debt service increases incentives for inflation-tolerant or funding-friendly policy.",
-        },
-    },
-    "deficit_gdp": {
-        "label": "Federal Surplus/Deficit (% of GDP)",
-        "unit": "%",
-        "direction": -1,
-        "source": "FRED FYFSGDA188S",
-        "scale": 1.0,
-        "ref_line": -3.0,
-        "scoring_mode": "pct20y",
-        "expander": {
-            "what": "Fiscal balance (% of GDP). Negative = deficit.",
-            "reference": "Persistent large deficits increase Treasury supply pressure (heuristics).",
-            "interpretation": "- More negative implies more supply/funding pressure.\n- Improvement reduces pressure.",
-            "bridge": "Supply pressure can show up as higher term premium and weaker duration hedge behavior.",
-        },
-    },
-    "term_premium_10y": {
-        "label": "US 10Y Term Premium (ACM)",
-        "unit": "%",
-        "direction": -1,
-        "source": "FRED ACMTP10",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "pct20y",
-        "expander": {
-            "what": "Term premium: compensation required to hold nominal duration.",
-            "reference": "Rising term premium makes long nominal bonds less reliable as a hedge (heuristics).",
-            "interpretation": "- Term premium up increases duration risk.\n- Term premium down restores hedge quality.",
-            "bridge": "If term premium rises from supply/funding, duration may stop hedging equity drawdowns.",
-        },
-    },
-
-    "current_account_gdp": {
-        "label": "US Current Account Balance (% of GDP)",
-        "unit": "%",
-        "direction": +1,
-        "source": "FRED USAB6BLTT02STSAQ",
-        "scale": 1.0,
-        "ref_line": 0.0,
-        "scoring_mode": "pct20y",
-        "expander": {
-            "what": "External funding constraint proxy. Negative = reliance on foreign capital.",
-            "reference": "More negative implies higher vulnerability during USD tightening (heuristics).",
-            "interpretation": "- More negative increases dependence on external funding.\n- Moving toward 0 reduces constraint.",
-            "bridge": "External deficits increase vulnerability when global USD funding tightens.",
-        },
-    },
-
-    "gold": {
-        "label": "Gold (GLD)",
-        "unit": "",
-        "direction": -1,
-        "source": "yfinance GLD",
-        "scale": 1.0,
-        "ref_line": None,
-        "scoring_mode": "z5y",
-        "expander": {
-            "what": "Gold: hedge demand proxy (policy/inflation/tail risk).",
-            "reference": "Breakouts often reflect hedge demand rather than growth optimism (heuristics).",
-            "interpretation": "- Gold up can signal hedge demand.\n- Gold down in equity bull may reflect clean risk-on.",
-            "bridge": "Gold can hedge environments where real returns are compressed or policy turns funding-friendly.",
-        },
-    },
-}
-
-BLOCKS = {
-    "price_of_time": {
-        "name": "1) Price of Time",
-        "weight": 0.20,
-        "indicators": ["real_10y", "nominal_10y", "yield_curve_10_2"],
-        "desc": "Rates / curve: the price of time and late-cycle signal.",
-        "group": "Market Thermometers",
-    },
-    "macro": {
-        "name": "2) Macro Cycle",
-        "weight": 0.15,
-        "indicators": ["breakeven_10y", "cpi_yoy", "unemployment_rate"],
-        "desc": "Inflation and growth constraint on policy reaction.",
-        "group": "Market Thermometers",
-    },
-    "conditions": {
-        "name": "3) Conditions & Stress",
-        "weight": 0.20,
-        "indicators": ["usd_index", "hy_oas", "vix", "spy_trend", "hyg_lqd_ratio"],
-        "desc": "Fast regime: USD, credit stress, vol, trend, risk appetite.",
-        "group": "Market Thermometers",
-    },
-    "plumbing": {
-        "name": "4) Liquidity / Plumbing",
-        "weight": 0.15,
-        "indicators": ["fed_balance_sheet", "rrp"],
-        "desc": "System liquidity tailwind vs drain for risk assets.",
-        "group": "Market Thermometers",
-    },
-    "policy_link": {
-        "name": "5) Fiscal / Policy Constraint",
-        "weight": 0.20,
-        "indicators": ["interest_to_receipts", "deficit_gdp", "term_premium_10y", "interest_payments", "federal_receipts"],
-        "desc": "Debt service, deficit dynamics, and the funding constraint signal.",
-        "group": "Structural Constraints",
-    },
-    "external": {
-        "name": "6) External Balance",
-        "weight": 0.10,
-        "indicators": ["current_account_gdp"],
-        "desc": "External funding reliance and vulnerability in USD tightening.",
-        "group": "Structural Constraints",
-    },
-    "gold_block": {
-        "name": "7) Gold",
-        "weight": 0.00,
-        "indicators": ["gold"],
-        "desc": "Policy / tail-risk hedge demand confirmation.",
-        "group": "Structural Constraints",
-    },
-}
-
-# ============================================================
-# DATA FETCHERS
+# DATA (Streamlit caches over the headless macro_dashboard core)
 # ============================================================
 
 def get_fred_api_key():
+    """st.secrets first, then the FRED_API_KEY environment variable."""
     try:
         return st.secrets["FRED_API_KEY"]
     except Exception:
-        return None
-
-@st.cache_data(ttl=3600)
-def fetch_fred_series(series_id: str, start_date: str) -> pd.Series:
-    api_key = get_fred_api_key()
-    if api_key is None:
-        return pd.Series(dtype=float)
-
-    url = "https://api.stlouisfed.org/fred/series/observations"
-    params = {
-        "series_id": series_id,
-        "api_key": api_key,
-        "file_type": "json",
-        "observation_start": start_date,
-    }
-    try:
-        r = requests.get(url, params=params, timeout=12)
-        r.raise_for_status()
-        data = r.json().get("observations", [])
-        if not data:
-            return pd.Series(dtype=float)
-        idx = pd.to_datetime([o["date"] for o in data])
-        vals = []
-        for o in data:
-            try:
-                vals.append(float(o["value"]))
-            except Exception:
-                vals.append(np.nan)
-        s = pd.Series(vals, index=idx).replace({".": np.nan}).astype(float).sort_index()
-        return s
-    except Exception:
-        return pd.Series(dtype=float)
-
-@st.cache_data(ttl=3600)
-def fetch_yf_one(ticker: str, start_date: str) -> pd.Series:
-    try:
-        df = yf.Ticker(ticker).history(start=start_date, auto_adjust=True)
-        if df is None or df.empty:
-            return pd.Series(dtype=float)
-        col = "Close"
-        if "Adj Close" in df.columns:
-            col = "Adj Close"
-        s = df[col].dropna()
-        s.index = pd.to_datetime(s.index).tz_localize(None) if getattr(s.index, "tz", None) else pd.to_datetime(s.index)
-        return s
-    except Exception:
-        return pd.Series(dtype=float)
+        return env_fred_api_key()
 
-@st.cache_data(ttl=3600)
-def fetch_yf_many(tickers: list, start_date: str) -> dict:
-    out = {}
-    for t in tickers:
-        out[t] = fetch_yf_one(t, start_date)
-    return out
-
-# ============================================================
-# SCORING
-# ============================================================
-
-def rolling_percentile_last(hist: pd.Series, latest: float) -> float:
-    h = hist.dropna()
-    if len(h) < 10 or pd.isna(latest):
-        return np.nan
-    return float((h <= latest).mean())
-
-def compute_indicator_score(series: pd.Series, direction: int, scoring_mode: str = "z5y"):
-    if series is None or series.empty:
-        return np.nan, np.nan, np.nan
-    s = series.dropna()
-    if len(s) < 20:
-        return np.nan, np.nan, (np.nan if s.empty else float(s.iloc[-1]))
-
-    latest = float(s.iloc[-1])
-    end = s.index.max()
-
-    if scoring_mode == "pct20y":
-        start = end - DateOffset(years=20)
-        hist = s[s.index >= start]
-        if len(hist) < 20:
-            hist = s
-        p = rolling_percentile_last(hist, latest)
-        sig = (p - 0.5) * 4.0
-    else:
-        start = end - DateOffset(years=5)
-        hist = s[s.index >= start]
-        if len(hist) < 10:
-            hist = s
-        mean = float(hist.mean())
-        std = float(hist.std())
-        sig = 0.0 if (std == 0 or np.isnan(std)) else (latest - mean) / std
-
-    raw = float(direction) * float(sig)
-    raw = float(np.clip(raw, -2.0, 2.0))
-    score = (raw + 2.0) / 4.0 * 100.0
-    return score, sig, latest
-
-def compute_indicator_score_asof(series: pd.Series, direction: int, scoring_mode: str, asof_ts: pd.Timestamp):
+def load_raw_data():
     """
-    Same scoring philosophy, but computed at time t using only data available up to t.
-    We use the last observation <= t as the 'latest' value, and measure vs window ending at t.
+    (fred, yf_map): full-history raw FRED series keyed like FRED_SERIES and closes
+    keyed by ticker, via the headless loader with the app's FRED key.
+
+    Not st.cache_data-cached: the snapshot service calls it once per data version
+    (from its background refresh thread once it has a version to serve), and a
+    cache entry outliving the version would hand the next one the same downloads.
     """
-    if series is None or series.empty:
-        return np.nan
-    s = series.dropna()
-    if s.empty:
-        return np.nan
-
-    s = s[s.index <= asof_ts]
-    if s.empty or len(s) < 20:
-        return np.nan
-
-    latest = float(s.iloc[-1])
-    end = s.index.max()
-
-    if scoring_mode == "pct20y":
-        start = end - DateOffset(years=20)
-        hist = s[s.index >= start]
-        if len(hist) < 20:
-            hist = s
-        p = rolling_percentile_last(hist, latest)
-        sig = (p - 0.5) * 4.0
+    return md.load_raw_data(api_key=get_fred_api_key(), scheduled=True, probe=True)
+
+@st.cache_resource
+def get_snapshot_service() -> SnapshotService:
+    # stale-while-revalidate: an expired version is served while the next one loads
+    return SnapshotService(loader=load_raw_data, artifacts=get_artifact_store(), stale_while_revalidate=True)
+
+DATA_AGE_POLL_S = 15  # data-age line refresh; also picks up a background refresh within this delay
+
+def _age_text(seconds: float) -> str:
+    if seconds < 90:
+        return "just now"
+    if seconds < 90 * 60:
+        return f"{seconds / 60:.0f} min ago"
+    if seconds < 48 * 3600:
+        return f"{seconds / 3600:.0f} h ago"
+    return f"{seconds / 86400:.0f} days ago"
+
+@st.fragment(run_every=DATA_AGE_POLL_S)
+def data_age_badge(version: str):
+    # sidebar data-age line; reruns the page once the service has swapped in a newer version
+    service = get_snapshot_service()
+    if service.version is not None and service.version != version:
+        st.rerun()
+    data_at = service.data_at
+    if data_at is None:
+        return
+    age = _age_text((datetime.now(timezone.utc) - data_at).total_seconds())
+    stamp = data_at.strftime("%Y-%m-%d %H:%M UTC")
+    if service.artifact is not None:
+        st.caption(f"Precomputed snapshot · built {stamp} ({age})")
+    elif service.refreshing:
+        st.caption(f"Data loaded {age} ({stamp}) · refreshing in the background…")
     else:
-        start = end - DateOffset(years=5)
-        hist = s[s.index >= start]
-        if len(hist) < 10:
-            hist = s
-        mean = float(hist.mean())
-        std = float(hist.std())
-        sig = 0.0 if (std == 0 or np.isnan(std)) else (latest - mean) / std
-
-    raw = float(direction) * float(sig)
-    raw = float(np.clip(raw, -2.0, 2.0))
-    score = (raw + 2.0) / 4.0 * 100.0
-    return float(score)
-
-def classify_status(score: float) -> str:
-    if np.isnan(score):
-        return "n/a"
-    if score > 60:
-        return "risk_on"
-    if score < 40:
-        return "risk_off"
-    return "neutral"
+        st.caption(f"Data loaded {age} ({stamp})")
+    if service.refresh_error:
+        st.caption(f"⚠️ Refresh failed ({service.refresh_error}); showing the last good data.")
+
+@st.cache_resource
+def get_alert_timeline():
+    # replayed once per data version (sync_alert_log), then queried per render
+    return get_alert_log()
+
+@st.cache_resource(max_entries=256)
+def snapshot_figure(snapshot_key: tuple, chart: str, _build) -> go.Figure:
+    # one chart of a snapshot: built the first time any session displays it, then shared
+    # (st.plotly_chart only serializes it; figures are never mutated after build)
+    return _build()
+
+@st.cache_resource(max_entries=32)
+def snapshot_html(snapshot_key: tuple, name: str, _build) -> str:
+    # an HTML document of a snapshot (the wallboard), rendered once and shared like snapshot_figure
+    return _build()
 
-def status_label(status: str) -> str:
-    return {"risk_on":"Risk-on","risk_off":"Risk-off","neutral":"Neutral"}.get(status,"n/a")
+# ============================================================
+# UI HELPERS (status pills, score bars, trend badges)
+# ============================================================
 
 def sema(status: str) -> str:
     return {"risk_on":"🟢","neutral":"🟡","risk_off":"🔴"}.get(status,"⚪")
@@ -792,48 +341,6 @@ def fmt_value(val, unit: str, scale: float = 1.0):
         return f"{v:.2f}"
     return f"{v:.2f} {unit}"
 
-def infer_frequency_days(s: pd.Series) -> float:
-    if s is None or s.dropna().shape[0] < 10:
-        return 1.0
-    idx = pd.to_datetime(s.dropna().index)
-    diffs = np.diff(idx.values).astype("timedelta64[D]").astype(int)
-    if len(diffs) == 0:
-        return 1.0
-    return float(np.median(diffs))
-
-def pct_change_over_days(series: pd.Series, days: int) -> float:
-    if series is None or series.empty:
-        return np.nan
-    s = series.dropna()
-    if s.empty:
-        return np.nan
-    last_date = s.index.max()
-    target_date = last_date - timedelta(days=days)
-    past = s[s.index <= target_date]
-    if past.empty:
-        return np.nan
-    past_val = past.iloc[-1]
-    curr_val = s.iloc[-1]
-    if pd.isna(past_val) or pd.isna(curr_val) or past_val == 0:
-        return np.nan
-    return (curr_val / past_val - 1.0) * 100.0
-
-def recent_trend(series: pd.Series) -> dict:
-    if series is None or series.dropna().shape[0] < 10:
-        return {"window_label": "n/a", "delta_pct": np.nan, "arrow": "→", "days": None}
-    freq = infer_frequency_days(series)
-    if freq >= 20:
-        days = 90
-        label = "1Q"
-    else:
-        days = 30
-        label = "30d"
-    d = pct_change_over_days(series, days)
-    if np.isnan(d):
-        return {"window_label": label, "delta_pct": np.nan, "arrow": "→", "days": days}
-    arrow = "↑" if d > 0.25 else ("↓" if d < -0.25 else "→")
-    return {"window_label": label, "delta_pct": d, "arrow": arrow, "days": days}
-
 def score_bar_html(score: float) -> str:
     pos = 50 if np.isnan(score) else int(np.clip(score, 0, 100))
     return f"""
@@ -843,114 +350,6 @@ def score_bar_html(score: float) -> str:
       </div>
     """
 
-# ============================================================
-# REGIME HISTORY (GLOBAL + BLOCKS) — weekly by default
-# ============================================================
-
-def _safe_last(series: pd.Series):
-    if series is None or series.empty:
-        return None
-    s = series.dropna()
-    if s.empty:
-        return None
-    return s.iloc[-1]
-
-@st.cache_data(ttl=3600)
-def compute_regime_history(indicators: dict, start_date: str, freq: str = "W-FRI") -> pd.DataFrame:
-    """
-    Builds a historical time series of block scores + global score by re-applying
-    the SAME scoring logic at each date t using only observations available up to t.
-
-    - freq defaults to weekly ("W-FRI") for speed + stability.
-    - returns DataFrame indexed by date with columns: GLOBAL + block keys.
-    """
-    # Determine common date range (use data availability, then trim to start_date)
-    dates = []
-    for k in INDICATOR_META.keys():
-        s = indicators.get(k, None)
-        if s is None or s.empty:
-            continue
-        ss = s.dropna()
-        if ss.empty:
-            continue
-        dates.append(ss.index.min())
-        dates.append(ss.index.max())
-    if not dates:
-        return pd.DataFrame()
-
-    start = max(pd.to_datetime(start_date), min(dates))
-    end = max(dates)
-    if pd.isna(start) or pd.isna(end) or start >= end:
-        return pd.DataFrame()
-
-    grid = pd.date_range(start=start, end=end, freq=freq)
-    if len(grid) < 8:
-        # fallback to business days if window is too short
-        grid = pd.date_range(start=start, end=end, freq="B")
-    if len(grid) < 8:
-        return pd.DataFrame()
-
-    out = pd.DataFrame(index=grid)
-
-    # Compute indicator scores at each t (lightweight loops; weekly grid keeps fast)
-    # We compute block-level series directly to avoid storing huge indicator panel.
-    block_cols = list(BLOCKS.keys()) + ["GLOBAL"]
-    for c in block_cols:
-        out[c] = np.nan
-
-    # Pre-pull meta to avoid repeated dict access overhead
-    meta_cache = {k: INDICATOR_META[k] for k in INDICATOR_META.keys()}
-
-    # Precompute per-indicator score vectors into temp dict of lists (still small: weekly points)
-    ind_scores_at_t = {k: [] for k in INDICATOR_META.keys()}
-
-    for t in grid:
-        for ikey, meta in meta_cache.items():
-            s = indicators.get(ikey, None)
-            sc_mode = meta.get("scoring_mode", "z5y")
-            score_t = compute_indicator_score_asof(s, meta["direction"], sc_mode, t)
-            ind_scores_at_t[ikey].append(score_t)
-
-        # blocks
-        bvals = {}
-        for bkey, binfo in BLOCKS.items():
-            vals = []
-            for ikey in binfo["indicators"]:
-                v = ind_scores_at_t.get(ikey, [np.nan])[-1]
-                if not np.isnan(v):
-                    vals.append(v)
-            bscore = float(np.mean(vals)) if vals else np.nan
-            bvals[bkey] = bscore
-            out.at[t, bkey] = bscore
-
-        # global (weighted, same as live)
-        gs = 0.0
-        w_used = 0.0
-        for bkey, binfo in BLOCKS.items():
-            w = float(binfo.get("weight", 0.0))
-            if w <= 0:
-                continue
-            v = bvals.get(bkey, np.nan)
-            if np.isnan(v):
-                continue
-            gs += v * w
-            w_used += w
-        out.at[t, "GLOBAL"] = (gs / w_used) if w_used > 0 else np.nan
-
-    # Light cleanup: drop leading NaN runs
-    out = out.sort_index()
-    # keep rows where at least GLOBAL exists
-    out = out[~out["GLOBAL"].isna()]
-    return out
-
-def regime_delta(ts: pd.Series, periods: int) -> float:
-    if ts is None or ts.dropna().shape[0] < (periods + 2):
-        return np.nan
-    s = ts.dropna()
-    if len(s) <= periods:
-        return np.nan
-    return float(s.iloc[-1] - s.iloc[-1 - periods])
-
 def regime_trend_badge(delta: float, label: str) -> str:
     if np.isnan(delta):
         return f"<span class='trendPill'> {label}: n/a </span>"
@@ -973,122 +372,23 @@ def regime_trend_badge(delta: float, label: str) -> str:
 # (FIX: these functions were missing from the original code)
 # ============================================================
 
-def plot_regime_series(ts: pd.Series, title: str, height: int = 320) -> go.Figure:
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=ts.index,
-        y=ts.values,
-        mode="lines",
-        line=dict(color="rgba(244,63,94,0.85)", width=2),
-        name=title,
-    ))
-    fig.add_hline(y=60, line_dash="dot", line_color="rgba(34,197,94,0.55)",
-                  annotation_text="60", annotation_position="left")
-    fig.add_hline(y=40, line_dash="dot", line_color="rgba(239,68,68,0.55)",
-                  annotation_text="40", annotation_position="left")
-    fig.add_hline(y=50, line_dash="dash", line_color="rgba(255,255,255,0.15)")
-    fig.update_layout(
-        title=dict(text=title, font=dict(color="rgba(255,255,255,0.88)", size=13)),
-        height=height,
-        margin=dict(l=10, r=10, t=36, b=10),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(255,255,255,0.02)",
-        yaxis=dict(range=[0, 100], gridcolor="rgba(255,255,255,0.06)", color="rgba(255,255,255,0.60)"),
-        xaxis=dict(gridcolor="rgba(255,255,255,0.04)", color="rgba(255,255,255,0.60)"),
-        showlegend=False,
-    )
-    return fig
-
-def plot_premium(series: pd.Series, label: str, ref_line=None, height: int = 340) -> go.Figure:
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=series.index,
-        y=series.values,
-        mode="lines",
-        line=dict(color="rgba(244,63,94,0.85)", width=2),
-        name=label,
-    ))
-    if ref_line is not None:
-        fig.add_hline(
-            y=ref_line,
-            line_dash="dot",
-            line_color="rgba(255,255,255,0.35)",
-            annotation_text=str(ref_line),
-            annotation_position="left",
-        )
-    fig.update_layout(
-        title=dict(text=label, font=dict(color="rgba(255,255,255,0.88)", size=13)),
-        height=height,
-        margin=dict(l=10, r=10, t=36, b=10),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(255,255,255,0.02)",
-        yaxis=dict(gridcolor="rgba(255,255,255,0.06)", color="rgba(255,255,255,0.60)"),
-        xaxis=dict(gridcolor="rgba(255,255,255,0.04)", color="rgba(255,255,255,0.60)"),
-        showlegend=False,
-    )
-    return fig
-
-# ============================================================
-# OPERATING LINES
-# ============================================================
-
-def operating_lines(block_scores: dict, indicator_scores: dict):
-    gs = block_scores.get("GLOBAL", {}).get("score", np.nan)
-
-    def _sg(x):
-        if np.isnan(x):
-            return 0.0
-        return float(x)
-
-    cond = _sg(block_scores.get("conditions", {}).get("score", np.nan))
-    macro = _sg(block_scores.get("macro", {}).get("score", np.nan))
-    pot = _sg(block_scores.get("price_of_time", {}).get("score", np.nan))
-    policy = _sg(block_scores.get("policy_link", {}).get("score", np.nan))
-
-    if not np.isnan(gs):
-        if gs >= 60 and cond >= 55:
-            equity = "Increase (measured) — risk budget OK, watch credit"
-        elif gs <= 40 or cond <= 40:
-            equity = "Reduce — defense/quality first"
-        else:
-            equity = "Neutral — moderate sizing"
-    else:
-        equity = "n/a"
-
-    termp = _sg(indicator_scores.get("term_premium_10y", {}).get("score", np.nan))
-    infl = _sg(indicator_scores.get("cpi_yoy", {}).get("score", np.nan))
-
-    if termp <= 40 and infl <= 45:
-        duration = "Short/neutral — avoid long nominals; prefer quality / TIPS tilt"
-    elif pot <= 40 and infl <= 45 and termp >= 55:
-        duration = "Long (hedge) — disinflation + duration hedge looks cleaner"
-    else:
-        duration = "Neutral — balance term-premium risk vs cycle"
-
-    hy = _sg(indicator_scores.get("hy_oas", {}).get("score", np.nan))
-    hyg = _sg(indicator_scores.get("hyg_lqd_ratio", {}).get("score", np.nan))
-    ds = _sg(indicator_scores.get("interest_to_receipts", {}).get("score", np.nan))
+# Series are downsampled to the chart's width (wide layout) before plotting;
+# minmax keeps every bucket's low and high, so spikes (VIX, OAS) survive.
+CHART_WIDTH_FULL = 1400
+CHART_WIDTH_HALF = 700
+CHART_DOWNSAMPLE = "minmax"
 
-    if hy <= 40 or hyg <= 40 or ds <= 40:
-        credit = "IG > HY — reduce default / funding risk"
-    elif hy >= 60 and hyg >= 60 and policy >= 50:
-        credit = "Opportunistic HY — only with sizing discipline"
-    else:
-        credit = "Neutral — quality + selectivity"
-
-    usd = _sg(indicator_scores.get("usd_index", {}).get("score", np.nan))
-    gold = _sg(indicator_scores.get("gold", {}).get("score", np.nan))
+def chart_series(series: pd.Series, width_px: int) -> pd.Series:
+    return downsample(series, point_budget(width_px, CHART_DOWNSAMPLE), CHART_DOWNSAMPLE)
 
-    if policy <= 40 and (macro <= 55):
-        hedges = "Gold / real-asset tilt — policy constraint risk"
-    elif usd <= 40 and cond <= 45:
-        hedges = "USD / cash-like — funding stress hedge"
-    elif gold <= 40:
-        hedges = "Keep a small gold sleeve — hedge demand rising"
-    else:
-        hedges = "Light mix — cash-like + tactical gold"
+def plot_regime_series(ts: pd.Series, title: str, height: int = 320, width_px: int = CHART_WIDTH_HALF) -> go.Figure:
+    # built from the shared template spec; _validate=False skips graph-object validation
+    return go.Figure(regime_figure_spec(chart_series(ts, width_px), title, height), _validate=False)
 
-    return equity, duration, credit, hedges
+def plot_premium(series: pd.Series, label: str, ref_line=None, height: int = 340,
+                 width_px: int = CHART_WIDTH_HALF) -> go.Figure:
+    return go.Figure(indicator_figure_spec(chart_series(series, width_px), label, ref_line, height),
+                     _validate=False)
 
 # ============================================================
 # WALLBOARD TILE (ROBUST RENDER via components.html)
@@ -1209,36 +509,96 @@ def render_tile(fragment_html: str, height: int = 210):
     components.html(doc, height=height, scrolling=False)
 
 
-def _wb_inline_pill(status: str) -> str:
+# Wallboard groups: (expander title, [(section title, description, indicator keys)])
+WALLBOARD_GROUPS = [
+    ("Market Thermometers", [
+        ("Price of Time", "Rates and curve: the price of time and late-cycle signal.", ["real_10y", "nominal_10y", "yield_curve_10_2"]),
+        ("Macro Cycle", "Inflation and growth: policy constraint and cycle pressure.", ["breakeven_10y", "cpi_yoy", "unemployment_rate"]),
+        ("Conditions & Stress", "Fast regime: USD, credit stress, vol, trend, risk appetite.", ["usd_index", "hy_oas", "vix", "spy_trend", "hyg_lqd_ratio"]),
+        ("Liquidity / Plumbing", "System liquidity: tailwind vs drain for risk assets.", ["fed_balance_sheet", "rrp"]),
+    ]),
+    ("Structural Constraints", [
+        ("Fiscal / Policy Constraint", "Debt service, deficit dynamics, and funding constraint signal.",
+         ["interest_to_receipts", "deficit_gdp", "term_premium_10y", "interest_payments", "federal_receipts"]),
+        ("External Balance & Gold", "External funding reliance + hedge demand confirmation.",
+         ["current_account_gdp", "gold"]),
+    ]),
+]
+
+# One stylesheet for the whole wallboard document (tiles no longer carry inline styles).
+_WB_CSS = """
+  html, body {
+    margin: 0; padding: 0;
+    background: transparent;
+    color: rgba(255,255,255,0.94);
+    font-family: system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji", "Segoe UI Emoji";
+  }
+  .wbGroup{ font-size: 1.25rem; font-weight: 850; letter-spacing: -0.02em; color: rgba(255,255,255,0.94); margin: 6px 0 10px 0; }
+  .wbSection{
+    background: rgba(255,255,255,0.025);
+    border: 1px solid rgba(255,255,255,0.10);
+    border-radius: 20px;
+    padding: 14px;
+    box-shadow: 0 10px 28px rgba(0,0,0,0.20);
+    margin-bottom: 14px;
+  }
+  .wbSectionTitle{ font-size: 1.15rem; font-weight: 850; color: rgba(255,255,255,0.96); }
+  .wbSectionDesc{ font-size: 0.95rem; color: rgba(255,255,255,0.70); margin-top: 2px; margin-bottom: 10px; }
+  .wbGrid{ display: grid; grid-template-columns: repeat(3, minmax(0, 1fr)); gap: 14px; margin-bottom: 10px; }
+  @media (max-width: 900px){ .wbGrid{ grid-template-columns: repeat(2, minmax(0, 1fr)); } }
+  @media (max-width: 600px){ .wbGrid{ grid-template-columns: minmax(0, 1fr); } }
+
+  .wbTile{
+    background: rgba(255,255,255,0.028);
+    border: 1px solid rgba(255,255,255,0.10);
+    border-radius: 18px;
+    padding: 14px 14px 12px 14px;
+    box-shadow: 0 10px 26px rgba(0,0,0,0.18);
+    min-height: 156px;
+  }
+  .wbTile.missing{ background: rgba(255,255,255,0.018); border: 1px dashed rgba(255,255,255,0.14); box-shadow: 0 10px 26px rgba(0,0,0,0.16); }
+  .wbHead{ display:flex; align-items:flex-start; justify-content:space-between; gap:12px; }
+  .wbName{ font-weight:900; font-size:1.05rem; letter-spacing:-0.01em; }
+  .wbSource{ font-size:0.85rem; color:rgba(255,255,255,0.62); margin-top:2px; }
+  .wbVal{ margin-top:10px; font-size:1.65rem; font-weight:900; letter-spacing:-0.01em; color:rgba(255,255,255,0.96); }
+  .missing .wbVal{ color:rgba(255,255,255,0.70); }
+  .wbFoot{ display:flex; align-items:center; justify-content:space-between; gap:10px; margin-top:10px; }
+  .wbSmall{ font-size:0.88rem; color:rgba(255,255,255,0.70); }
+  .wbSmall b{ color:rgba(255,255,255,0.92); }
+  .missing .wbSmall{ color:rgba(255,255,255,0.62); }
+  .missing .wbSmall b{ color:rgba(255,255,255,0.78); }
+  .wbRef{ margin-top:8px; line-height:1.25; }
+
+  .wbPill{
+    display:inline-flex; align-items:center; gap:8px;
+    padding:6px 12px; border-radius:999px;
+    border:1px solid var(--c);
+    background: var(--bg);
+    color: rgba(255,255,255,0.92);
+    font-weight:800; font-size:0.88rem;
+    white-space:nowrap;
+  }
+  .wbPill .dot{ width:10px; height:10px; border-radius:999px; background:var(--c); display:inline-block; }
+  .wbPill.on{ --c: rgba(34,197,94,1); --bg: rgba(34,197,94,0.12); }
+  .wbPill.neutral{ --c: rgba(245,158,11,1); --bg: rgba(245,158,11,0.12); }
+  .wbPill.off{ --c: rgba(239,68,68,1); --bg: rgba(239,68,68,0.12); }
+
+  .wbBar{ margin-top:10px; height:10px; border-radius:999px; background:rgba(255,255,255,0.14); position:relative; overflow:hidden; }
+  .wbBar .fill{ height:100%; background:rgba(255,255,255,0.24); border-radius:999px; }
+  .wbBar .mark{ position:absolute; top:-3px; width:3px; height:16px; background:rgba(255,255,255,0.82); border-radius:3px; }
+"""
+
+def _wb_pill(status: str) -> str:
     status_l = (status or "").lower()
     if "risk_on" in status_l or status_l == "on":
-        color = "rgba(34,197,94,1)"
-        bg = "rgba(34,197,94,0.12)"
-        label = "Risk-on"
+        cls, label = "on", "Risk-on"
     elif "neutral" in status_l:
-        color = "rgba(245,158,11,1)"
-        bg = "rgba(245,158,11,0.12)"
-        label = "Neutral"
+        cls, label = "neutral", "Neutral"
     else:
-        color = "rgba(239,68,68,1)"
-        bg = "rgba(239,68,68,0.12)"
-        label = "Risk-off"
-    return f"""
-    <span style="
-        display:inline-flex; align-items:center; gap:8px;
-        padding:6px 12px; border-radius:999px;
-        border:1px solid {color};
-        background:{bg};
-        color: rgba(255,255,255,0.92);
-        font-weight:800; font-size:0.88rem;
-        white-space:nowrap;
-    ">
-      <span style="width:10px;height:10px;border-radius:999px;background:{color};display:inline-block;"></span>
-      {label}
-    </span>
-    """
+        cls, label = "off", "Risk-off"
+    return f'<span class="wbPill {cls}"><span class="dot"></span>{label}</span>'
 
-def _wb_inline_score_bar(score: float) -> str:
+def _wb_score_bar(score: float) -> str:
     # score is 0-100; NaN -> empty bar with marker centered
     if score is None or (isinstance(score, float) and np.isnan(score)):
         w = 0
@@ -1246,39 +606,16 @@ def _wb_inline_score_bar(score: float) -> str:
     else:
         w = max(0, min(100, float(score)))
         marker = w
-    return f"""
-    <div style="margin-top:10px;">
-      <div style="height:10px;border-radius:999px;background:rgba(255,255,255,0.14);position:relative;overflow:hidden;">
-        <div style="height:100%;width:{w}%;background:rgba(255,255,255,0.24);border-radius:999px;"></div>
-        <div style="position:absolute;left:{marker}%;top:-3px;width:3px;height:16px;background:rgba(255,255,255,0.82);border-radius:3px;"></div>
-      </div>
-    </div>
-    """
+    return f'<div class="wbBar"><div class="fill" style="width:{w}%;"></div><div class="mark" style="left:{marker}%;"></div></div>'
 
-def _wb_wrap_html(inner: str) -> str:
-    # Wrap tile HTML to make components.html stable and avoid scrollbars.
-    return f"""<!doctype html>
-<html>
-<head>
-<meta charset="utf-8" />
-<meta name="viewport" content="width=device-width, initial-scale=1" />
-<style>
-  html, body {{
-    margin: 0; padding: 0;
-    background: transparent;
-    font-family: system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji", "Segoe UI Emoji";
-  }}
-</style>
-</head>
-<body>
-{inner}
-</body>
-</html>"""
+def _wb_head(meta: dict, status: str) -> str:
+    return (f'<div class="wbHead"><div><div class="wbName">{_esc(meta["label"])}</div>'
+            f'<div class="wbSource">{_esc(meta["source"])}</div></div><div>{_wb_pill(status)}</div></div>')
 
-def wallboard_tile(key: str, series: pd.Series, indicator_scores: dict):
+def wallboard_tile_html(key: str, tr: dict, indicator_scores: dict) -> str:
     """
-    Wallboard tile rendered via components.html (iframe) to avoid Streamlit markdown
-    re-parsing HTML as code blocks. Uses inline styles (no dependency on global CSS).
+    One wallboard tile (an HTML fragment styled by _WB_CSS) for the wallboard
+    document. tr is the indicator's recent trend (Panel.trend).
     """
     meta = INDICATOR_META[key]
     sc = indicator_scores.get(key, {})
@@ -1286,11 +623,8 @@ def wallboard_tile(key: str, series: pd.Series, indicator_scores: dict):
     status = sc.get("status", "n/a")
     latest = sc.get("latest", np.nan)
 
-    label = _esc(meta["label"])
-    source = _esc(meta["source"])
     latest_txt = _esc(fmt_value(latest, meta["unit"], meta.get("scale", 1.0)))
 
-    tr = recent_trend(series)
     wlab = _esc(tr["window_label"])
     d = tr["delta_pct"]
     arrow = _esc(tr["arrow"])
@@ -1305,164 +639,180 @@ def wallboard_tile(key: str, series: pd.Series, indicator_scores: dict):
     score_txt = "n/a" if np.isnan(score) else f"{score:.0f}"
     score_txt = _esc(score_txt)
 
-    pill = _wb_inline_pill(status)
-    bar = _wb_inline_score_bar(score)
-
-    inner = f"""
-    <div style="
-        background: rgba(255,255,255,0.028);
-        border: 1px solid rgba(255,255,255,0.10);
-        border-radius: 18px;
-        padding: 14px 14px 12px 14px;
-        box-shadow: 0 10px 26px rgba(0,0,0,0.18);
-        color: rgba(255,255,255,0.94);
-        min-height: 156px;
-    ">
-      <div style="display:flex;align-items:flex-start;justify-content:space-between;gap:12px;">
-        <div>
-          <div style="font-weight:900;font-size:1.05rem;letter-spacing:-0.01em;">{label}</div>
-          <div style="font-size:0.85rem;color:rgba(255,255,255,0.62);margin-top:2px;">{source}</div>
-        </div>
-        <div>{pill}</div>
-      </div>
-
-      <div style="margin-top:10px;font-size:1.65rem;font-weight:900;letter-spacing:-0.01em;color:rgba(255,255,255,0.96);">{latest_txt}</div>
-
-      {bar}
-
-      <div style="display:flex;align-items:center;justify-content:space-between;gap:10px;margin-top:10px;">
-        <div style="font-size:0.88rem;color:rgba(255,255,255,0.70);">Score: <b style="color:rgba(255,255,255,0.92);">{score_txt}</b></div>
-        <div style="font-size:0.88rem;color:rgba(255,255,255,0.70);">Trend ({wlab}): <b style="color:rgba(255,255,255,0.92);">{arrow} {d_txt}</b></div>
+    return f"""
+    <div class="wbTile">
+      {_wb_head(meta, status)}
+      <div class="wbVal">{latest_txt}</div>
+      {_wb_score_bar(score)}
+      <div class="wbFoot">
+        <div class="wbSmall">Score: <b>{score_txt}</b></div>
+        <div class="wbSmall">Trend ({wlab}): <b>{arrow} {d_txt}</b></div>
       </div>
+      <div class="wbSmall wbRef">Reference: <b>{ref_txt}</b> · {_esc_truncate(ref_note, 90)}</div>
+    </div>
+    """
 
-      <div style="font-size:0.88rem;color:rgba(255,255,255,0.70);margin-top:8px;line-height:1.25;">
-        Reference: <b style="color:rgba(255,255,255,0.92);">{ref_txt}</b> · {_esc_truncate(ref_note, 90)}
+def wallboard_missing_tile_html(key: str) -> str:
+    meta = INDICATOR_META[key]
+    return f"""
+    <div class="wbTile missing">
+      {_wb_head(meta, "Neutral")}
+      <div class="wbVal">Missing data</div>
+      {_wb_score_bar(np.nan)}
+      <div class="wbFoot">
+        <div class="wbSmall">Score: <b>n/a</b></div>
+        <div class="wbSmall">Trend: <b>n/a</b></div>
       </div>
+      <div class="wbSmall wbRef">Reference: <b>—</b></div>
     </div>
     """
-    components.html(_wb_wrap_html(inner), height=270, scrolling=False)
 
-    with st.expander(f"Indicator guide — {meta['label']}", expanded=False):
-        exp = meta["expander"]
-        st.markdown(f"**What it is:** {exp.get('what','')}")
-        st.markdown(f"**Reference levels / thresholds:** {exp.get('reference','')}")
-        st.markdown("**How to read it:**")
-        st.markdown(exp.get("interpretation", ""))
-        st.markdown(f"**Why it matters (policy/funding link):** {exp.get('bridge','')}")
+def wallboard_html(groups, views: dict) -> str:
+    """Every wallboard tile in one document: a shared stylesheet and a CSS grid per section."""
+    parts = []
+    for group_title, sections in groups:
+        parts.append(f'<div class="wbGroup">{_esc(group_title)}</div>')
+        for title, desc, keys in sections:
+            tiles = "".join(views[k]["tile_html"] for k in keys)
+            parts.append(f'<div class="wbSection"><div class="wbSectionTitle">{_esc(title)}</div>'
+                         f'<div class="wbSectionDesc">{_esc(desc)}</div><div class="wbGrid">{tiles}</div></div>')
+    body = "\n".join(parts)
+    return f"""<!doctype html>
+<html>
+<head>
+<meta charset="utf-8" />
+<meta name="viewport" content="width=device-width, initial-scale=1" />
+<style>{_WB_CSS}</style>
+</head>
+<body>
+{body}
+</body>
+</html>"""
+
+def wallboard_height(groups) -> int:
+    # iframe height for the 3-column layout; narrower screens scroll inside the frame
+    h = 0
+    for _, sections in groups:
+        h += 46
+        for _, _, keys in sections:
+            h += 90 + -(-len(keys) // 3) * 244
+    return h
+
+# ============================================================
+# DERIVED STATE (per session)
+# What the tabs derive from a snapshot, computed once per (data version,
+# history years, regime frequency) and kept in session_state: reruns from
+# widget toggles re-render without recomputing.
+# ============================================================
 
-def wallboard_missing_tile(key: str):
+def indicator_view(key: str, indicators, indicator_scores: dict) -> dict:
+    """Trend, score, formatted value, % changes and tile HTML of one indicator."""
     meta = INDICATOR_META[key]
-    label = _esc(meta["label"])
-    source = _esc(meta["source"])
-    pill = _wb_inline_pill("Neutral")
-    inner = f"""
-    <div style="
-        background: rgba(255,255,255,0.018);
-        border: 1px dashed rgba(255,255,255,0.14);
-        border-radius: 18px;
-        padding: 14px 14px 12px 14px;
-        box-shadow: 0 10px 26px rgba(0,0,0,0.16);
-        color: rgba(255,255,255,0.94);
-        min-height: 156px;
-    ">
-      <div style="display:flex;align-items:flex-start;justify-content:space-between;gap:12px;">
-        <div>
-          <div style="font-weight:900;font-size:1.05rem;letter-spacing:-0.01em;">{label}</div>
-          <div style="font-size:0.85rem;color:rgba(255,255,255,0.62);margin-top:2px;">{source}</div>
-        </div>
-        <div>{pill}</div>
-      </div>
+    sc = indicator_scores.get(key, {})
+    present = indicators.rows(key) > 0
+    tr = indicators.trend(key)
+    d = tr["delta_pct"]
+    return {
+        "present": present,
+        "score": sc.get("score", np.nan),
+        "status": sc.get("status", "n/a"),
+        "latest": sc.get("latest", np.nan),
+        "latest_txt": fmt_value(sc.get("latest", np.nan), meta["unit"], meta.get("scale", 1.0)),
+        "trend": tr,
+        "d_txt": "n/a" if np.isnan(d) else f"{d:+.1f}%",
+        "changes": {days: indicators.pct_change(key, days) for days in (7, 30, 90, 365)},
+        "tile_html": wallboard_tile_html(key, tr, indicator_scores) if present else wallboard_missing_tile_html(key),
+    }
 
-      <div style="margin-top:10px;font-size:1.65rem;font-weight:900;letter-spacing:-0.01em;color:rgba(255,255,255,0.70);">Missing data</div>
+def what_changed_frame(views: dict) -> pd.DataFrame:
+    """What changed table: one row per indicator with data (empty frame when none)."""
+    rows = []
+    for key, meta in INDICATOR_META.items():
+        v = views[key]
+        if not v["present"]:
+            continue
 
-      {_wb_inline_score_bar(np.nan)}
+        tr = v["trend"]
+        window = tr["window_label"]
+        dwin = tr["delta_pct"]
 
-      <div style="display:flex;align-items:center;justify-content:space-between;gap:10px;margin-top:10px;">
-        <div style="font-size:0.88rem;color:rgba(255,255,255,0.62);">Score: <b style="color:rgba(255,255,255,0.78);">n/a</b></div>
-        <div style="font-size:0.88rem;color:rgba(255,255,255,0.62);">Trend: <b style="color:rgba(255,255,255,0.78);">n/a</b></div>
-      </div>
+        d7, d30, d90, d1y = (v["changes"][d] for d in (7, 30, 90, 365))
 
-      <div style="font-size:0.88rem;color:rgba(255,255,255,0.62);margin-top:8px;line-height:1.25;">
-        Reference: <b style="color:rgba(255,255,255,0.78);">—</b>
-      </div>
-    </div>
-    """
-    components.html(_wb_wrap_html(inner), height=270, scrolling=False)
-
-def render_tile_grid(keys, indicators, indicator_scores, n_cols: int = 3):
-    """Render wallboard tiles in a responsive Streamlit grid (no HTML grid wrappers)."""
-    if n_cols < 1:
-        n_cols = 1
-    cols = st.columns(n_cols)
-    col_i = 0
-    for k in keys:
-        if col_i % n_cols == 0 and col_i != 0:
-            cols = st.columns(n_cols)
-        c = cols[col_i % n_cols]
-        with c:
-            s = indicators.get(k, pd.Series(dtype=float))
-            if s is None or s.empty:
-                wallboard_missing_tile(k)
+        score = v["score"]
+        status = v["status"]
+        mode = meta.get("scoring_mode", "z5y")
+
+        # attention: (a) close to 40/60, (b) magnitude of main trend
+        if np.isnan(score):
+            prox = 0.0
+        else:
+            prox = max(0.0, 20.0 - min(abs(score - 40), abs(score - 60))) / 20.0
+
+        if np.isnan(dwin):
+            move = 0.0
+        else:
+            # Normalize move vs thresholds (daily 30d vs slow 1Q)
+            if window == "30d":
+                move = min(1.0, abs(dwin) / ALERT_RULES["trend_daily_pct"]["warn"])
             else:
-                wallboard_tile(k, s, indicator_scores)
-        col_i += 1
+                move = min(1.0, abs(dwin) / ALERT_RULES["trend_slow_pct"]["warn"])
+
+        attention = 0.55 * prox + 0.45 * move
+        hot = "HOT" if attention >= 0.65 else ("WATCH" if attention >= 0.50 else "")
+
+        rows.append({
+            "Indicator": meta["label"],
+            "Scoring": mode,
+            "Regime": status_label(status),
+            "Score": (np.nan if np.isnan(score) else round(score, 1)),
+            "TrendWindow": window,
+            "TrendPct": (np.nan if np.isnan(dwin) else round(dwin, 2)),
+            f"Trend ({window}) %": (np.nan if np.isnan(dwin) else round(dwin, 2)),
+            "Δ 7d %": (np.nan if np.isnan(d7) else round(d7, 2)),
+            "Δ 30d %": (np.nan if np.isnan(d30) else round(d30, 2)),
+            "Δ 1Q %": (np.nan if np.isnan(d90) else round(d90, 2)),
+            "Δ 1Y %": (np.nan if np.isnan(d1y) else round(d1y, 2)),
+            "Hotlist": hot,
+            "Attention": round(attention, 2),
+        })
+    return pd.DataFrame(rows)
+
+def snapshot_key(snap) -> tuple:
+    return (snap.version, snap.years_back, snap.freq)
+
+def derived_state(snap) -> dict:
+    key = snapshot_key(snap)
+    state = st.session_state.get("derived_state")
+    if state is not None and state["key"] == key:
+        return state
+
+    indicators, indicator_scores, regime_ts = snap.indicators, snap.indicator_scores, snap.regime_ts
+    views = {k: indicator_view(k, indicators, indicator_scores) for k in INDICATOR_META}
 
-def build_alerts(indicators: dict, indicator_scores: dict):
-    alerts = []
+    # Trend metrics from regime history
+    d4w = np.nan
+    d12w = np.nan
+    if regime_ts is not None and not regime_ts.empty and "GLOBAL" in regime_ts.columns:
+        p4 = 4 if snap.freq.startswith("W") else 20
+        p12 = 12 if snap.freq.startswith("W") else 60
+        d4w = regime_delta(regime_ts["GLOBAL"], p4)
+        d12w = regime_delta(regime_ts["GLOBAL"], p12)
 
-    for key, meta in INDICATOR_META.items():
-        s = indicators.get(key, pd.Series(dtype=float))
-        sc = indicator_scores.get(key, {})
-        score = sc.get("score", np.nan)
-        status = sc.get("status", "n/a")
-        if s is None or s.empty:
-            alerts.append(("WARN", meta["label"], "Missing data (series empty in selected window)."))
-            continue
+    # Data freshness
+    latest_points = [d for d in (indicators.last_date(k) for k in indicators) if d is not None]
+
+    state = {
+        "key": key,
+        "views": views,
+        "alerts": build_alerts(indicators, indicator_scores),
+        "operating_lines": operating_lines(snap.block_scores, indicator_scores),
+        "regime_deltas": (d4w, d12w),
+        "data_max_date": max(latest_points) if latest_points else None,
+        "changes": what_changed_frame(views),
+    }
+    st.session_state["derived_state"] = state
+    return state
 
-        tr = recent_trend(s)
-        wlab = tr["window_label"]
-        d = tr["delta_pct"]
-        days = tr.get("days", None)
-
-        # 1) score near boundary
-        if not np.isnan(score):
-            dist = ALERT_RULES["score_near_boundary"]["dist"]
-            if min(abs(score - 40), abs(score - 60)) <= dist:
-                alerts.append(("WARN", meta["label"], f"Score near regime boundary (score={score:.0f})."))
-
-            # 2) extreme regimes
-            if score <= ALERT_RULES["score_extreme"]["low"]:
-                alerts.append(("CRIT", meta["label"], f"Extreme risk-off reading (score={score:.0f})."))
-            if score >= ALERT_RULES["score_extreme"]["high"]:
-                alerts.append(("INFO", meta["label"], f"Strong risk-on reading (score={score:.0f})."))
-
-        # 3) large trend moves
-        if not np.isnan(d):
-            if days == 30:
-                warn = ALERT_RULES["trend_daily_pct"]["warn"]
-                crit = ALERT_RULES["trend_daily_pct"]["crit"]
-            else:
-                warn = ALERT_RULES["trend_slow_pct"]["warn"]
-                crit = ALERT_RULES["trend_slow_pct"]["crit"]
-
-            if abs(d) >= crit:
-                alerts.append(("CRIT", meta["label"], f"Large move over {wlab}: {d:+.1f}%"))
-            elif abs(d) >= warn:
-                alerts.append(("WARN", meta["label"], f"Notable move over {wlab}: {d:+.1f}%"))
-
-    # de-dup similar lines
-    dedup = []
-    seen = set()
-    for sev, name, msg in alerts:
-        k = (sev, name, msg)
-        if k not in seen:
-            dedup.append((sev, name, msg))
-            seen.add(k)
-
-    # sort by severity
-    order = {"CRIT": 0, "WARN": 1, "INFO": 2}
-    dedup.sort(key=lambda x: (order.get(x[0], 9), x[1]))
-    return dedup
 
 # ============================================================
 # REPORT PROMPT (your required block, unchanged)
@@ -1674,11 +1024,15 @@ def main():
 
     # Sidebar
     st.sidebar.header("Settings")
-    if st.sidebar.button("🔄 Refresh data (clear cache)"):
+    if st.sidebar.button("🔄 Refresh data (clear cache)", help="Clears the in-memory cache and polls every series, including those not due for an update. The current data stays on screen until the new data is ready. History kept on disk is reused, so only new observations are downloaded."):
         st.cache_data.clear()
+        series_store = get_series_store()
+        if series_store is not None:
+            series_store.expire_checks()
+        get_snapshot_service().refresh()
         st.rerun()
 
-    years_back = st.sidebar.slider("History (years)", 5, 30, 15)
+    years_back = st.sidebar.slider("History (years)", 5, MAX_HISTORY_YEARS, 15)
 
     # Regime history settings (kept conservative for speed)
     st.sidebar.markdown("---")
@@ -1687,174 +1041,48 @@ def main():
     freq = "W-FRI" if regime_freq.startswith("Weekly") else "B"
     show_regime_charts = st.sidebar.checkbox("Show regime trend charts in Deep dive", value=True)
 
-    today = datetime.now(timezone.utc).date()
-    start_date = (today - DateOffset(years=years_back)).date().isoformat()
+    # Shared snapshot: built once per data refresh + settings, read by every session
+    # (served from the precomputed artifact when the batch runner keeps one current;
+    # only a cold start waits on the network, later refreshes run in the background)
+    service = get_snapshot_service()
+    with st.spinner("Loading data (FRED + yfinance) and computing regime history..."):
+        snap = service.get(years_back, freq)
+    artifact = service.artifact
+    fred_errors = FRED_FETCH_ERRORS if artifact is None else artifact.fred_errors
+    if artifact is None and get_fred_api_key() is None:
+        st.sidebar.error("⚠️ Missing `FRED_API_KEY` (secrets or environment).")
+    if fred_errors:
+        st.sidebar.warning("⚠️ FRED series failed: " + ", ".join(sorted(fred_errors.values())))
+    with st.sidebar:
+        data_age_badge(snap.version)
+
+    start_date = snap.start_date
     st.sidebar.markdown(f"**Start date:** {start_date}")
-
-    fred_key = get_fred_api_key()
-    if fred_key is None:
-        st.sidebar.error("⚠️ Missing `FRED_API_KEY` in secrets.")
-
-    # Fetch data
-    with st.spinner("Loading data (FRED + yfinance)..."):
-        fred = {
-            "real_10y": fetch_fred_series("DFII10", start_date),
-            "nominal_10y": fetch_fred_series("DGS10", start_date),
-            "dgs2": fetch_fred_series("DGS2", start_date),
-
-            "breakeven_10y": fetch_fred_series("T10YIE", start_date),
-            "cpi_index": fetch_fred_series("CPIAUCSL", start_date),
-            "unemployment_rate": fetch_fred_series("UNRATE", start_date),
-
-            "hy_oas": fetch_fred_series("BAMLH0A0HYM2", start_date),
-            "usd_fred": fetch_fred_series("DTWEXBGS", start_date),
-
-            "fed_balance_sheet": fetch_fred_series("WALCL", start_date),
-            "rrp": fetch_fred_series("RRPONTSYD", start_date),
-
-            "interest_payments": fetch_fred_series("A091RC1Q027SBEA", start_date),
-            "federal_receipts": fetch_fred_series("FGRECPT", start_date),
-            "deficit_gdp": fetch_fred_series("FYFSGDA188S", start_date),
-            "term_premium_10y": fetch_fred_series("ACMTP10", start_date),
-
-            "current_account_gdp": fetch_fred_series("USAB6BLTT02STSAQ", start_date),
-        }
-
-        indicators = {}
-
-        # Derived: yield curve
-        if not fred["nominal_10y"].empty and not fred["dgs2"].empty:
-            yc = fred["nominal_10y"].to_frame("10y").join(fred["dgs2"].to_frame("2y"), how="inner")
-            indicators["yield_curve_10_2"] = (yc["10y"] - yc["2y"]).dropna()
-        else:
-            indicators["yield_curve_10_2"] = pd.Series(dtype=float)
-
-        # CPI YoY
-        if not fred["cpi_index"].empty:
-            indicators["cpi_yoy"] = (fred["cpi_index"].pct_change(12) * 100.0).dropna()
-        else:
-            indicators["cpi_yoy"] = pd.Series(dtype=float)
-
-        # Direct FRED
-        indicators["real_10y"] = fred["real_10y"]
-        indicators["nominal_10y"] = fred["nominal_10y"]
-        indicators["breakeven_10y"] = fred["breakeven_10y"]
-        indicators["unemployment_rate"] = fred["unemployment_rate"]
-
-        indicators["hy_oas"] = fred["hy_oas"]
-        indicators["fed_balance_sheet"] = fred["fed_balance_sheet"]
-        indicators["rrp"] = fred["rrp"]
-
-        indicators["interest_payments"] = fred["interest_payments"]
-        indicators["federal_receipts"] = fred["federal_receipts"]
-        indicators["deficit_gdp"] = fred["deficit_gdp"]
-        indicators["term_premium_10y"] = fred["term_premium_10y"]
-        indicators["current_account_gdp"] = fred["current_account_gdp"]
-
-        # Derived: interest / receipts ratio
-        ip = indicators.get("interest_payments", pd.Series(dtype=float))
-        fr = indicators.get("federal_receipts", pd.Series(dtype=float))
-        if (ip is not None and fr is not None) and (not ip.empty) and (not fr.empty):
-            join = ip.to_frame("interest").join(fr.to_frame("receipts"), how="inner").dropna()
-            join = join[join["receipts"] != 0]
-            indicators["interest_to_receipts"] = (join["interest"] / join["receipts"]).dropna()
-        else:
-            indicators["interest_to_receipts"] = pd.Series(dtype=float)
-
-        # YFinance
-        yf_map = fetch_yf_many(["DX-Y.NYB", "^VIX", "SPY", "HYG", "LQD", "GLD"], start_date)
-
-        dxy = yf_map.get("DX-Y.NYB", pd.Series(dtype=float))
-        if dxy is None or dxy.empty:
-            dxy = fred["usd_fred"]
-        indicators["usd_index"] = dxy
-
-        indicators["vix"] = yf_map.get("^VIX", pd.Series(dtype=float))
-
-        spy = yf_map.get("SPY", pd.Series(dtype=float))
-        if spy is not None and not spy.empty:
-            ma200 = spy.rolling(200).mean()
-            indicators["spy_trend"] = (spy / ma200).dropna()
-        else:
-            indicators["spy_trend"] = pd.Series(dtype=float)
-
-        hyg = yf_map.get("HYG", pd.Series(dtype=float))
-        lqd = yf_map.get("LQD", pd.Series(dtype=float))
-        if hyg is not None and lqd is not None and (not hyg.empty) and (not lqd.empty):
-            joined = hyg.to_frame("HYG").join(lqd.to_frame("LQD"), how="inner").dropna()
-            indicators["hyg_lqd_ratio"] = (joined["HYG"] / joined["LQD"]).dropna()
-        else:
-            indicators["hyg_lqd_ratio"] = pd.Series(dtype=float)
-
-        indicators["gold"] = yf_map.get("GLD", pd.Series(dtype=float))
-
-    # Score indicators (latest)
-    indicator_scores = {}
-    for key, meta in INDICATOR_META.items():
-        series = indicators.get(key, pd.Series(dtype=float))
-        mode = meta.get("scoring_mode", "z5y")
-        score, sig, latest = compute_indicator_score(series, meta["direction"], scoring_mode=mode)
-        indicator_scores[key] = {
-            "score": score,
-            "signal": sig,
-            "latest": latest,
-            "status": classify_status(score),
-            "mode": mode
-        }
-
-    # Score blocks + global (latest)
-    block_scores = {}
-    global_score = 0.0
-    w_used = 0.0
-
-    for bkey, binfo in BLOCKS.items():
-        vals = []
-        for ikey in binfo["indicators"]:
-            sc = indicator_scores.get(ikey, {}).get("score", np.nan)
-            if not np.isnan(sc):
-                vals.append(sc)
-
-        bscore = float(np.mean(vals)) if vals else np.nan
-        block_scores[bkey] = {"score": bscore, "status": classify_status(bscore)}
-
-        if binfo["weight"] > 0 and not np.isnan(bscore):
-            global_score += bscore * binfo["weight"]
-            w_used += binfo["weight"]
-
-    global_score = (global_score / w_used) if w_used > 0 else np.nan
-    global_status = classify_status(global_score)
-    block_scores["GLOBAL"] = {"score": global_score, "status": global_status}
-
-    # ============================================================
-    # REGIME HISTORY COMPUTATION
-    # (FIX: moved inside main() — was incorrectly at module level)
-    # ============================================================
-    with st.spinner("Computing regime history (same scoring logic; frequency=" + ("weekly" if freq.startswith("W") else "daily") + ")..."):
-        regime_ts = compute_regime_history(indicators, start_date=start_date, freq=freq)
-
-    # Trend metrics from regime history
-    d4w = np.nan
-    d12w = np.nan
-    if regime_ts is not None and not regime_ts.empty and "GLOBAL" in regime_ts.columns:
-        p4 = 4 if freq.startswith("W") else 20
-        p12 = 12 if freq.startswith("W") else 60
-        d4w = regime_delta(regime_ts["GLOBAL"], p4)
-        d12w = regime_delta(regime_ts["GLOBAL"], p12)
+    indicators = snap.indicators
+    indicator_scores = snap.indicator_scores
+    block_scores = snap.block_scores
+    global_score = block_scores["GLOBAL"]["score"]
+    global_status = block_scores["GLOBAL"]["status"]
+    regime_ts = snap.regime_ts
+
+    # Derived state: once per snapshot + settings for this session
+    state = derived_state(snap)
+    views = state["views"]
+    d4w, d12w = state["regime_deltas"]
 
     # Keep d1m / d1q as aliases for overview card
     d1m = d4w
     d1q = d12w
 
-    # Data freshness
-    latest_points = [s.index.max() for s in indicators.values() if s is not None and not s.empty]
-    data_max_date = max(latest_points) if latest_points else None
+    data_max_date = state["data_max_date"]
     now_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
-    # Alerts (computed once)
-    alerts = build_alerts(indicators, indicator_scores)
+    alerts = state["alerts"]
 
     # Tabs
-    tabs = st.tabs(["Overview", "Wallboard", "Deep dive", "What changed", "Report generation"])
+    # (on_change="rerun" tracks the open tab, so heavy tabs only run while shown)
+    tabs = st.tabs(["Overview", "Wallboard", "Deep dive", "What changed", "Report generation"],
+                   key="main_tab", on_change="rerun")
 
     # ============================================================
     # OVERVIEW
@@ -1862,7 +1090,7 @@ def main():
     with tabs[0]:
         st.markdown("<div class='muted'>ETF-oriented macro wallboard: separates Market Thermometers (fast) vs Structural Constraints (slow), then maps to operating lines.</div>", unsafe_allow_html=True)
 
-        eq_line, dur_line, cr_line, hdg_line = operating_lines(block_scores, indicator_scores)
+        eq_line, dur_line, cr_line, hdg_line = state["operating_lines"]
 
         market_blocks = ["price_of_time", "macro", "conditions", "plumbing"]
         structural_blocks = ["policy_link", "external", "gold_block"]
@@ -2053,7 +1281,7 @@ def main():
         st.markdown("## Wallboard")
         st.markdown("<div class='muted'>Order: Overall regime → component scores → operating lines → grouped indicator tiles (no charts).</div>", unsafe_allow_html=True)
 
-        eq_line, dur_line, cr_line, hdg_line = operating_lines(block_scores, indicator_scores)
+        eq_line, dur_line, cr_line, hdg_line = state["operating_lines"]
         gs_txt = "n/a" if np.isnan(global_score) else f"{global_score:.1f}"
 
         trend_1 = regime_trend_badge(d4w, "Δ ~1M")
@@ -2111,29 +1339,21 @@ def main():
             unsafe_allow_html=True
         )
 
-        with st.expander("Market Thermometers", expanded=True):
-            groups_mt = [
-                ("Price of Time", "Rates and curve: the price of time and late-cycle signal.", ["real_10y", "nominal_10y", "yield_curve_10_2"]),
-                ("Macro Cycle", "Inflation and growth: policy constraint and cycle pressure.", ["breakeven_10y", "cpi_yoy", "unemployment_rate"]),
-                ("Conditions & Stress", "Fast regime: USD, credit stress, vol, trend, risk appetite.", ["usd_index", "hy_oas", "vix", "spy_trend", "hyg_lqd_ratio"]),
-                ("Liquidity / Plumbing", "System liquidity: tailwind vs drain for risk assets.", ["fed_balance_sheet", "rrp"]),
-            ]
-            for title, desc, keys in groups_mt:
-                st.markdown(f"<div class='section'><div class='sectionHead'><div><div class='sectionTitle'>{_html.escape(title)}</div><div class='sectionDesc'>{_html.escape(desc)}</div></div></div></div>", unsafe_allow_html=True)
-                render_tile_grid(keys, indicators, indicator_scores, n_cols=3)
-                st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
-
-        with st.expander("Structural Constraints", expanded=True):
-            groups_sc = [
-                ("Fiscal / Policy Constraint", "Debt service, deficit dynamics, and funding constraint signal.",
-                 ["interest_to_receipts", "deficit_gdp", "term_premium_10y", "interest_payments", "federal_receipts"]),
-                ("External Balance & Gold", "External funding reliance + hedge demand confirmation.",
-                 ["current_account_gdp", "gold"]),
-            ]
-            for title, desc, keys in groups_sc:
-                st.markdown(f"<div class='section'><div class='sectionHead'><div><div class='sectionTitle'>{_html.escape(title)}</div><div class='sectionDesc'>{_html.escape(desc)}</div></div></div></div>", unsafe_allow_html=True)
-                render_tile_grid(keys, indicators, indicator_scores, n_cols=3)
-                st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
+        # all tiles in one iframe document (one stylesheet, CSS grid), cached per snapshot
+        wb_html = snapshot_html(snapshot_key(snap), "wallboard", lambda: wallboard_html(WALLBOARD_GROUPS, views))
+        components.html(wb_html, height=wallboard_height(WALLBOARD_GROUPS), scrolling=True)
+
+        with st.expander("Indicator guides (definition, thresholds, why it matters)", expanded=False):
+            for _, sections in WALLBOARD_GROUPS:
+                for _, _, keys in sections:
+                    for k in keys:
+                        exp = INDICATOR_META[k]["expander"]
+                        st.markdown(f"#### {INDICATOR_META[k]['label']}")
+                        st.markdown(f"**What it is:** {exp.get('what','')}")
+                        st.markdown(f"**Reference levels / thresholds:** {exp.get('reference','')}")
+                        st.markdown("**How to read it:**")
+                        st.markdown(exp.get("interpretation", ""))
+                        st.markdown(f"**Why it matters (policy/funding link):** {exp.get('bridge','')}")
 
     # ============================================================
     # DEEP DIVE
@@ -2145,145 +1365,151 @@ def main():
         st.markdown("## Deep dive")
         st.markdown("<div class='muted'>Full context charts. Default view shows everything. Layout: two charts per row on desktop; stacks on mobile.</div>", unsafe_allow_html=True)
 
-        # Regime trend section (GLOBAL + blocks)
-        if show_regime_charts:
-            st.markdown(
-                "<div class='section'><div class='sectionHead'><div>"
-                "<div class='sectionTitle'>Regime trend — Global & components</div>"
-                "<div class='sectionDesc'>Same scoring logic applied historically (weekly by default). "
-                "Use as regime momentum, not as a forecast.</div>"
-                "</div></div></div>",
-                unsafe_allow_html=True
-            )
+        # built (or taken from snapshot_figure) and sent to the browser only while the tab is shown
+        if tabs[2].open:
+            # Regime trend section (GLOBAL + blocks)
+            if show_regime_charts:
+                st.markdown(
+                    "<div class='section'><div class='sectionHead'><div>"
+                    "<div class='sectionTitle'>Regime trend — Global & components</div>"
+                    "<div class='sectionDesc'>Same scoring logic applied historically (weekly by default). "
+                    "Use as regime momentum, not as a forecast.</div>"
+                    "</div></div></div>",
+                    unsafe_allow_html=True
+                )
 
-            if regime_ts is None or regime_ts.empty:
-                st.warning("Regime trend series unavailable (insufficient data / missing series).")
-            else:
-                # Global full-width
-                figg = plot_regime_series(regime_ts["GLOBAL"], "Global Regime Score (0–100) — history", height=320)
-                st.plotly_chart(figg, use_container_width=True, config={"displayModeBar": False}, key="regime_global")
-
-                # Blocks in grid
-                st.markdown("<div class='muted' style='margin-top:6px;'>Component blocks (0–100)</div>", unsafe_allow_html=True)
-                block_keys = [k for k in BLOCKS.keys() if k in regime_ts.columns]
-                # two-up layout
-                row = []
-                for bk in block_keys:
-                    row.append(bk)
-                    if len(row) == 2:
+                if regime_ts is None or regime_ts.empty:
+                    st.warning("Regime trend series unavailable (insufficient data / missing series).")
+                else:
+                    # Global full-width
+                    figg = snapshot_figure(snapshot_key(snap), "regime_GLOBAL", lambda: plot_regime_series(
+                        regime_ts["GLOBAL"], "Global Regime Score (0–100) — history", height=320,
+                        width_px=CHART_WIDTH_FULL))
+                    st.plotly_chart(figg, use_container_width=True, config={"displayModeBar": False}, key="regime_global")
+
+                    # Blocks in grid
+                    st.markdown("<div class='muted' style='margin-top:6px;'>Component blocks (0–100)</div>", unsafe_allow_html=True)
+                    block_keys = [k for k in BLOCKS.keys() if k in regime_ts.columns]
+                    # two-up layout
+                    row = []
+                    for bk in block_keys:
+                        row.append(bk)
+                        if len(row) == 2:
+                            cols = st.columns(2)
+                            for i, kk in enumerate(row):
+                                with cols[i]:
+                                    nm = BLOCKS[kk]["name"]
+                                    figb = snapshot_figure(snapshot_key(snap), f"regime_{kk}", lambda: plot_regime_series(
+                                        regime_ts[kk], f"{nm} — history", height=260))
+                                    st.plotly_chart(figb, use_container_width=True, config={"displayModeBar": False}, key=f"regime_{kk}")
+                            row = []
+                    if row:
                         cols = st.columns(2)
-                        for i, kk in enumerate(row):
-                            with cols[i]:
-                                nm = BLOCKS[kk]["name"]
-                                figb = plot_regime_series(regime_ts[kk], f"{nm} — history", height=260)
-                                st.plotly_chart(figb, use_container_width=True, config={"displayModeBar": False}, key=f"regime_{kk}")
-                        row = []
-                if row:
-                    cols = st.columns(2)
-                    with cols[0]:
-                        nm = BLOCKS[row[0]]["name"]
-                        figb = plot_regime_series(regime_ts[row[0]], f"{nm} — history", height=260)
-                        st.plotly_chart(figb, use_container_width=True, config={"displayModeBar": False}, key=f"regime_{row[0]}")
-                    with cols[1]:
-                        st.markdown("<div class='card' style='opacity:0.0; height:10px;'></div>", unsafe_allow_html=True)
-
-        # A few indicators read better full-width (optional)
-        full_width_indicators = {"fed_balance_sheet"}  # extend if needed
-
-        deep_groups = [
-            ("Price of Time", "Rates and curve: the price of time and late-cycle signal.", ["real_10y", "nominal_10y", "yield_curve_10_2"]),
-            ("Macro Cycle", "Inflation and labor: policy constraint and cycle pressure.", ["breakeven_10y", "cpi_yoy", "unemployment_rate"]),
-            ("Conditions & Stress", "Fast regime: USD, credit stress, vol, trend, risk appetite.", ["usd_index", "hy_oas", "vix", "spy_trend", "hyg_lqd_ratio"]),
-            ("Liquidity / Plumbing", "System liquidity: tailwind vs drain for risk assets.", ["fed_balance_sheet", "rrp"]),
-            ("Fiscal / Policy Constraint", "Debt service, deficit dynamics, and funding constraint signal.", ["interest_to_receipts", "deficit_gdp", "term_premium_10y", "interest_payments", "federal_receipts"]),
-            ("External Balance & Gold", "External funding reliance + hedge demand confirmation.", ["current_account_gdp", "gold"]),
-        ]
-
-        def render_deep_panel(k: str):
-            meta = INDICATOR_META[k]
-            s = indicators.get(k, pd.Series(dtype=float))
-
-            sc = indicator_scores.get(k, {})
-            score = sc.get("score", np.nan)
-            status = sc.get("status", "n/a")
-            latest = sc.get("latest", np.nan)
-            latest_txt = fmt_value(latest, meta["unit"], meta.get("scale", 1.0))
-
-            tr = recent_trend(s)
-            wlab = tr["window_label"]
-            d = tr["delta_pct"]
-            arrow = tr["arrow"]
-            d_txt = "n/a" if np.isnan(d) else f"{d:+.1f}%"
-
-            st.markdown("<div class='section'>", unsafe_allow_html=True)
-            st.markdown(
-                f"""
-                <div class="sectionHead">
-                  <div>
-                    <div class="sectionTitle">{_html.escape(meta["label"])}</div>
-                    <div class="sectionDesc">{_html.escape(meta["source"])}</div>
-                  </div>
-                  <div style="text-align:right;">
-                    <div style="display:flex; gap:10px; justify-content:flex-end; flex-wrap:wrap;">
-                      <span class="pill">Latest: <b>{_html.escape(str(latest_txt))}</b></span>
-                      {pill_html(status)}
-                      <span class="pill">Score: <b>{("n/a" if np.isnan(score) else f"{score:.0f}")}</b></span>
-                      <span class="pill">Trend ({_html.escape(str(wlab))}): <b>{_html.escape(str(arrow))} {_html.escape(str(d_txt))}</b></span>
-                    </div>
-                  </div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+                        with cols[0]:
+                            nm = BLOCKS[row[0]]["name"]
+                            figb = snapshot_figure(snapshot_key(snap), f"regime_{row[0]}", lambda: plot_regime_series(
+                                regime_ts[row[0]], f"{nm} — history", height=260))
+                            st.plotly_chart(figb, use_container_width=True, config={"displayModeBar": False}, key=f"regime_{row[0]}")
+                        with cols[1]:
+                            st.markdown("<div class='card' style='opacity:0.0; height:10px;'></div>", unsafe_allow_html=True)
+
+            # A few indicators read better full-width (optional)
+            full_width_indicators = {"fed_balance_sheet"}  # extend if needed
+
+            deep_groups = [
+                ("Price of Time", "Rates and curve: the price of time and late-cycle signal.", ["real_10y", "nominal_10y", "yield_curve_10_2"]),
+                ("Macro Cycle", "Inflation and labor: policy constraint and cycle pressure.", ["breakeven_10y", "cpi_yoy", "unemployment_rate"]),
+                ("Conditions & Stress", "Fast regime: USD, credit stress, vol, trend, risk appetite.", ["usd_index", "hy_oas", "vix", "spy_trend", "hyg_lqd_ratio"]),
+                ("Liquidity / Plumbing", "System liquidity: tailwind vs drain for risk assets.", ["fed_balance_sheet", "rrp"]),
+                ("Fiscal / Policy Constraint", "Debt service, deficit dynamics, and funding constraint signal.", ["interest_to_receipts", "deficit_gdp", "term_premium_10y", "interest_payments", "federal_receipts"]),
+                ("External Balance & Gold", "External funding reliance + hedge demand confirmation.", ["current_account_gdp", "gold"]),
+            ]
 
-            if s is None or s.empty:
-                st.warning("Missing data for this indicator in the selected history window.")
-            else:
-                fig = plot_premium(s, meta["label"], ref_line=meta.get("ref_line", None), height=340)
-                st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False}, key=f"deep_{k}")
+            def render_deep_panel(k: str):
+                meta = INDICATOR_META[k]
+                s = indicators.get(k, pd.Series(dtype=float))
 
-            with st.expander("Indicator guide (definition, thresholds, why it matters)", expanded=False):
-                exp = meta["expander"]
-                st.markdown(f"**What it is:** {exp.get('what','')}")
-                st.markdown(f"**Reference levels / thresholds:** {exp.get('reference','')}")
-                st.markdown("**How to read it:**")
-                st.markdown(exp.get("interpretation", ""))
-                st.markdown(f"**Why it matters (policy/funding link):** {exp.get('bridge','')}")
+                v = views[k]
+                score = v["score"]
+                status = v["status"]
+                latest_txt = v["latest_txt"]
 
-            st.markdown("</div>", unsafe_allow_html=True)
+                tr = v["trend"]
+                wlab = tr["window_label"]
+                arrow = tr["arrow"]
+                d_txt = v["d_txt"]
 
-        for gtitle, gdesc, keys in deep_groups:
-            st.markdown(
-                f"<div class='section'><div class='sectionHead'><div><div class='sectionTitle'>{_html.escape(gtitle)}</div><div class='sectionDesc'>{_html.escape(gdesc)}</div></div></div></div>",
-                unsafe_allow_html=True
-            )
+                st.markdown("<div class='section'>", unsafe_allow_html=True)
+                st.markdown(
+                    f"""
+                    <div class="sectionHead">
+                      <div>
+                        <div class="sectionTitle">{_html.escape(meta["label"])}</div>
+                        <div class="sectionDesc">{_html.escape(meta["source"])}</div>
+                      </div>
+                      <div style="text-align:right;">
+                        <div style="display:flex; gap:10px; justify-content:flex-end; flex-wrap:wrap;">
+                          <span class="pill">Latest: <b>{_html.escape(str(latest_txt))}</b></span>
+                          {pill_html(status)}
+                          <span class="pill">Score: <b>{("n/a" if np.isnan(score) else f"{score:.0f}")}</b></span>
+                          <span class="pill">Trend ({_html.escape(str(wlab))}): <b>{_html.escape(str(arrow))} {_html.escape(str(d_txt))}</b></span>
+                        </div>
+                      </div>
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
 
-            # two-up layout, but allow full-width exceptions
-            row = []
-            for k in keys:
-                if k in full_width_indicators:
-                    # flush any pending row
-                    if row:
-                        cols = st.columns(2)
-                        for i, kk in enumerate(row):
-                            with cols[i]:
-                                render_deep_panel(kk)
-                        row = []
-                    render_deep_panel(k)
+                if s is None or s.empty:
+                    st.warning("Missing data for this indicator in the selected history window.")
                 else:
-                    row.append(k)
-                    if len(row) == 2:
-                        cols = st.columns(2)
-                        for i, kk in enumerate(row):
-                            with cols[i]:
-                                render_deep_panel(kk)
-                        row = []
-            if row:
-                cols = st.columns(2)
-                with cols[0]:
-                    render_deep_panel(row[0])
-                with cols[1]:
-                    st.markdown("<div class='card' style='opacity:0.0; height:10px;'></div>", unsafe_allow_html=True)
+                    fig = snapshot_figure(snapshot_key(snap), f"deep_{k}", lambda: plot_premium(
+                        s, meta["label"], ref_line=meta.get("ref_line", None), height=340,
+                        width_px=CHART_WIDTH_FULL if k in full_width_indicators else CHART_WIDTH_HALF))
+                    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False}, key=f"deep_{k}")
+
+                with st.expander("Indicator guide (definition, thresholds, why it matters)", expanded=False):
+                    exp = meta["expander"]
+                    st.markdown(f"**What it is:** {exp.get('what','')}")
+                    st.markdown(f"**Reference levels / thresholds:** {exp.get('reference','')}")
+                    st.markdown("**How to read it:**")
+                    st.markdown(exp.get("interpretation", ""))
+                    st.markdown(f"**Why it matters (policy/funding link):** {exp.get('bridge','')}")
+
+                st.markdown("</div>", unsafe_allow_html=True)
+
+            for gtitle, gdesc, keys in deep_groups:
+                st.markdown(
+                    f"<div class='section'><div class='sectionHead'><div><div class='sectionTitle'>{_html.escape(gtitle)}</div><div class='sectionDesc'>{_html.escape(gdesc)}</div></div></div></div>",
+                    unsafe_allow_html=True
+                )
+
+                # two-up layout, but allow full-width exceptions
+                row = []
+                for k in keys:
+                    if k in full_width_indicators:
+                        # flush any pending row
+                        if row:
+                            cols = st.columns(2)
+                            for i, kk in enumerate(row):
+                                with cols[i]:
+                                    render_deep_panel(kk)
+                            row = []
+                        render_deep_panel(k)
+                    else:
+                        row.append(k)
+                        if len(row) == 2:
+                            cols = st.columns(2)
+                            for i, kk in enumerate(row):
+                                with cols[i]:
+                                    render_deep_panel(kk)
+                            row = []
+                if row:
+                    cols = st.columns(2)
+                    with cols[0]:
+                        render_deep_panel(row[0])
+                    with cols[1]:
+                        st.markdown("<div class='card' style='opacity:0.0; height:10px;'></div>", unsafe_allow_html=True)
 
     # ============================================================
     # WHAT CHANGED
@@ -2296,64 +1522,10 @@ def main():
             unsafe_allow_html=True
         )
 
-        rows = []
-        for key, meta in INDICATOR_META.items():
-            s = indicators.get(key, pd.Series(dtype=float))
-            if s is None or s.empty:
-                continue
-
-            tr = recent_trend(s)
-            window = tr["window_label"]
-            dwin = tr["delta_pct"]
-
-            d7 = pct_change_over_days(s, 7)
-            d30 = pct_change_over_days(s, 30)
-            d90 = pct_change_over_days(s, 90)
-            d1y = pct_change_over_days(s, 365)
-
-            sc = indicator_scores.get(key, {})
-            score = sc.get("score", np.nan)
-            status = sc.get("status", "n/a")
-            mode = meta.get("scoring_mode", "z5y")
-
-            # attention: (a) close to 40/60, (b) magnitude of main trend
-            if np.isnan(score):
-                prox = 0.0
-            else:
-                prox = max(0.0, 20.0 - min(abs(score - 40), abs(score - 60))) / 20.0
-
-            if np.isnan(dwin):
-                move = 0.0
-            else:
-                # Normalize move vs thresholds (daily 30d vs slow 1Q)
-                if window == "30d":
-                    move = min(1.0, abs(dwin) / ALERT_RULES["trend_daily_pct"]["warn"])
-                else:
-                    move = min(1.0, abs(dwin) / ALERT_RULES["trend_slow_pct"]["warn"])
-
-            attention = 0.55 * prox + 0.45 * move
-            hot = "HOT" if attention >= 0.65 else ("WATCH" if attention >= 0.50 else "")
-
-            rows.append({
-                "Indicator": meta["label"],
-                "Scoring": mode,
-                "Regime": status_label(status),
-                "Score": (np.nan if np.isnan(score) else round(score, 1)),
-                "TrendWindow": window,
-                "TrendPct": (np.nan if np.isnan(dwin) else round(dwin, 2)),
-                f"Trend ({window}) %": (np.nan if np.isnan(dwin) else round(dwin, 2)),
-                "Δ 7d %": (np.nan if np.isnan(d7) else round(d7, 2)),
-                "Δ 30d %": (np.nan if np.isnan(d30) else round(d30, 2)),
-                "Δ 1Q %": (np.nan if np.isnan(d90) else round(d90, 2)),
-                "Δ 1Y %": (np.nan if np.isnan(d1y) else round(d1y, 2)),
-                "Hotlist": hot,
-                "Attention": round(attention, 2),
-            })
-
-        if not rows:
+        df = state["changes"]
+        if df.empty:
             st.info("No sufficient data to compute changes.")
         else:
-            df = pd.DataFrame(rows)
 
             # Hotlist first
             hot_df = df[df["Hotlist"].isin(["HOT", "WATCH"])].sort_values(["Hotlist", "Attention"], ascending=[True, False]).head(12)
@@ -2396,6 +1568,38 @@ def main():
                 "Use Wallboard for reference levels and Deep dive for chart context."
             )
 
+        st.markdown("### Alert timeline")
+        alert_log = get_alert_timeline()
+        if alert_log is None or regime_ts is None or regime_ts.empty:
+            st.info("Alert timeline unavailable (no series store or regime history).")
+        else:
+            scope = sync_alert_log(alert_log, snap)
+            tl1, tl2 = st.columns([3, 1])
+            with tl1:
+                weeks = st.slider("Last N weeks", min_value=4, max_value=104, value=12, step=4, key="alert_weeks")
+            with tl2:
+                show_cleared = st.checkbox("Show cleared", value=False, key="alert_cleared")
+            events = alert_log.recent(scope, weeks, asof=regime_ts.index.max())
+            if not show_cleared:
+                events = events[events["state"] != "off"]
+            if events.empty:
+                st.caption("No alert transitions in this window.")
+            else:
+                st.dataframe(
+                    events.rename(columns={"date": "Date", "label": "Indicator", "rule": "Rule", "state": "State",
+                                           "severity": "Severity", "message": "Message"})
+                          .drop(columns=["indicator"]).reset_index(drop=True),
+                    use_container_width=True,
+                )
+            with st.expander("How often rules fired (last 10 years)", expanded=False):
+                since = regime_ts.index.max() - pd.DateOffset(years=10)
+                st.dataframe(alert_log.counts(scope, since=since).drop(columns=["indicator"]),
+                             use_container_width=True)
+            st.caption(
+                "Replayed at every regime-history date from the data available on that date: "
+                "'on' = rule starts firing, 'off' = cleared, 'change' = regime status crossed 40/60."
+            )
+
     # ============================================================
     # REPORT GENERATION
     # ============================================================
@@ -2422,7 +1626,7 @@ def main():
                 payload_lines.append(f"      score: {0.0 if np.isnan(bscore) else round(bscore, 1)}")
                 payload_lines.append(f"      status: {bstatus}")
 
-            eq_line, dur_line, cr_line, hdg_line = operating_lines(block_scores, indicator_scores)
+            eq_line, dur_line, cr_line, hdg_line = state["operating_lines"]
             payload_lines.append("  operating_lines:")
             payload_lines.append(f"    equity_exposure: \"{eq_line}\"")
             payload_lines.append(f"    duration: \"{dur_line}\"")
@@ -2447,9 +1651,7 @@ def main():
                 score = s_info.get("score", np.nan)
                 status = s_info.get("status", "n/a")
                 latest = s_info.get("latest", np.nan)
-                series = indicators.get(key, pd.Series(dtype=float))
-
-                tr = recent_trend(series)
+                tr = views[key]["trend"]
                 window = tr["window_label"]
                 dwin = tr["delta_pct"]
 
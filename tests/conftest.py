@@ -0,0 +1,87 @@
+"""Shared test inputs: the benchmark suite's seeded synthetic histories (benchmarks/fixtures.py)."""
+import os
+import sys
+import threading
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import fixtures  # noqa: E402
+import macro_dashboard as md  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def raw():
+    """(fred, yf_map) shaped like load_raw_data() output."""
+    return fixtures.synthetic_raw()
+
+
+@pytest.fixture(scope="session")
+def indicators(raw):
+    return md.build_indicators(*raw)
+
+
+class HTTPError(Exception):
+    """Stands in for requests.HTTPError (fetch reports it by class name and status)."""
+
+    def __init__(self, response):
+        super().__init__(f"{response.status_code} error")
+        self.response = response
+
+
+class StubResponse:
+    def __init__(self, status_code: int, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(self)
+
+    def json(self):
+        return self._payload
+
+
+class StubFredSession:
+    """
+    requests.Session stand-in for the FRED endpoints: /series/observations from
+    in-memory histories ({series_id: Series}) and /series with a last_updated stamp.
+    Series ids in fail answer HTTP 500 on both, probe_fail only on /series and
+    observations_fail only on /series/observations.
+    calls records (endpoint, series_id, observation_start) per request.
+    """
+
+    def __init__(self, histories: dict, fail=(), probe_fail=(), observations_fail=(), last_updated=None):
+        self.histories = dict(histories)
+        self.fail = set(fail)
+        self.probe_fail = set(probe_fail)
+        self.observations_fail = set(observations_fail)
+        self.last_updated = dict(last_updated or {})
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        sid = params["series_id"]
+        endpoint = "observations" if url.endswith("/series/observations") else "series"
+        with self._lock:
+            self.calls.append((endpoint, sid, params.get("observation_start")))
+        if sid in self.fail or sid in (self.probe_fail if endpoint == "series" else self.observations_fail):
+            return StubResponse(500)
+        if endpoint == "series":
+            stamp = self.last_updated.get(sid, "2025-12-31 07:45:00-06")
+            return StubResponse(200, {"seriess": [{"id": sid, "last_updated": stamp}]})
+        s = self.histories[sid]
+        s = s[s.index >= pd.Timestamp(params["observation_start"])]
+        return StubResponse(200, {"observations": fixtures.fred_payload(s)})
+
+    def requests(self, endpoint: str) -> list:
+        return [c for c in self.calls if c[0] == endpoint]
+
+
+@pytest.fixture
+def fred_histories(raw):
+    """{series_id: full history} for every FRED series of the fixtures."""
+    fred, _ = raw
+    return {sid: fred[key] for key, sid in md.FRED_SERIES.items()}
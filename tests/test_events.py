@@ -0,0 +1,34 @@
+import sqlite3
+
+import macro_dashboard as md
+
+EVENT = ("indicator", "rule", "on", "warn", "Label", "message")
+
+
+def test_recent_window_ends_at_the_grid_end_not_the_last_event(tmp_path):
+    log = md.AlertLog(str(tmp_path / "alerts.sqlite"))
+    log.replace("15y-W-FRI", "v1", [("2025-01-03", *EVENT), ("2025-06-06", *EVENT)], grid_end="2025-12-26")
+
+    assert log.recent("15y-W-FRI", 12).empty  # nothing fired in the 12 weeks to 2025-12-26
+    assert list(log.recent("15y-W-FRI", 40)["date"]) == ["2025-06-06"]
+    assert list(log.recent("15y-W-FRI", 12, asof="2025-06-30")["date"]) == ["2025-06-06"]
+
+
+def test_log_without_grid_end_falls_back_to_the_last_event(tmp_path):
+    path = str(tmp_path / "alerts.sqlite")
+    with sqlite3.connect(path) as con:  # a log written before replays recorded their grid end
+        con.executescript("""
+            CREATE TABLE alert_events (scope TEXT NOT NULL, date TEXT NOT NULL, indicator TEXT NOT NULL,
+                rule TEXT NOT NULL, state TEXT NOT NULL, severity TEXT NOT NULL, label TEXT NOT NULL,
+                message TEXT NOT NULL);
+            CREATE TABLE alert_replays (scope TEXT PRIMARY KEY, version TEXT NOT NULL,
+                replayed_at TEXT NOT NULL, events INTEGER NOT NULL);
+            INSERT INTO alert_events VALUES ('15y-W-FRI', '2025-06-06', 'indicator', 'rule', 'on', 'warn',
+                'Label', 'message');
+            INSERT INTO alert_replays VALUES ('15y-W-FRI', 'v1', '2025-06-07', 1);
+        """)
+    con.close()
+    log = md.AlertLog(path)
+
+    assert list(log.recent("15y-W-FRI", 12)["date"]) == ["2025-06-06"]
+    assert log.recent("5y-W-FRI", 12).empty
@@ -0,0 +1,141 @@
+import pandas as pd
+import pytest
+
+import macro_dashboard as md
+from macro_dashboard import fetch, pipeline
+from conftest import StubFredSession
+
+START = "2015-01-01"
+SERIES = {"nominal_10y": "DGS10", "dgs2": "DGS2", "cpi_index": "CPIAUCSL", "deficit_gdp": "FYFSGDA188S"}
+
+
+def _expected(history: pd.Series, start: str) -> pd.Series:
+    return history[history.index >= pd.Timestamp(start)]
+
+
+def test_batch_loads_every_series_over_one_session(fred_histories):
+    session = StubFredSession(fred_histories)
+    out, errors = md.fetch_fred_batch(SERIES, START, "KEY", session=session, max_workers=3)
+    assert errors == {}
+    assert sorted(c[1] for c in session.requests("observations")) == sorted(SERIES.values())
+    for key, sid in SERIES.items():
+        pd.testing.assert_series_equal(out[key], _expected(fred_histories[sid], START),
+                                       check_names=False, check_freq=False)
+
+
+def test_failed_series_is_reported_without_failing_the_batch(fred_histories):
+    session = StubFredSession(fred_histories, fail={"DGS2"})
+    out, errors = md.fetch_fred_batch(SERIES, START, "SECRET", session=session)
+    assert errors == {"dgs2": "DGS2: HTTP 500"}
+    assert out["dgs2"].empty
+    assert not out["nominal_10y"].empty
+    assert "SECRET" not in errors["dgs2"]
+
+
+def test_load_raw_data_publishes_errors(fred_histories, monkeypatch, tmp_path):
+    session = StubFredSession(fred_histories, fail={"UNRATE"})
+    monkeypatch.setattr(fetch, "get_fred_session", lambda: session)
+    monkeypatch.setattr(pipeline, "fetch_yf_batch",
+                        lambda tickers, *a, **k: {t: pd.Series(dtype=float) for t in tickers})
+    fred, _ = pipeline.load_raw_data(api_key="KEY", store=md.SeriesStore(str(tmp_path)))
+    assert md.FRED_FETCH_ERRORS == {"unemployment_rate": "UNRATE: HTTP 500"}
+    assert fred["unemployment_rate"].empty
+    assert not fred["nominal_10y"].empty
+
+
+def test_failed_delta_serves_the_stored_copy(fred_histories, tmp_path):
+    store = md.SeriesStore(str(tmp_path))
+    first, _ = md.fetch_fred_batch(SERIES, START, "KEY", session=StubFredSession(fred_histories), store=store)
+    session = StubFredSession(fred_histories, fail={"DGS10"})
+    out, errors = md.fetch_fred_batch(SERIES, START, "KEY", session=session, store=store)
+    assert errors == {}
+    pd.testing.assert_series_equal(out["nominal_10y"], first["nominal_10y"])
+    # a stored history only asks for the delta
+    assert all(c[2] > START for c in session.requests("observations"))
+
+
+def test_failed_download_without_stored_copy_is_an_error(fred_histories, tmp_path):
+    session = StubFredSession(fred_histories, fail={"DGS10"})
+    _, errors = md.fetch_fred_batch(SERIES, START, "KEY", session=session, store=md.SeriesStore(str(tmp_path)))
+    assert set(errors) == {"nominal_10y"}
+
+
+@pytest.fixture(autouse=True)
+def _clear_errors():
+    yield
+    md.FRED_FETCH_ERRORS.clear()
+
+
+def _probed_load(store, session):
+    before = dict(md.FRED_PROBE_STATS)
+    out, errors = md.fetch_fred_batch({"cpi_index": "CPIAUCSL"}, START, "KEY", session=session, store=store,
+                                      probe=True)
+    assert errors == {}
+    return out["cpi_index"], {k: md.FRED_PROBE_STATS[k] - before[k] for k in before}
+
+
+def test_unchanged_stamp_skips_the_download(fred_histories, tmp_path):
+    store = md.SeriesStore(str(tmp_path))
+    _probed_load(store, StubFredSession(fred_histories))
+
+    session = StubFredSession(fred_histories)
+    out, stats = _probed_load(store, session)
+    assert stats["current"] == 1 and session.requests("observations") == []
+    pd.testing.assert_series_equal(out, _expected(fred_histories["CPIAUCSL"], START),
+                                   check_names=False, check_freq=False)
+
+
+def test_changed_stamp_downloads_the_revision_window(fred_histories, tmp_path):
+    store = md.SeriesStore(str(tmp_path))
+    _probed_load(store, StubFredSession(fred_histories))
+
+    revised = fred_histories["CPIAUCSL"].copy()
+    when = revised.index[-8]  # an observation published months ago
+    revised[when] += 1.0
+    stamp = "2026-01-14 07:44:00-06"
+    session = StubFredSession({**fred_histories, "CPIAUCSL": revised}, last_updated={"CPIAUCSL": stamp})
+    out, stats = _probed_load(store, session)
+
+    assert stats["changed"] == 1
+    assert session.requests("observations")[0][2] < when.date().isoformat()
+    assert out[when] == revised[when] and store.load("fred/CPIAUCSL")[0][when] == revised[when]
+    assert store.meta("fred/CPIAUCSL")["last_updated"] == stamp
+
+
+def test_stamp_is_recorded_only_after_a_successful_download(fred_histories, tmp_path):
+    store = md.SeriesStore(str(tmp_path))
+    _probed_load(store, StubFredSession(fred_histories))
+    old = store.meta("fred/CPIAUCSL")["last_updated"]
+    stamp = {"CPIAUCSL": "2026-01-14 07:44:00-06"}
+
+    out, stats = _probed_load(store, StubFredSession(fred_histories, observations_fail={"CPIAUCSL"},
+                                                     last_updated=stamp))
+    assert stats["changed"] == 1 and not out.empty  # stored copy served
+    assert store.meta("fred/CPIAUCSL")["last_updated"] == old
+
+    session = StubFredSession(fred_histories, last_updated=stamp)
+    _, stats = _probed_load(store, session)
+    assert stats["changed"] == 1 and len(session.requests("observations")) == 1
+    assert store.meta("fred/CPIAUCSL")["last_updated"] == stamp["CPIAUCSL"]
+
+
+def test_failed_probe_falls_back_to_the_download(fred_histories, tmp_path):
+    store = md.SeriesStore(str(tmp_path))
+    _probed_load(store, StubFredSession(fred_histories))
+    old = store.meta("fred/CPIAUCSL")["last_updated"]
+
+    session = StubFredSession(fred_histories, probe_fail={"CPIAUCSL"}, last_updated={"CPIAUCSL": "later"})
+    out, stats = _probed_load(store, session)
+    assert stats["failed"] == 1 and len(session.requests("observations")) == 1 and not out.empty
+    assert store.meta("fred/CPIAUCSL")["last_updated"] == old
+
+
+def test_unchanged_stamp_does_not_skip_a_due_full_resync(fred_histories, tmp_path):
+    store = md.SeriesStore(str(tmp_path))
+    _probed_load(store, StubFredSession(fred_histories))
+    store.update_meta("fred/CPIAUCSL", full_synced_at="2000-01-01T00:00:00+00:00")
+
+    session = StubFredSession(fred_histories)
+    _, stats = _probed_load(store, session)
+    assert stats["current"] == 0
+    assert session.requests("observations")[0][2] == START
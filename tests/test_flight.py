@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from macro_dashboard.flight import SingleFlight
+
+N = 6
+
+
+def _wait_for_followers(flight, n):
+    """Until n calls have joined the flights (leader included)."""
+    for _ in range(1000):
+        if flight.stats["calls"] >= n:
+            return
+        time.sleep(0.005)
+    raise AssertionError("followers never joined")
+
+
+def test_one_leader_per_key_and_followers_share_its_result():
+    flight, release, runs = SingleFlight(), threading.Event(), []
+
+    def load(key):
+        runs.append(key)
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=2 * N) as pool:
+        futures = [pool.submit(flight.do, key, lambda key=key: load(key)) for key in ["a", "b"] * N]
+        _wait_for_followers(flight, 2 * N)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert sorted(runs) == ["a", "b"]
+    assert len({id(r) for r in results[0::2]}) == 1 and len({id(r) for r in results[1::2]}) == 1
+    assert results[0] is not results[1]
+    assert flight.stats == {"calls": 2 * N, "leaders": 2, "shared": 2 * N - 2}
+
+
+def test_followers_share_the_leaders_exception():
+    flight, release, runs = SingleFlight(), threading.Event(), []
+
+    def load():
+        runs.append(1)
+        release.wait(5)
+        raise ValueError("download failed")
+
+    with ThreadPoolExecutor(max_workers=N) as pool:
+        futures = [pool.submit(flight.do, "a", load) for _ in range(N)]
+        _wait_for_followers(flight, N)
+        release.set()
+        errors = [f.exception() for f in futures]
+
+    assert len(runs) == 1
+    assert all(isinstance(e, ValueError) for e in errors) and len({id(e) for e in errors}) == 1
+
+
+def _fail():
+    raise ValueError("download failed")
+
+
+def test_nothing_is_cached_after_the_flight():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2  # ran again
+    with pytest.raises(ValueError):
+        flight.do("a", _fail)
+    assert flight.do("a", lambda: 3) == 3
+    assert flight._inflight == {}
+    assert flight.stats == {"calls": 4, "leaders": 4, "shared": 0}
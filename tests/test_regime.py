@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import macro_dashboard as md
+from macro_dashboard.config import BLOCKS, INDICATOR_META
+
+
+def _scored(indicators):
+    for key, meta in INDICATOR_META.items():
+        s = indicators.get(key)
+        if s is not None and len(s.dropna()) >= 20:
+            yield key, s, meta["direction"], meta.get("scoring_mode", "z5y")
+
+
+def test_last_path_point_is_the_live_score(indicators):
+    live = md.score_indicators(indicators)
+    for key, s, direction, mode in _scored(indicators):
+        path = md.indicator_score_path(s, direction, mode)
+        assert path.iloc[-1] == live[key]["score"], key
+
+
+def test_path_matches_asof_scores_within_tolerance(indicators):
+    for key, s, direction, mode in _scored(indicators):
+        path = md.indicator_score_path(s, direction, mode).dropna()
+        for ts in path.index[:: max(len(path) // 7, 1)]:
+            assert path[ts] == pytest.approx(md.compute_indicator_score_asof(s, direction, mode, ts), abs=1e-9), key
+
+
+def test_last_history_row_matches_live_block_scores(indicators):
+    end = max(s.index.max() for s in indicators.values() if s is not None and not s.empty)
+    row = md.regime_history_frame(indicators, pd.DatetimeIndex([end])).iloc[-1]
+    live = md.score_blocks(md.score_indicators(indicators))
+    for bkey in list(BLOCKS) + ["GLOBAL"]:
+        if np.isnan(live[bkey]["score"]):
+            assert np.isnan(row[bkey]), bkey
+        else:
+            assert row[bkey] == pytest.approx(live[bkey]["score"], rel=1e-12), bkey
+
+
+
+@pytest.mark.parametrize("change", ["append", "revise"])
+def test_tail_recompute_from_the_earliest_change_matches_a_full_rebuild(indicators, change):
+    s = indicators["vix"]
+    if change == "append":
+        when = s.index[-1] + pd.offsets.Week(2, weekday=4)  # a Friday past every other input: the grid grows
+        changed = pd.concat([s, pd.Series([s.iloc[-1] * 1.5], index=[when])])
+    else:
+        when = s.index[-5]
+        changed = s.copy()
+        changed[when] *= 1.5
+    new = {**indicators, "vix": changed}
+
+    end = max(x.index.max() for x in new.values() if x is not None and not x.empty)
+    grid = pd.date_range("2010-01-01", end, freq="W-FRI")
+    k = int(grid.searchsorted(when))
+    assert 0 < k < len(grid)
+    incremental = pd.concat([md.regime_history_frame(indicators, grid[:k]),
+                             md.regime_history_frame(new, grid[k:])])
+    pd.testing.assert_frame_equal(incremental, md.regime_history_frame(new, grid), check_freq=False)
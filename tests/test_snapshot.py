@@ -0,0 +1,90 @@
+import threading
+from datetime import timedelta
+
+import pytest
+
+from macro_dashboard import snapshot
+from macro_dashboard.snapshot import SnapshotService
+
+
+class BlockingLoader:
+    """loader() stand-in: copies of the fixture histories, held at gate while it is clear."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.calls = 0
+        self.fail = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self):
+        self.calls += 1
+        assert self.gate.wait(10)
+        if self.fail:
+            raise RuntimeError("feed down")
+        fred, yf_map = self.raw
+        return {k: s.copy() for k, s in fred.items()}, {k: s.copy() for k, s in yf_map.items()}
+
+
+@pytest.fixture
+def service(raw):
+    svc = SnapshotService(loader=BlockingLoader(raw), ttl=3600, stale_while_revalidate=True)
+    svc.get(15)
+    return svc
+
+
+def _expire(service):
+    service._version_at -= timedelta(seconds=service.ttl)
+
+
+def _finish_refresh(service):
+    service._refresh_thread.join(30)
+    assert not service.refreshing
+
+
+def test_stale_version_is_served_while_refreshing_then_swapped(service):
+    old, old_version = service.get(15), service.version
+    _expire(service)
+    service.loader.gate.clear()
+
+    assert service.get(15) is old and service.version == old_version
+    assert service.refreshing
+
+    service.loader.gate.set()
+    _finish_refresh(service)
+    new = service.get(15)
+    assert service.version != old_version and new.version == service.version and new is not old
+    assert service.refresh_error is None and service.loader.calls == 2  # rebuilt in the background
+
+
+def test_refresh_result_is_dropped_after_invalidate(service):
+    _expire(service)
+    service.loader.gate.clear()
+    service.get(15)
+    assert service.refreshing
+
+    service.invalidate()
+    service.loader.gate.set()
+    _finish_refresh(service)
+    assert service.version is None  # the refresh started before invalidate() was not swapped in
+
+    snap = service.get(15)
+    assert service.loader.calls == 3 and snap.version == service.version
+
+
+def test_failed_refresh_is_retried_after_backoff(service, monkeypatch):
+    old_version = service.version
+    _expire(service)
+    service.loader.fail = True
+    service.get(15)
+    _finish_refresh(service)
+    assert service.refresh_error == "RuntimeError: feed down" and service.version == old_version
+
+    service.get(15)  # inside REFRESH_RETRY_S: stale data, no new attempt
+    assert not service.refreshing and service.loader.calls == 2
+
+    monkeypatch.setattr(snapshot, "REFRESH_RETRY_S", 0)
+    service.loader.fail = False
+    service.get(15)
+    _finish_refresh(service)
+    assert service.loader.calls == 3 and service.refresh_error is None and service.version != old_version
@@ -0,0 +1,95 @@
+import pandas as pd
+
+import macro_dashboard as md
+from macro_dashboard import fetch
+from conftest import StubFredSession
+import fixtures
+
+START = "2015-01-01"
+
+
+def test_fred_revision_inside_lookback_replaces_stored_value(fred_histories, tmp_path):
+    store = md.SeriesStore(str(tmp_path))
+    series = {"cpi_index": "CPIAUCSL"}
+    md.fetch_fred_batch(series, START, "KEY", session=StubFredSession(fred_histories), store=store)
+
+    revised = fred_histories["CPIAUCSL"].copy()
+    when = revised.index[-6]  # a release from months ago
+    revised[when] += 1.0
+    session = StubFredSession({**fred_histories, "CPIAUCSL": revised})
+    out, _ = md.fetch_fred_batch(series, START, "KEY", session=session, store=store)
+
+    assert out["cpi_index"][when] == revised[when]
+    assert store.load("fred/CPIAUCSL")[0][when] == revised[when]
+    since = session.requests("observations")[0][2]
+    assert since < when.date().isoformat() and since > START  # a lookback window, not a full download
+
+
+def test_full_resync_after_resync_interval(fred_histories, tmp_path):
+    store = md.SeriesStore(str(tmp_path))
+    series = {"cpi_index": "CPIAUCSL"}
+    md.fetch_fred_batch(series, START, "KEY", session=StubFredSession(fred_histories), store=store)
+    store.update_meta("fred/CPIAUCSL", full_synced_at="2000-01-01T00:00:00+00:00")
+
+    revised = fred_histories["CPIAUCSL"].copy()
+    old = revised.index[revised.index >= pd.Timestamp(START)][3]  # far older than the lookback
+    revised[old] -= 2.0
+    session = StubFredSession({**fred_histories, "CPIAUCSL": revised})
+    out, _ = md.fetch_fred_batch(series, START, "KEY", session=session, store=store)
+
+    assert session.requests("observations")[0][2] == START
+    assert out["cpi_index"][old] == revised[old]
+    assert store.meta("fred/CPIAUCSL")["full_synced_at"] > "2000-01-02"
+
+
+def _transport(yf_map, calls):
+    def _t(tickers, start_date):
+        calls.append((tuple(tickers), start_date))
+        frame = fixtures.yf_bulk_frame({t: yf_map[t] for t in tickers})
+        return frame[frame.index >= pd.Timestamp(start_date)]
+    return _t
+
+
+def test_readjusted_yf_history_is_downloaded_again(raw, tmp_path):
+    _, yf_map = raw
+    store = md.SeriesStore(str(tmp_path))
+    tickers = ["SPY", "GLD"]
+    md.fetch_yf_batch(tickers, START, transport=_transport(yf_map, []), fallback=None, store=store)
+
+    # ex-dividend: every close before the last bar is scaled down, and a new bar arrives
+    spy = yf_map["SPY"]
+    next_day = spy.index[-1] + pd.offsets.BDay(1)
+    adjusted = pd.concat([spy * 0.995, pd.Series([spy.iloc[-1]], index=[next_day])])
+    calls = []
+    out = md.fetch_yf_batch(tickers, START, transport=_transport({**yf_map, "SPY": adjusted}, calls),
+                            fallback=None, store=store)
+
+    assert calls[0][1] > START                # delta with overlap first
+    assert calls[1] == (("SPY",), START)      # then SPY alone, in full
+    expected = adjusted[adjusted.index >= pd.Timestamp(START)]
+    pd.testing.assert_series_equal(out["SPY"], expected, check_names=False, check_freq=False)
+
+
+def test_unchanged_overlap_keeps_the_delta(raw, tmp_path):
+    _, yf_map = raw
+    store = md.SeriesStore(str(tmp_path))
+    md.fetch_yf_batch(["SPY"], START, transport=_transport(yf_map, []), fallback=None, store=store)
+    calls = []
+    md.fetch_yf_batch(["SPY"], START, transport=_transport(yf_map, calls), fallback=None, store=store)
+    assert len(calls) == 1 and calls[0][1] > START
+    assert not fetch._adjustment_changed(yf_map["SPY"], yf_map["SPY"])
+
+
+def test_failed_yf_delta_is_not_recorded_as_a_poll(raw, tmp_path):
+    _, yf_map = raw
+    store = md.SeriesStore(str(tmp_path))
+    md.fetch_yf_batch(["SPY"], START, transport=_transport(yf_map, []), fallback=None, store=store)
+    checked = store.meta("yf/SPY")["checked_at"]
+
+    def _down(tickers, start_date):
+        raise ConnectionError("query2.finance.yahoo.com")
+
+    out = md.fetch_yf_batch(["SPY"], START, transport=_down, fallback=None, store=store)
+    assert store.meta("yf/SPY")["checked_at"] == checked
+    expected = yf_map["SPY"][yf_map["SPY"].index >= pd.Timestamp(START)]
+    pd.testing.assert_series_equal(out["SPY"], expected, check_names=False, check_freq=False)